@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+적응형 폴링 스케줄러
+소스별로 관측된 신규 항목 발생률에 맞춰 폴링 간격을 최소/최대 범위 안에서 조정
+"""
+
+import hashlib
+import json
+import math
+import os
+import time
+from typing import Dict, List, Optional
+
+# 소스 설정에 min_interval/max_interval이 없을 때 사용하는 기본값 (초)
+DEFAULT_MIN_INTERVAL = 60
+DEFAULT_MAX_INTERVAL = 6 * 3600
+
+TARGET_NEW_PER_POLL = 1.0   # 폴링 한 번에 기대하는 신규 항목 수
+RATE_SMOOTHING = 0.3        # 발생률 EWMA 가중치
+QUIET_BACKOFF = 1.5         # 신규 항목이 없을 때 간격 증가 배수
+RATE_HALF_LIFE = 6 * 3600   # 조용한 소스의 발생률 반감기 (초)
+MAX_SEEN_KEYS = 500         # 소스별로 기억하는 항목 키 수
+
+
+def item_key(item) -> str:
+    """신규 여부 판단용 항목 키 (URL 우선, 없으면 제목)"""
+    return item.url or item.title
+
+
+class AdaptivePoller:
+    """소스별 폴링 간격 상태 관리"""
+
+    def __init__(self, sources: List[Dict], state_file: str = '.tmp/poll_state.json'):
+        self.sources = {s['name']: s for s in sources}
+        self.state_file = state_file
+        self.state: Dict[str, Dict] = {}
+
+        if os.path.exists(state_file):
+            with open(state_file, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+
+        for name, source in self.sources.items():
+            self.state.setdefault(name, {
+                'interval': self._clamp(source, source.get('poll_interval', DEFAULT_MIN_INTERVAL)),
+                'next_poll': 0.0,
+                'last_poll': 0.0,
+                'rate': 0.0,
+                'content_hash': '',
+                'polls': 0,
+                'changes': 0,
+                'seen': []
+            })
+
+    def _clamp(self, source: Dict, interval: float) -> float:
+        low = source.get('min_interval', DEFAULT_MIN_INTERVAL)
+        high = source.get('max_interval', DEFAULT_MAX_INTERVAL)
+        return max(low, min(high, interval))
+
+    def due(self, now: Optional[float] = None) -> List[Dict]:
+        """지금 폴링할 소스 목록 (우선순위 오름차순)"""
+        now = now or time.time()
+        due = [s for name, s in self.sources.items() if self.state[name]['next_poll'] <= now]
+        return sorted(due, key=lambda s: s.get('priority', 99))
+
+    def seconds_until_next(self, now: Optional[float] = None) -> float:
+        """다음 폴링 예정 시각까지 남은 시간"""
+        now = now or time.time()
+        return max(0.0, min(self.state[name]['next_poll'] for name in self.sources) - now)
+
+    def record(self, name: str, items: List, now: Optional[float] = None) -> List:
+        """폴링 결과를 반영하여 다음 간격을 조정하고 신규 항목만 반환"""
+        now = now or time.time()
+        source = self.sources[name]
+        state = self.state[name]
+
+        seen = set(state['seen'])
+        new_items = [item for item in items if item_key(item) not in seen]
+
+        keys = [item_key(item) for item in items]
+        content_hash = hashlib.sha1('\n'.join(keys).encode('utf-8')).hexdigest()
+        changed = content_hash != state['content_hash']
+
+        elapsed = now - state['last_poll'] if state['last_poll'] else state['interval']
+        first_poll = state['polls'] == 0
+
+        if first_poll:
+            # 첫 폴링은 기존 항목 전체가 "신규"로 보이므로 발생률 추정에서 제외
+            pass
+        elif new_items:
+            observed = len(new_items) / max(elapsed, 1.0)
+            state['rate'] = RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * state['rate']
+            state['interval'] = self._clamp(source, TARGET_NEW_PER_POLL / state['rate'])
+        elif changed:
+            # 순서/내용만 바뀐 경우: 곧 신규 항목이 나올 수 있으므로 간격 유지
+            pass
+        else:
+            # 조용한 소스: 발생률은 지수적으로 감소, 간격은 지수적으로 증가
+            state['rate'] *= math.exp(-math.log(2) * elapsed / RATE_HALF_LIFE)
+            state['interval'] = self._clamp(source, state['interval'] * QUIET_BACKOFF)
+
+        state['polls'] += 1
+        state['changes'] += int(changed and not first_poll)
+        state['content_hash'] = content_hash
+        state['last_poll'] = now
+        state['next_poll'] = now + state['interval']
+        current = set(keys)
+        state['seen'] = (keys + [k for k in state['seen'] if k not in current])[:MAX_SEEN_KEYS]
+
+        return [] if first_poll else new_items
+
+    def record_failure(self, name: str, now: Optional[float] = None):
+        """폴링 실패 시 발생률은 유지하고 현재 간격 후 재시도"""
+        now = now or time.time()
+        state = self.state[name]
+        state['next_poll'] = now + state['interval']
+
+    def save(self):
+        """상태 파일 저장"""
+        os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False)
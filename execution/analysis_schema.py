@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+LLM 분석 응답 스키마 검증
+깨진 JSON 복구, 필드별 검증/보정, 누락 필드만 다시 요청하는 프롬프트 생성
+"""
+
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+SENTIMENTS = ("긍정적", "중립", "부정적")
+
+# 필드 -> (타입, 설명): 설명은 재요청 프롬프트에 사용
+ANALYSIS_SCHEMA = {
+    'overall_sentiment': ('sentiment', '"긍정적|중립|부정적"'),
+    'sentiment_score': ('score', '0.0-1.0 사이의 숫자'),
+    'key_insights': ('list', '["핵심 인사이트 1", "핵심 인사이트 2", "핵심 인사이트 3"]'),
+    'executive_summary': ('text', '"200자 이내의 전체 요약"'),
+    'detailed_analysis': ('text', '"500자 이내의 상세 분석"'),
+    'market_outlook': ('text', '"향후 전망 (100자 이내)"'),
+    'top_topics': ('list', '["주요 토픽1", "주요 토픽2", "주요 토픽3"]'),
+    'risk_factors': ('list', '["리스크 요인1", "리스크 요인2"]'),
+    'opportunities': ('list', '["기회 요인1", "기회 요인2"]')
+}
+
+TRAILING_COMMA = re.compile(r',\s*([}\]])')
+SMART_QUOTES = str.maketrans({'“': '"', '”': '"', '‘': "'", '’': "'"})
+
+
+def strip_code_fence(text: str) -> str:
+    """```json ... ``` 코드 블록 제거"""
+    text = text.strip()
+    if text.startswith('```json'):
+        text = text[7:]
+    if text.startswith('```'):
+        text = text[3:]
+    if text.endswith('```'):
+        text = text[:-3]
+    return text.strip()
+
+
+def close_truncated(text: str) -> str:
+    """응답이 중간에 끊긴 경우 열린 문자열/괄호를 닫음"""
+    stack = []
+    in_string = False
+    escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in '{[':
+            stack.append('}' if ch == '{' else ']')
+        elif ch in '}]' and stack:
+            stack.pop()
+
+    if in_string:
+        text += '"'
+    return TRAILING_COMMA.sub(r'\1', text.rstrip().rstrip(',') + ''.join(reversed(stack)))
+
+
+def parse_json_response(text: str) -> Optional[Dict]:
+    """JSON 파싱, 실패 시 흔한 손상(앞뒤 잡문, 스마트 따옴표, 후행 쉼표, 잘림) 복구 후 재시도"""
+    text = strip_code_fence(text)
+    try:
+        data = json.loads(text)
+        return data if isinstance(data, dict) else None
+    except json.JSONDecodeError:
+        pass
+
+    start = text.find('{')
+    if start < 0:
+        return None
+    end = text.rfind('}')
+    candidate = text[start:end + 1] if end > start else text[start:]
+    candidate = TRAILING_COMMA.sub(r'\1', candidate.translate(SMART_QUOTES))
+
+    for attempt in (candidate, close_truncated(candidate), close_truncated(text[start:].translate(SMART_QUOTES))):
+        try:
+            data = json.loads(attempt)
+            if isinstance(data, dict):
+                return data
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def _coerce(kind: str, value):
+    """필드 값 검증/보정, 사용할 수 없으면 None"""
+    if kind == 'sentiment':
+        return value if value in SENTIMENTS else None
+    if kind == 'score':
+        try:
+            score = float(value)
+        except (TypeError, ValueError):
+            return None
+        return round(score, 2) if 0.0 <= score <= 1.0 else None
+    if kind == 'list':
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list):
+            return None
+        items = [str(v).strip() for v in value if str(v).strip()]
+        return items or None
+    if kind == 'text':
+        return value.strip() if isinstance(value, str) and value.strip() else None
+    return None
+
+
+def validate_analysis(data: Dict) -> Tuple[Dict, List[str]]:
+    """스키마에 맞는 필드만 보정하여 반환, 누락/오류 필드 목록 함께 반환"""
+    valid = {}
+    invalid = []
+    for field, (kind, _) in ANALYSIS_SCHEMA.items():
+        value = _coerce(kind, data.get(field))
+        if value is None:
+            invalid.append(field)
+        else:
+            valid[field] = value
+    return valid, invalid
+
+
+def build_field_prompt(base_prompt: str, fields: List[str]) -> str:
+    """원래 데이터 프롬프트에 누락 필드만 요청하는 응답 형식을 붙인 재요청 프롬프트"""
+    lines = [f'  "{field}": {ANALYSIS_SCHEMA[field][1]}' for field in fields]
+    return (
+        base_prompt
+        + "\n\n다음 필드만 포함한 JSON으로 응답해주세요:\n\n{\n"
+        + ',\n'.join(lines)
+        + "\n}\n\nJSON만 반환하고 다른 텍스트는 포함하지 마세요."
+    )
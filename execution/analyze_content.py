@@ -10,37 +10,26 @@ from datetime import datetime
 from typing import List, Dict
 from textblob import TextBlob
 from collections import Counter
-import re
+from concurrent.futures import ProcessPoolExecutor
+from dotenv import load_dotenv
 
-def load_data():
-    """수집된 데이터 로드"""
-    data = {}
+from localization import translate_titles
+from records import Article, SocialPost, StockSnapshot, load_record, load_records
+from trend_index import tokenize, update_and_get_trending
 
-    # 뉴스 데이터
-    news_file = '.tmp/news_articles.json'
-    if os.path.exists(news_file):
-        with open(news_file, 'r', encoding='utf-8') as f:
-            data['news'] = json.load(f)
-    else:
-        data['news'] = []
-
-    # 소셜 미디어 데이터
-    social_file = '.tmp/social_posts.json'
-    if os.path.exists(social_file):
-        with open(social_file, 'r', encoding='utf-8') as f:
-            data['social'] = json.load(f)
-    else:
-        data['social'] = []
+# 환경 변수 로드 (요약 제목 번역이 LLM 백엔드 키를 사용)
+try:
+    load_dotenv()
+except:
+    pass  # GitHub Actions 등에서는 .env 파일이 없을 수 있음
 
-    # 주가 데이터
-    stock_file = '.tmp/stock_data.json'
-    if os.path.exists(stock_file):
-        with open(stock_file, 'r', encoding='utf-8') as f:
-            data['stock'] = json.load(f)
-    else:
-        data['stock'] = None
-
-    return data
+def load_data():
+    """수집된 데이터 로드"""
+    return {
+        'news': load_records('.tmp/news_articles.json', Article),
+        'social': load_records('.tmp/social_posts.json', SocialPost),
+        'stock': load_record('.tmp/stock_data.json', StockSnapshot)
+    }
 
 def analyze_sentiment(text: str) -> tuple:
     """텍스트 감성 분석 (TextBlob 사용)"""
@@ -59,6 +48,30 @@ def analyze_sentiment(text: str) -> tuple:
     except:
         return "중립", 0.0
 
+PARALLEL_MIN_TEXTS = 500    # 이보다 적으면 프로세스 풀 시작 비용이 더 커서 직렬 처리
+MAX_CHUNK_SIZE = 256        # 워커에 한 번에 보내는 텍스트 수 상한
+
+def warm_sentiment():
+    """프로세스 풀 initializer: 워커마다 TextBlob 감성 사전을 한 번만 로드"""
+    analyze_sentiment("warm up")
+
+def analyze_sentiments(texts: List[str], workers: int = None, executor: ProcessPoolExecutor = None) -> List[tuple]:
+    """여러 텍스트의 (감성, 점수) 목록 (입력 순서 유지, 직렬 처리와 결과 동일)
+
+    큰 배치는 프로세스 풀에 청크 단위로 나누어 전송 (텍스트 하나씩 보내는 IPC 비용 방지)
+    executor를 넘기면 그 풀을 재사용 (warm_sentiment initializer로 만든 풀 권장)
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 2 or len(texts) < PARALLEL_MIN_TEXTS:
+        return [analyze_sentiment(text) for text in texts]
+
+    # 워커당 4청크 정도로 나누어 처리 시간이 다른 청크가 있어도 고르게 분배
+    chunksize = max(1, min(MAX_CHUNK_SIZE, len(texts) // (workers * 4)))
+    if executor is not None:
+        return list(executor.map(analyze_sentiment, texts, chunksize=chunksize))
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_sentiment) as executor:
+        return list(executor.map(analyze_sentiment, texts, chunksize=chunksize))
+
 def analyze_content(data: dict) -> dict:
     """전체 콘텐츠 분석"""
     print("🔍 Analyzing content...")
@@ -70,16 +83,16 @@ def analyze_content(data: dict) -> dict:
     # 뉴스 분석
     analyzed_news = []
     for article in data['news'][:10]:  # 상위 10개
-        text = f"{article['title']} {article.get('summary', '')}"
+        text = f"{article.title} {article.full_text or article.summary}"
         sentiment, score = analyze_sentiment(text)
 
         sentiments[sentiment] += 1
         sentiment_scores.append(score)
 
         analyzed_news.append({
-            'title': article['title'],
-            'source': article['source'],
-            'url': article['url'],
+            'title': article.title,
+            'source': article.source,
+            'url': article.url,
             'sentiment': sentiment,
             'score': round(score, 2)
         })
@@ -87,17 +100,17 @@ def analyze_content(data: dict) -> dict:
     # 소셜 미디어 분석
     analyzed_social = []
     for post in data['social'][:10]:  # 상위 10개
-        text = f"{post['title']} {post.get('text', '')}"
+        text = f"{post.title} {post.text}"
         sentiment, score = analyze_sentiment(text)
 
         sentiments[sentiment] += 1
         sentiment_scores.append(score)
 
         analyzed_social.append({
-            'title': post['title'],
-            'platform': post['platform'],
-            'url': post['url'],
-            'score': post['score'],
+            'title': post.title,
+            'platform': post.platform,
+            'url': post.url,
+            'score': post.score,
             'sentiment': sentiment
         })
 
@@ -111,9 +124,12 @@ def analyze_content(data: dict) -> dict:
     else:
         overall_sentiment = "중립"
 
-    # 키워드 추출
-    all_text = ' '.join([a['title'] for a in data['news']] + [p['title'] for p in data['social']])
-    keywords = extract_keywords(all_text)
+    # 키워드 추출: 과거 실행 대비 급상승 용어 우선, 이력이 부족하면 빈도 기반
+    documents = [item_text(item) for item in data['news'] + data['social']]
+    keywords = update_and_get_trending(documents)
+    if not keywords:
+        all_text = ' '.join(item.title for item in data['news'] + data['social'])
+        keywords = extract_keywords(all_text)
 
     # 요약 생성
     summary = generate_summary(analyzed_news, analyzed_social, overall_sentiment)
@@ -121,7 +137,7 @@ def analyze_content(data: dict) -> dict:
     # 결과 구성
     report = {
         'date': datetime.now().strftime('%Y-%m-%d'),
-        'stock': data['stock'] if data['stock'] else {
+        'stock': data['stock'].to_dict() if data['stock'] else {
             'price': 0,
             'change_percent': 0,
             'trend': '데이터 없음'
@@ -144,14 +160,15 @@ def analyze_content(data: dict) -> dict:
 
     return report
 
+def item_text(item) -> str:
+    """인덱싱용 문서 텍스트 (Article은 제목 + 요약, SocialPost는 제목 + 본문)"""
+    body = item.summary if isinstance(item, Article) else item.text
+    return f"{item.title} {body}"
+
 def extract_keywords(text: str) -> List[str]:
     """키워드 추출 (빈도 기반)"""
-    # 소문자 변환 및 단어 추출
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-
-    # 불용어 제거
-    stopwords = {'the', 'and', 'for', 'with', 'this', 'that', 'from', 'are', 'was', 'has', 'have', 'will', 'can', 'but', 'not', 'you', 'all', 'new', 'more', 'get', 'how', 'out', 'now', 'may'}
-    filtered_words = [w for w in words if w not in stopwords and len(w) > 3]
+    # 소문자 단어 추출 및 불용어 제거
+    filtered_words = [w for w in tokenize(text) if len(w) > 3]
 
     # 빈도 계산
     word_freq = Counter(filtered_words)
@@ -163,9 +180,11 @@ def generate_summary(news: List[Dict], social: List[Dict], sentiment: str) -> st
     """전체 요약 생성"""
     summary_parts = []
 
-    # 뉴스 요약
+    # 뉴스 요약 (캐시된 한국어 번역 제목, 번역이 없으면 원문)
     if news:
-        top_news_titles = [n['title'][:60] + '...' if len(n['title']) > 60 else n['title'] for n in news[:3]]
+        translations = translate_titles([n['title'] for n in news[:3]], 'ko')
+        titles = [translations.get(n['title'], n['title']) for n in news[:3]]
+        top_news_titles = [t[:60] + '...' if len(t) > 60 else t for t in titles]
         summary_parts.append(f"주요 뉴스: {', '.join(top_news_titles)}")
 
     # 감성 요약
@@ -4,58 +4,103 @@ Gemini AI 분석 스크립트
 Gemini Pro 2.5를 사용한 고급 뉴스 분석 및 요약
 """
 
+import hashlib
 import json
 import os
+from collections import Counter
 from datetime import datetime
-from typing import List, Dict
-import google.generativeai as genai
+from typing import List, Dict, Optional
 from dotenv import load_dotenv
 
+from analysis_schema import build_field_prompt, parse_json_response, validate_analysis
+from entity_tagger import CATEGORY_LABELS, entity_counts
+from llm_backends import get_router
+from records import Article, SocialPost, StockSnapshot, load_record, load_records
+
 # 환경 변수 로드 (.env 파일이 있으면 로드, 없으면 시스템 환경 변수 사용)
 try:
     load_dotenv()
 except:
     pass  # GitHub Actions 등에서는 .env 파일이 없을 수 있음
 
-def configure_gemini():
-    """Gemini API 설정"""
-    api_key = os.getenv('GEMINI_API_KEY')
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY not found in environment variables")
-
-    genai.configure(api_key=api_key)
-    # gemini-2.5-flash 모델 사용
-    return genai.GenerativeModel('gemini-2.5-flash')
-
-
-def analyze_with_gemini(news_articles: List[Dict], social_posts: List[Dict], stock_data: Dict) -> Dict:
+DATA_DIR = os.getenv('DATA_DIR', 'data')
+ANALYSIS_CACHE_FILE = os.path.join(DATA_DIR, 'analysis_cache.json')
+ANALYSIS_CACHE_SIZE = 30  # 보관할 최근 분석 수
+
+def load_cached_analysis(key: str) -> Optional[Dict]:
+    """같은 입력(프롬프트 해시)으로 이미 생성된 공유 분석"""
+    if not os.path.exists(ANALYSIS_CACHE_FILE):
+        return None
+    with open(ANALYSIS_CACHE_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f).get(key)
+
+def save_cached_analysis(key: str, analysis: Dict):
+    cache = {}
+    if os.path.exists(ANALYSIS_CACHE_FILE):
+        with open(ANALYSIS_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    cache.pop(key, None)
+    cache[key] = analysis
+    # 삽입 순서 기준으로 오래된 항목 제거
+    cache = dict(list(cache.items())[-ANALYSIS_CACHE_SIZE:])
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with open(ANALYSIS_CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False)
+
+def analyze_with_gemini(news_articles: List[Article], social_posts: List[SocialPost], stock_data: Optional[StockSnapshot],
+                        trending_keywords: List[str] = None, topics: List[Dict] = None,
+                        entities: Dict[str, List] = None) -> Dict:
     """Gemini AI로 뉴스 분석 및 요약"""
 
     print("🤖 Starting Gemini AI analysis...")
 
     try:
-        model = configure_gemini()
+        router = get_router()
 
         # 프롬프트 구성
         prompt = f"""당신은 애플(Apple Inc.) 전문 애널리스트입니다. 다음 데이터를 분석하여 한국어로 종합 리포트를 작성해주세요.
 
 ## 주가 정보
-- 현재가: ${stock_data.get('current_price', 'N/A')}
-- 변동률: {stock_data.get('change_percent', 'N/A')}%
-- 5일 트렌드: {stock_data.get('trend_5day', 'N/A')}
+- 현재가: ${stock_data.current_price if stock_data else 'N/A'}
+- 변동률: {stock_data.change_percent if stock_data else 'N/A'}%
+- 5일 트렌드: {stock_data.trend_5day if stock_data else 'N/A'}
 
 ## 최신 뉴스 ({len(news_articles)}개)
 """
 
         # 상위 10개 뉴스 추가
         for i, article in enumerate(news_articles[:10], 1):
-            prompt += f"{i}. {article['title']} (출처: {article['source']})\n"
+            prompt += f"{i}. {article.title} (출처: {article.source})\n"
+            # 본문 추출 단계가 실행된 경우 앞부분 발췌 포함
+            if article.full_text:
+                prompt += f"   {article.full_text[:300]}\n"
 
         prompt += f"\n## 소셜 미디어 반응 ({len(social_posts)}개)\n"
 
         # 상위 5개 소셜 포스트 추가
         for i, post in enumerate(social_posts[:5], 1):
-            prompt += f"{i}. {post['title']} (점수: {post.get('score', 0)})\n"
+            prompt += f"{i}. {post.title} (점수: {post.score})\n"
+
+        # 과거 실행 대비 급상승 키워드
+        if trending_keywords:
+            prompt += f"\n## 급상승 키워드 (최근 30일 대비)\n{', '.join(trending_keywords[:10])}\n"
+
+        # 이전 날짜와 연결된 토픽 그룹
+        if topics:
+            prompt += "\n## 토픽 그룹 (기사 수, 이전 보도 일수)\n"
+            for topic in topics[:5]:
+                status = "신규" if topic['new'] else f"{topic['days_active']}일째"
+                prompt += f"- {topic['label']} ({topic['size']}건, {status}): {topic['titles'][0]}\n"
+
+        # 제품/인물/공급사/티커별 언급 항목 수
+        if entities:
+            prompt += "\n## 주요 엔티티 (언급 항목 수)\n"
+            for category, label in CATEGORY_LABELS.items():
+                if entities.get(category):
+                    prompt += f"- {label}: {', '.join(f'{name} {count}' for name, count in entities[category][:5])}\n"
+
+        # 누락 필드 재요청 시 재사용할 데이터 부분
+        data_prompt = prompt
 
         prompt += """
 
@@ -79,23 +124,43 @@ def analyze_with_gemini(news_articles: List[Dict], social_posts: List[Dict], sto
 
 JSON만 반환하고 다른 텍스트는 포함하지 마세요."""
 
-        # Gemini API 호출
-        response = model.generate_content(prompt)
-
-        # JSON 파싱
-        response_text = response.text.strip()
-
-        # JSON 코드 블록 제거 (있는 경우)
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-
-        analysis = json.loads(response_text.strip())
-
-        print("✓ Gemini analysis completed")
+        # 입력이 같으면 (재실행, 재전송 등) LLM 호출 없이 공유 분석 재사용
+        cache_key = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        cached = load_cached_analysis(cache_key)
+        if cached:
+            print(f"✓ Reusing cached analysis ({cached.get('model')})")
+            return cached
+
+        # LLM 호출 (설정된 백엔드 순서/지연 시간에 따라 페일오버)
+        response_text, model = router.generate_with_backend(prompt)
+
+        # 깨진 JSON은 복구 후 필드 단위로 검증
+        analysis, invalid = validate_analysis(parse_json_response(response_text) or {})
+
+        # 누락/오류 필드만 한 번 재요청 (전체 재생성보다 출력 토큰이 적음)
+        if invalid:
+            print(f"⚠️  Invalid or missing fields, re-requesting: {', '.join(invalid)}")
+            try:
+                retry_text = router.generate(build_field_prompt(data_prompt, invalid))
+                recovered, invalid = validate_analysis(parse_json_response(retry_text) or {})
+                analysis.update({k: v for k, v in recovered.items() if k not in analysis})
+                invalid = [k for k in invalid if k not in analysis]
+            except Exception as e:
+                print(f"⚠️  Field re-request failed: {e}")
+
+        if not analysis:
+            raise ValueError("No valid fields in LLM response")
+
+        # 끝까지 복구되지 않은 필드만 기본값으로 채움
+        if invalid:
+            print(f"⚠️  Using fallback values for: {', '.join(invalid)}")
+            fallback = fallback_analysis(news_articles, social_posts)
+            analysis.update({k: fallback[k] for k in invalid})
+
+        analysis['model'] = model.label
+        if not invalid:
+            save_cached_analysis(cache_key, analysis)
+        print(f"✓ Gemini analysis completed ({model.name})")
         print(f"✓ Sentiment: {analysis.get('overall_sentiment')}")
         print(f"✓ Key insights: {len(analysis.get('key_insights', []))}")
 
@@ -106,51 +171,35 @@ JSON만 반환하고 다른 텍스트는 포함하지 마세요."""
         print("⚠️  Falling back to basic analysis...")
 
         # 폴백: 기본 분석 반환
-        return {
-            "overall_sentiment": "중립",
-            "sentiment_score": 0.5,
-            "key_insights": [
-                f"{len(news_articles)}개의 뉴스 기사 수집됨",
-                f"{len(social_posts)}개의 소셜 미디어 포스트 분석됨",
-                "AI 분석을 사용할 수 없어 기본 분석 제공"
-            ],
-            "executive_summary": f"애플 관련 {len(news_articles)}개 뉴스와 {len(social_posts)}개 소셜 포스트를 수집했습니다.",
-            "detailed_analysis": "Gemini API를 사용할 수 없어 상세 분석을 제공할 수 없습니다. API 키를 확인해주세요.",
-            "market_outlook": "데이터 부족으로 전망 제공 불가",
-            "top_topics": ["Apple", "iPhone", "Technology"],
-            "risk_factors": ["API 연결 실패"],
-            "opportunities": ["AI 분석 활성화 시 더 나은 인사이트 제공 가능"]
-        }
+        return fallback_analysis(news_articles, social_posts)
+
+def fallback_analysis(news_articles: List[Article], social_posts: List[SocialPost]) -> Dict:
+    """LLM 분석을 사용할 수 없을 때의 기본 분석"""
+    return {
+        "overall_sentiment": "중립",
+        "sentiment_score": 0.5,
+        "key_insights": [
+            f"{len(news_articles)}개의 뉴스 기사 수집됨",
+            f"{len(social_posts)}개의 소셜 미디어 포스트 분석됨",
+            "AI 분석을 사용할 수 없어 기본 분석 제공"
+        ],
+        "executive_summary": f"애플 관련 {len(news_articles)}개 뉴스와 {len(social_posts)}개 소셜 포스트를 수집했습니다.",
+        "detailed_analysis": "Gemini API를 사용할 수 없어 상세 분석을 제공할 수 없습니다. API 키를 확인해주세요.",
+        "market_outlook": "데이터 부족으로 전망 제공 불가",
+        "top_topics": ["Apple", "iPhone", "Technology"],
+        "risk_factors": ["API 연결 실패"],
+        "opportunities": ["AI 분석 활성화 시 더 나은 인사이트 제공 가능"],
+        "model": "fallback",
+        "fallback": True
+    }
 
 def load_data():
     """수집된 데이터 로드"""
-    data = {}
-
-    # 뉴스 데이터
-    news_file = '.tmp/news_articles.json'
-    if os.path.exists(news_file):
-        with open(news_file, 'r', encoding='utf-8') as f:
-            data['news'] = json.load(f)
-    else:
-        data['news'] = []
-
-    # 소셜 미디어 데이터
-    social_file = '.tmp/social_posts.json'
-    if os.path.exists(social_file):
-        with open(social_file, 'r', encoding='utf-8') as f:
-            data['social'] = json.load(f)
-    else:
-        data['social'] = []
-
-    # 주가 데이터
-    stock_file = '.tmp/stock_data.json'
-    if os.path.exists(stock_file):
-        with open(stock_file, 'r', encoding='utf-8') as f:
-            data['stock'] = json.load(f)
-    else:
-        data['stock'] = {}
-
-    return data
+    return {
+        'news': load_records('.tmp/news_articles.json', Article),
+        'social': load_records('.tmp/social_posts.json', SocialPost),
+        'stock': load_record('.tmp/stock_data.json', StockSnapshot)
+    }
 
 def main():
     """메인 실행 함수"""
@@ -166,19 +215,48 @@ def main():
     print(f"✓ Loaded {len(data['news'])} news articles")
     print(f"✓ Loaded {len(data['social'])} social posts")
 
+    # 기존 TextBlob 분석도 유지 (폴백용)
+    from analyze_content import analyze_sentiment, item_text
+    from trend_index import update_and_get_trending
+
+    # 트렌딩 키워드 (과거 실행 인덱스 갱신)
+    documents = [item_text(item) for item in data['news'] + data['social']]
+    trending_keywords = update_and_get_trending(documents)
+    print(f"✓ Trending keywords: {', '.join(trending_keywords[:5]) or '(building baseline)'}")
+
+    # 의미상 중복 기사 제거 및 이전 날짜와 연결된 토픽 그룹 (실패해도 분석은 계속)
+    topics = []
+    try:
+        from topic_index import EmbeddingCache, semantic_dedupe, update_topics
+        # 중복 제거와 토픽 그룹이 같은 임베딩 캐시를 공유 (한 번 로드, 한 번 저장)
+        embeddings = EmbeddingCache()
+        unique_news = semantic_dedupe(data['news'], embeddings)
+        if len(unique_news) < len(data['news']):
+            print(f"✓ Removed {len(data['news']) - len(unique_news)} near-duplicate articles")
+        data['news'] = unique_news
+        topics = update_topics(data['news'] + data['social'], cache=embeddings)
+        embeddings.save()
+        print(f"✓ Topics: {len(topics)} ({sum(t['new'] for t in topics)} new)")
+    except Exception as e:
+        print(f"⚠️  Topic grouping failed: {e}")
+
+    # 제품/인물/공급사/티커 엔티티 집계
+    entities = entity_counts(documents)
+    print(f"✓ Entities: {', '.join(name for name, _ in entities.get('product', [])[:3]) or '(none)'}")
+
     # Gemini AI 분석
     gemini_analysis = analyze_with_gemini(
         data['news'],
         data['social'],
-        data['stock']
+        data['stock'],
+        trending_keywords,
+        topics,
+        entities
     )
 
-    # 기존 TextBlob 분석도 유지 (폴백용)
-    from analyze_content import analyze_sentiment
-
     textblob_sentiments = []
     for article in data['news'][:10]:
-        text = f"{article['title']} {article.get('summary', '')}"
+        text = f"{article.title} {article.full_text or article.summary}"
         sentiment, score = analyze_sentiment(text)
         textblob_sentiments.append(score)
 
@@ -187,15 +265,42 @@ def main():
     # 결과 구성
     report = {
         'date': datetime.now().strftime('%Y-%m-%d'),
-        'stock': data['stock'],
+        'stock': data['stock'].to_dict() if data['stock'] else {},
         'gemini_analysis': gemini_analysis,
         'textblob_sentiment_score': round(textblob_avg, 2),
+        'trending_keywords': trending_keywords[:10],
+        'topic_threads': topics,
+        'entities': entities,
+        'source_counts': {
+            'news': dict(Counter(a.source for a in data['news'])),
+            'social': dict(Counter(p.platform for p in data['social']))
+        },
         'news_count': len(data['news']),
         'social_count': len(data['social']),
-        'top_news': data['news'][:5],
-        'top_social': data['social'][:5]
+        'top_news': [a.to_dict() for a in data['news'][:5]],
+        'top_social': [p.to_dict() for p in data['social'][:5]]
     }
 
+    # 히스토리 아카이브에 누적 (실패해도 리포트 전송은 계속)
+    try:
+        from report_archive import archive_report
+        archive_report(report, data['news'], data['social'])
+        print("✓ Report archived")
+    except Exception as e:
+        print(f"⚠️  Report archive failed: {e}")
+
+    # 아카이브된 감성 이력과 주가의 상관관계 (오늘 리포트 포함)
+    try:
+        from sentiment_correlation import analyze_correlation
+        correlation = analyze_correlation('AAPL')
+        if correlation:
+            report['sentiment_correlation'] = correlation
+            print(f"✓ Sentiment-price correlation over {correlation['observations']} days")
+        else:
+            print("✓ Sentiment-price correlation: not enough history yet")
+    except Exception as e:
+        print(f"⚠️  Sentiment-price correlation failed: {e}")
+
     # 결과 저장
     output_dir = '.tmp'
     os.makedirs(output_dir, exist_ok=True)
@@ -206,6 +311,11 @@ def main():
 
     print(f"✅ Saved Gemini analysis report to {output_file}")
 
+    # 모든 LLM 백엔드가 실패한 기본 분석은 리포트는 남기되 실패로 종료 (체크포인트 제외, 다음 실행에서 재분석)
+    if gemini_analysis.get('fallback'):
+        print("⚠️  Report uses fallback analysis, not checkpointing")
+        return False
+
     return True
 
 if __name__ == '__main__':
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+과거 데이터 백필
+보관된 피드 레코드(NDJSON)를 생성기 단계로 스트리밍하여 일별 리포트(NDJSON)를 만들고 아카이브에 누적
+입력 크기와 관계없이 메모리 사용량이 일정하며, 진행 상황을 체크포인트에 기록하고 일자 배치를 병렬 처리
+
+사용법: python execution/backfill.py archive/*.ndjson [--workers 4] [--archive] [--restart]
+Directive: directives/backfill.md
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import shutil
+from collections import Counter, OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ranking import parse_timestamp
+from records import Article, SocialPost, loads
+
+WORK_DIR = '.tmp/backfill'
+DAYS_DIR = os.path.join(WORK_DIR, 'days')
+CHECKPOINT_FILE = os.path.join(WORK_DIR, 'checkpoint.json')
+OUTPUT_FILE = '.tmp/backfill_reports.ndjson'
+
+MAX_OPEN_FILES = 64     # 분할 단계에서 동시에 열어 둘 일자 파일 수
+TOP_NEWS = 50           # 일별 리포트/아카이브에 남길 뉴스 수 (일일 파이프라인과 동일)
+TOP_SOCIAL = 30         # 일별 리포트/아카이브에 남길 소셜 포스트 수
+SCORE_BLOCK = 4096      # 감성 점수를 한 번에 계산할 레코드 수 (메모리 상한)
+
+
+# ---------------------------------------------------------------------------
+# 스트리밍 단계
+# ---------------------------------------------------------------------------
+
+def read_ndjson(paths: List[str]) -> Iterator[Tuple[str, Dict]]:
+    """(원본 줄, dict)를 한 줄씩 생성 (빈 줄/깨진 줄은 건너뜀)"""
+    for path in paths:
+        with open(path, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield line.decode('utf-8'), loads(line)
+                except ValueError:
+                    continue
+
+
+def record_day(row: Dict) -> Optional[str]:
+    """레코드 날짜 (명시적 date, 없으면 발행/작성 시각)"""
+    if row.get('date'):
+        return row['date'][:10]
+    timestamp = parse_timestamp(row.get('published') or row.get('created') or '')
+    return timestamp.strftime('%Y-%m-%d') if timestamp else None
+
+
+def to_record(row: Dict):
+    """kind(없으면 필드로 추정)에 맞는 레코드로 변환"""
+    kind = row.get('kind') or ('social' if 'platform' in row else 'news')
+    return SocialPost.from_dict(row) if kind == 'social' else Article.from_dict(row)
+
+
+def partition_by_day(rows: Iterable[Tuple[str, Dict]], days_dir: str) -> Dict[str, int]:
+    """일자별 NDJSON 파일로 분할 (최근 사용한 파일 핸들만 열어 둠), 일자별 레코드 수 반환"""
+    os.makedirs(days_dir, exist_ok=True)
+    handles: "OrderedDict[str, object]" = OrderedDict()
+    counts: Counter = Counter()
+    try:
+        for line, row in rows:
+            day = record_day(row)
+            if day is None:
+                counts['undated'] += 1
+                continue
+
+            handle = handles.pop(day, None)
+            if handle is None:
+                if len(handles) >= MAX_OPEN_FILES:
+                    handles.popitem(last=False)[1].close()
+                handle = open(os.path.join(days_dir, f"{day}.ndjson"), 'a', encoding='utf-8')
+            handles[day] = handle
+            handle.write(line + '\n')
+            counts[day] += 1
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return dict(counts)
+
+
+def iter_day(path: str) -> Iterator:
+    """일자 파일의 레코드를 하나씩 생성"""
+    for _, row in read_ndjson([path]):
+        yield to_record(row)
+
+
+def blocks(records: Iterable, size: int) -> Iterator[List]:
+    """레코드를 size개씩 묶어 생성 (감성 점수를 묶음 단위로 계산)"""
+    block = []
+    for record in records:
+        block.append(record)
+        if len(block) >= size:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def analyze_day(day: str, path: str, stock: Optional[Dict],
+                executor: Optional[ProcessPoolExecutor] = None, workers: int = 1) -> Dict:
+    """하루치 레코드를 스트리밍 집계하여 일별 리포트 생성 (상위 항목만 힙으로 유지)
+
+    executor를 넘기면 묶음마다 감성 점수를 그 프로세스 풀에서 병렬 계산 (결과는 직렬과 동일)
+    """
+    from analyze_content import analyze_sentiments, extract_keywords
+    from relevance import get_matcher
+
+    matcher = get_matcher()
+    sentiments = Counter()
+    total = 0.0
+    counts = Counter()
+    top: Dict[str, List] = {'news': [], 'social': []}
+    titles: Counter = Counter()
+    limits = {'news': TOP_NEWS, 'social': TOP_SOCIAL}
+
+    seq = 0
+    for block in blocks(iter_day(path), SCORE_BLOCK):
+        texts = [
+            f"{r.title} {r.text if isinstance(r, SocialPost) else (r.full_text or r.summary)}" for r in block
+        ]
+        for record, (label, polarity) in zip(block, analyze_sentiments(texts, workers, executor)):
+            kind = 'social' if isinstance(record, SocialPost) else 'news'
+            sentiments[label] += 1
+            total += polarity
+            counts[kind] += 1
+            titles.update(extract_keywords(record.title))
+
+            # 관련도 상위 N개만 유지 (동점은 먼저 나온 항목 우선)
+            entry = (matcher.score(record.title), -seq, record.to_dict())
+            if len(top[kind]) < limits[kind]:
+                heapq.heappush(top[kind], entry)
+            else:
+                heapq.heappushpop(top[kind], entry)
+            seq += 1
+
+    items = counts['news'] + counts['social']
+    average = total / items if items else 0.0
+    label = "긍정적" if average > 0.1 else "부정적" if average < -0.1 else "중립"
+    keywords = [word for word, _ in titles.most_common(10)]
+
+    def ranked(kind: str) -> List[Dict]:
+        return [entry[2] for entry in sorted(top[kind], reverse=True)]
+
+    return {
+        'date': day,
+        'stock': stock or {},
+        # AI 분석 없이 TextBlob으로만 채움 (sentiment_score는 비워 AI 감성 추이와 섞이지 않도록)
+        'gemini_analysis': {
+            'overall_sentiment': label,
+            'top_topics': keywords[:5],
+            'model': 'TextBlob (backfill)'
+        },
+        'textblob_sentiment_score': round(average, 4),
+        'sentiment_counts': dict(sentiments),
+        'trending_keywords': keywords,
+        'news_count': counts['news'],
+        'social_count': counts['social'],
+        'top_news': ranked('news'),
+        'top_social': ranked('social'),
+        'backfill': True
+    }
+
+
+# ---------------------------------------------------------------------------
+# 체크포인트 / 실행
+# ---------------------------------------------------------------------------
+
+def input_signature(paths: List[str]) -> str:
+    """입력 파일 경로/크기/수정 시각 해시 (입력이 바뀌면 처음부터 다시)"""
+    parts = [(os.path.abspath(p), os.path.getsize(p), os.path.getmtime(p)) for p in sorted(paths)]
+    return hashlib.sha256(json.dumps(parts).encode('utf-8')).hexdigest()
+
+
+def load_checkpoint(signature: str) -> Dict:
+    if os.path.exists(CHECKPOINT_FILE):
+        with open(CHECKPOINT_FILE, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('signature') == signature:
+            return checkpoint
+    return {'signature': signature, 'partitioned': False, 'counts': {}, 'done': []}
+
+
+def save_checkpoint(checkpoint: Dict):
+    os.makedirs(WORK_DIR, exist_ok=True)
+    tmp_path = CHECKPOINT_FILE + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, CHECKPOINT_FILE)
+
+
+def stock_by_day(symbol: str) -> Dict[str, Dict]:
+    """캐시된 일별 종가로 날짜별 주가 정보 (전일 종가 대비 변동률 포함)"""
+    from fetch_stock_data import load_price_history
+
+    closes = load_price_history(symbol)
+    result = {}
+    previous = None
+    for day in sorted(closes):
+        close = closes[day]
+        change = (close - previous) / previous * 100 if previous else 0.0
+        result[day] = {
+            'symbol': symbol,
+            'current_price': round(close, 2),
+            'change_percent': round(change, 2)
+        }
+        previous = close
+    return result
+
+
+def backfill(paths: List[str], workers: int = None, output: str = OUTPUT_FILE,
+             archive: bool = False, symbol: str = 'AAPL', restart: bool = False) -> int:
+    """백필 실행, 이번 실행에서 처리한 일수 반환"""
+    signature = input_signature(paths)
+    if restart and os.path.exists(WORK_DIR):
+        shutil.rmtree(WORK_DIR)
+    checkpoint = load_checkpoint(signature)
+
+    # 1단계: 일자별 분할 (입력 전체를 한 번 스트리밍)
+    if not checkpoint['partitioned']:
+        if os.path.exists(DAYS_DIR):
+            shutil.rmtree(DAYS_DIR)
+        if os.path.exists(output):
+            os.remove(output)
+        checkpoint.update(counts=partition_by_day(read_ndjson(paths), DAYS_DIR), partitioned=True, done=[])
+        save_checkpoint(checkpoint)
+
+    counts = checkpoint['counts']
+    print(f"✓ {sum(counts.values())} records across {len(counts) - ('undated' in counts)} days"
+          f" ({counts.get('undated', 0)} undated skipped)")
+
+    done = set(checkpoint['done'])
+    pending = sorted(day for day in counts if day != 'undated' and day not in done)
+    if not pending:
+        print("✓ Nothing to do (all days already processed)")
+        return 0
+
+    stocks = stock_by_day(symbol)
+    if archive:
+        from report_archive import archive_report, get_report
+
+    # 2단계: 일자 배치 병렬 처리 (진행 중인 작업 수를 제한하여 결과가 쌓이지 않도록)
+    # 남은 일수가 워커 수보다 적으면 일자를 차례로 처리하고 일자 안의 감성 점수를 병렬 계산
+    from analyze_content import warm_sentiment
+
+    workers = workers or os.cpu_count() or 1
+    processed = 0
+
+    def finish(day: str, report: Dict):
+        nonlocal processed
+        out.write(json.dumps(report, ensure_ascii=False) + '\n')
+        out.flush()
+        # 실제 일일 리포트가 이미 있는 날짜는 덮어쓰지 않음
+        if archive and get_report(day) is None:
+            archive_report(report,
+                           [Article.from_dict(d) for d in report['top_news']],
+                           [SocialPost.from_dict(d) for d in report['top_social']])
+
+        # 출력이 기록된 뒤에만 완료 처리 (중단 후 재실행 시 이어서 처리)
+        checkpoint['done'].append(day)
+        save_checkpoint(checkpoint)
+        processed += 1
+        print(f"✓ {day}: {report['news_count']} news, {report['social_count']} social"
+              f" ({len(checkpoint['done'])}/{len(counts) - ('undated' in counts)})")
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_sentiment) as executor, \
+            open(output, 'a', encoding='utf-8') as out:
+        if len(pending) < workers:
+            for day in pending:
+                path = os.path.join(DAYS_DIR, f"{day}.ndjson")
+                finish(day, analyze_day(day, path, stocks.get(day), executor, workers))
+            return processed
+
+        queue = iter(pending)
+        running = {}
+
+        def submit_next():
+            day = next(queue, None)
+            if day is not None:
+                path = os.path.join(DAYS_DIR, f"{day}.ndjson")
+                running[executor.submit(analyze_day, day, path, stocks.get(day))] = day
+
+        for _ in range(workers * 2):
+            submit_next()
+
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                finish(running.pop(future), future.result())
+                submit_next()
+
+    return processed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream archived feed records into daily reports')
+    parser.add_argument('inputs', nargs='+', help='NDJSON files of Article/SocialPost records')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes for day batches or sentiment scoring (default: CPU count)')
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    parser.add_argument('--archive', action='store_true', help='also add daily reports to data/reports.db')
+    parser.add_argument('--symbol', default='AAPL', help='cached price history to attach')
+    parser.add_argument('--restart', action='store_true', help='discard the checkpoint and start over')
+    args = parser.parse_args()
+
+    print("⏪ Starting backfill...")
+    processed = backfill(args.inputs, args.workers, args.output, args.archive, args.symbol, args.restart)
+    print(f"✅ Backfilled {processed} days into {args.output}")
+    return True
+
+if __name__ == '__main__':
+    success = main()
+    exit(0 if success else 1)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+속보 알림
+서비스 모드에서 중요 항목(Apple Newsroom 새 글, HN 고득점, 주가 급변)을 Gemini 분석 없이 즉시 텔레그램 전송
+Directive: directives/run_service.md
+"""
+
+import asyncio
+import hashlib
+import html
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+from relevance import get_matcher
+
+DATA_DIR = os.getenv('DATA_DIR', 'data')
+SENT_ALERTS_FILE = os.path.join(DATA_DIR, 'sent_alerts.json')
+SENT_RETENTION = 7 * 24 * 3600  # 전송 기록 보관 기간 (초)
+MAX_TRACKED_SCORES = 5000       # 점수 변화를 추적할 최근 항목 수
+
+PRICE_MOVE_THRESHOLD = float(os.getenv('ALERT_PRICE_MOVE_PCT', '3.0'))  # 주가 급변 기준 (%)
+
+
+class AlertLedger:
+    """이미 전송한 알림 키 기록 (재시작 후에도 중복 전송 방지)"""
+
+    def __init__(self, path: str = SENT_ALERTS_FILE):
+        self.path = path
+        self.sent: Dict[str, float] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.sent = json.load(f)
+
+    def seen(self, key: str) -> bool:
+        return key in self.sent
+
+    def mark(self, key: str):
+        now = time.time()
+        self.sent[key] = now
+        self.sent = {k: t for k, t in self.sent.items() if now - t < SENT_RETENTION}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.sent, f)
+
+
+_ledger: Optional[AlertLedger] = None
+
+
+def get_ledger() -> AlertLedger:
+    global _ledger
+    if _ledger is None:
+        _ledger = AlertLedger()
+    return _ledger
+
+
+def alert_key(kind: str, value: str) -> str:
+    return f"{kind}:{hashlib.sha1(value.encode('utf-8')).hexdigest()[:16]}"
+
+
+def should_alert(source: Dict, item, is_new: bool, previous_score: Optional[int] = None) -> bool:
+    """소스의 alert 규칙에 따라 알림 대상인지 판단
+
+    - always: 새 항목 전부 (예: Apple Newsroom)
+    - min_score: 새 항목 중 점수가 기준 이상이거나, 이전 폴링에서 기준 미만이던 항목이 기준을 넘은 경우
+      (서비스 시작 직후 이미 기준을 넘어 있던 항목은 알리지 않음)
+    - min_relevance: 새 항목 중 관련도 점수가 기준 이상
+    """
+    rule = source.get('alert')
+    if not rule:
+        return False
+    if rule.get('always') and is_new:
+        return True
+    if 'min_score' in rule and getattr(item, 'score', 0) >= rule['min_score']:
+        crossed = previous_score is not None and previous_score < rule['min_score']
+        if is_new or crossed:
+            return True
+    if 'min_relevance' in rule and is_new and get_matcher().score(item.title) >= rule['min_relevance']:
+        return True
+    return False
+
+
+def send_alert(message: str) -> bool:
+    """짧은 알림 메시지 즉시 전송 (텔레그램 설정이 없으면 로그만 출력)"""
+    bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
+    chat_id = os.getenv('TELEGRAM_CHAT_ID')
+    if not bot_token or not chat_id:
+        print(f"⚠️  Alert not sent (Telegram not configured): {message}")
+        return False
+
+    from send_telegram_message import send_telegram_message
+    asyncio.run(send_telegram_message(bot_token, chat_id, message))
+    return True
+
+
+# 알림 키 -> 이 프로세스에서 마지막으로 본 점수 (점수가 기준을 새로 넘었는지 판단)
+_last_scores: Dict[str, int] = {}
+
+
+def handle_polled_items(source: Dict, new_items: List, items: List):
+    """서비스 폴링 핸들러: 규칙에 맞는 항목을 중복 없이 알림"""
+    if not source.get('alert'):
+        return
+
+    ledger = get_ledger()
+    new_keys = {id(item) for item in new_items}
+
+    for item in items:
+        key = alert_key('item', item.url or item.title)
+        previous_score = _last_scores.pop(key, None)
+        _last_scores[key] = getattr(item, 'score', 0)
+        while len(_last_scores) > MAX_TRACKED_SCORES:
+            del _last_scores[next(iter(_last_scores))]
+        if ledger.seen(key) or not should_alert(source, item, id(item) in new_keys, previous_score):
+            continue
+
+        score = f" (👍 {item.score})" if getattr(item, 'score', 0) else ''
+        message = (
+            f"🚨 <b>{html.escape(source['name'])}</b>{score}\n"
+            f"<a href=\"{html.escape(item.url, quote=True)}\">{html.escape(item.title)}</a>"
+        )
+        if send_alert(message):
+            print(f"🚨 Alert sent: {item.title[:80]}")
+        ledger.mark(key)
+
+
+def check_price_move(symbol: str, change_percent: float, day: str,
+                     threshold: float = PRICE_MOVE_THRESHOLD) -> bool:
+    """장중 변동률이 기준을 넘으면 알림 (기준의 배수마다 한 번씩)"""
+    if abs(change_percent) < threshold:
+        return False
+
+    # 같은 거래 세션(day) 같은 방향의 같은 구간(3%, 6%, ...)은 한 번만
+    direction = 'up' if change_percent > 0 else 'down'
+    bucket = int(abs(change_percent) // threshold)
+    key = f"price:{symbol}:{day}:{direction}:{bucket}"
+
+    ledger = get_ledger()
+    if ledger.seen(key):
+        return False
+
+    emoji = "📈" if change_percent > 0 else "📉"
+    send_alert(f"{emoji} <b>{symbol} 급변</b>: {change_percent:+.2f}%")
+    ledger.mark(key)
+    return True
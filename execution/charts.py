@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+리포트 차트
+캐시된 일별 종가와 아카이브 감성 추이(감성 vs 주가), 소스별 수집 건수(소스 분포)를 PNG로 렌더링
+데이터 해시로 data/charts에 캐시하여 리포트당 한 번만 렌더링하고, 텔레그램 file_id를 기록하여
+여러 채팅에 보낼 때 이미지를 다시 업로드하지 않음
+"""
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import matplotlib
+    matplotlib.use('Agg')  # 디스플레이 없는 환경 (GitHub Actions)
+    import matplotlib.pyplot as plt
+except ImportError:
+    plt = None
+
+DATA_DIR = os.getenv('DATA_DIR', 'data')
+CHART_DIR = os.path.join(DATA_DIR, 'charts')
+FILE_ID_CACHE = os.path.join(CHART_DIR, 'file_ids.json')
+
+CHART_VERSION = 1           # 차트 모양을 바꾸면 올려서 캐시 무효화
+CHART_DAYS = 60             # 감성 vs 주가 차트 기간 (일)
+MAX_SOURCES = 12            # 소스 분포 차트에 표시할 소스 수
+CHART_RETENTION = 30        # 렌더링된 차트 보관 기간 (일)
+
+
+def charts_available() -> bool:
+    """matplotlib 설치 여부"""
+    return plt is not None
+
+
+def data_hash(name: str, payload: Dict) -> str:
+    """차트 입력 데이터 해시 (같은 데이터면 같은 파일/업로드 재사용)"""
+    raw = json.dumps({'chart': name, 'version': CHART_VERSION, 'data': payload}, sort_keys=True)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def sentiment_price_data(report: Dict, symbol: str = 'AAPL', days: int = CHART_DAYS) -> Optional[Dict]:
+    """최근 N일 종가와 AI/TextBlob 감성 점수 (종가 캐시가 없으면 None)"""
+    from fetch_stock_data import load_price_history
+    from report_archive import sentiment_trend
+
+    closes = load_price_history(symbol)
+    if not closes:
+        return None
+    dates = sorted(closes)[-days:]
+
+    # 아카이브에 오늘 리포트가 아직 없을 수 있으므로 현재 리포트 값으로 보충
+    scores = {row['date']: row for row in sentiment_trend(days)}
+    if report.get('date'):
+        gemini = report.get('gemini_analysis', {})
+        scores.setdefault(report['date'], {
+            'sentiment_score': gemini.get('sentiment_score'),
+            'textblob_score': report.get('textblob_sentiment_score')
+        })
+
+    return {
+        'symbol': symbol,
+        'dates': dates,
+        'closes': [closes[d] for d in dates],
+        'sentiment': {d: scores[d].get('sentiment_score') for d in sorted(scores) if d >= dates[0]},
+        'textblob': {d: scores[d].get('textblob_score') for d in sorted(scores) if d >= dates[0]}
+    }
+
+
+def render_sentiment_price(data: Dict, path: str):
+    """종가(선)와 감성 점수(점/선)를 두 축으로"""
+    def parse(days):
+        return [datetime.strptime(d, '%Y-%m-%d') for d in days]
+
+    fig, price_ax = plt.subplots(figsize=(8, 4.5), dpi=120)
+    price_ax.plot(parse(data['dates']), data['closes'], color='#1f77b4', linewidth=1.8, label=f"{data['symbol']} close")
+    price_ax.set_ylabel(f"{data['symbol']} ($)")
+    price_ax.grid(alpha=0.3)
+
+    score_ax = price_ax.twinx()
+    for key, color, label in (('sentiment', '#d62728', 'AI sentiment (0-1)'),
+                              ('textblob', '#2ca02c', 'TextBlob (-1-1)')):
+        points = [(d, v) for d, v in data[key].items() if v is not None]
+        if points:
+            days, values = zip(*points)
+            score_ax.plot(parse(days), values, color=color, marker='o', markersize=3, linewidth=1, label=label)
+    score_ax.set_ylim(-1.05, 1.05)
+    score_ax.axhline(0, color='grey', linewidth=0.5)
+    score_ax.set_ylabel('Sentiment')
+
+    lines = price_ax.get_legend_handles_labels()[0] + score_ax.get_legend_handles_labels()[0]
+    labels = price_ax.get_legend_handles_labels()[1] + score_ax.get_legend_handles_labels()[1]
+    price_ax.legend(lines, labels, loc='upper left', fontsize=8)
+    price_ax.set_title(f"Sentiment vs {data['symbol']} price ({len(data['dates'])} trading days)")
+    fig.autofmt_xdate()
+    fig.tight_layout()
+    fig.savefig(path, format='png')
+    plt.close(fig)
+
+
+def render_source_breakdown(data: Dict, path: str):
+    """소스별 수집 건수 가로 막대 (많은 순)"""
+    names = list(data['counts'])[::-1]
+    values = [data['counts'][n] for n in names]
+    colors = ['#ff7f0e' if n in data['social'] else '#1f77b4' for n in names]
+
+    fig, ax = plt.subplots(figsize=(8, 0.35 * len(names) + 1.5), dpi=120)
+    ax.barh(names, values, color=colors)
+    for y, value in enumerate(values):
+        ax.text(value, y, f" {value}", va='center', fontsize=8)
+    ax.set_xlabel('Items')
+    ax.set_title(f"Sources ({data['date']}, blue: news / orange: social)")
+    ax.grid(axis='x', alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(path, format='png')
+    plt.close(fig)
+
+
+def source_breakdown_data(report: Dict) -> Optional[Dict]:
+    """리포트의 소스별 건수 (많은 순 상위 MAX_SOURCES개)"""
+    counts = report.get('source_counts')
+    if not counts:
+        return None
+    merged = {**counts.get('news', {}), **counts.get('social', {})}
+    top = sorted(merged.items(), key=lambda item: (-item[1], item[0]))[:MAX_SOURCES]
+    return {'date': report.get('date'), 'counts': dict(top), 'social': sorted(counts.get('social', {}))}
+
+
+# 차트 이름 -> (데이터 추출, 렌더러)
+CHARTS = {
+    'sentiment_price': (sentiment_price_data, render_sentiment_price),
+    'sources': (source_breakdown_data, render_source_breakdown)
+}
+
+
+def prune_charts(retention_days: int = CHART_RETENTION):
+    """보관 기간이 지난 PNG 삭제"""
+    cutoff = time.time() - retention_days * 86400
+    for name in os.listdir(CHART_DIR):
+        path = os.path.join(CHART_DIR, name)
+        if name.endswith('.png') and os.path.getmtime(path) < cutoff:
+            os.remove(path)
+
+
+def build_charts(report: Dict) -> List[Tuple[str, str]]:
+    """리포트 차트 [(데이터 해시, PNG 경로)] (같은 데이터의 PNG가 있으면 재사용)"""
+    if not charts_available():
+        return []
+
+    os.makedirs(CHART_DIR, exist_ok=True)
+    charts = []
+    for name, (extract, render) in CHARTS.items():
+        try:
+            data = extract(report)
+            if not data:
+                continue
+            key = data_hash(name, data)
+            path = os.path.join(CHART_DIR, f"{name}-{key}.png")
+            if not os.path.exists(path):
+                tmp_path = path + '.tmp'
+                render(data, tmp_path)
+                os.replace(tmp_path, path)
+                print(f"✓ Rendered chart {name}")
+            charts.append((key, path))
+        except Exception as e:
+            print(f"⚠️  Chart {name} failed: {e}")
+
+    prune_charts()
+    return charts
+
+
+class FileIdCache:
+    """데이터 해시 -> 텔레그램 file_id (한 번 업로드한 이미지는 file_id로 재전송)"""
+
+    def __init__(self, path: str = None):
+        self.path = path or FILE_ID_CACHE
+        self.entries: Dict[str, str] = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def get(self, key: str) -> Optional[str]:
+        return self.entries.get(key)
+
+    def put(self, key: str, file_id: str):
+        self.entries[key] = file_id
+        self.save()
+
+    def forget(self, key: str):
+        if self.entries.pop(key, None) is not None:
+            self.save()
+
+    def save(self):
+        # 보관 중인 PNG에 해당하는 항목만 유지
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        existing = {name.rsplit('-', 1)[-1][:-4] for name in os.listdir(directory) if name.endswith('.png')}
+        self.entries = {k: v for k, v in self.entries.items() if k in existing}
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+파이프라인 체크포인트
+단계별 입력 파일/설정/환경 변수/스크립트 내용의 해시를 기록하여
+입력이 바뀌지 않은 단계는 재실행 없이 이전 출력 재사용
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+MANIFEST_FILE = '.tmp/checkpoints.json'
+
+
+@dataclass(slots=True)
+class Stage:
+    """파이프라인 단계 선언
+
+    collector: 입력 파일 없이 외부에서 수집하는 단계 (--resume일 때만, 같은 날짜에 한해 재사용)
+    """
+    name: str
+    script: str
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    config: List[str] = field(default_factory=list)
+    env: List[str] = field(default_factory=list)
+    collector: bool = False
+
+
+def file_hash(path: str) -> Optional[str]:
+    """파일 내용 해시 (없으면 None)"""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CheckpointManifest:
+    """단계 이름 -> {key, inputs, outputs} 기록 (.tmp/checkpoints.json)"""
+
+    def __init__(self, path: str = MANIFEST_FILE):
+        self.path = path
+        self.records: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.records = json.load(f)
+
+    def stage_key(self, stage: Stage, input_hashes: Dict[str, Optional[str]]) -> str:
+        """단계 결과를 결정하는 모든 요소의 해시"""
+        parts = {
+            'script': file_hash(stage.script),
+            'inputs': input_hashes,
+            'config': {path: file_hash(path) for path in stage.config},
+            'env': {name: os.getenv(name, '') for name in stage.env}
+        }
+        if stage.collector:
+            parts['day'] = datetime.now().strftime('%Y-%m-%d')
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def is_fresh(self, stage: Stage) -> bool:
+        """이전 기록과 입력이 같고 출력 파일이 그대로 남아 있는지"""
+        record = self.records.get(stage.name)
+        if not record:
+            return False
+        for path, digest in record['outputs'].items():
+            if file_hash(path) != digest:
+                return False
+
+        # 입력을 제자리에서 갱신하는 단계는 출력이 확인되었으므로 실행 전 해시로 비교
+        input_hashes = {
+            path: record['inputs'].get(path) if path in record['outputs'] else file_hash(path)
+            for path in stage.inputs
+        }
+        return record['key'] == self.stage_key(stage, input_hashes)
+
+    def begin(self, stage: Stage) -> Dict[str, Optional[str]]:
+        """실행 직전 입력 해시 (완료 기록에 사용)"""
+        return {path: file_hash(path) for path in stage.inputs}
+
+    def complete(self, stage: Stage, input_hashes: Dict[str, Optional[str]]):
+        """성공한 단계 기록 후 즉시 저장 (다음 단계가 실패해도 유지)"""
+        self.records[stage.name] = {
+            'key': self.stage_key(stage, input_hashes),
+            'inputs': input_hashes,
+            'outputs': {path: file_hash(path) for path in stage.outputs},
+            'completed_at': datetime.now().isoformat()
+        }
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.records, f, indent=2)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+구독자별 다이제스트
+공유 분석 리포트 하나를 구독자 설정(보기/섹션/언어)에 맞게 투영하고 렌더링
+LLM 호출 없이 렌더링만 추가되므로 구독자 수가 늘어도 분석 비용은 그대로
+"""
+
+import json
+import os
+from typing import Dict, List, Tuple
+
+from localization import localize_report
+from send_telegram_message import SECTIONS, format_gemini_report
+
+SUBSCRIBERS_CONFIG = os.getenv('SUBSCRIBERS_CONFIG', 'config/subscribers.json')
+
+# 미리 정의된 보기 -> 섹션 목록
+VIEWS = {
+    'full': list(SECTIONS),
+    'stock': ['header', 'stock', 'sentiment', 'outlook', 'risks', 'correlation', 'sources'],
+    'product': ['header', 'sentiment', 'summary', 'insights', 'headlines', 'topics', 'trending', 'threads', 'opportunities', 'sources'],
+    'brief': ['header', 'stock', 'sentiment', 'summary', 'sources']
+}
+
+
+def load_subscribers(path: str = None) -> List[Dict]:
+    """구독자 목록 (설정 파일이 없으면 TELEGRAM_CHAT_ID 한 명에게 전체 보기)"""
+    path = path or SUBSCRIBERS_CONFIG
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            subscribers = json.load(f).get('subscribers', [])
+        if subscribers:
+            return subscribers
+
+    chat_id = os.getenv('TELEGRAM_CHAT_ID')
+    return [{'chat_id': chat_id, 'view': 'full', 'language': 'ko'}] if chat_id else []
+
+
+def subscriber_profile(subscriber: Dict) -> Tuple[Tuple[str, ...], str]:
+    """렌더링 결과를 결정하는 (섹션, 언어) 조합
+
+    알 수 없는 섹션은 경고 후 제외 (남는 섹션이 없으면 전체 보기), 설정 오류가 다른 구독자 전송을 막지 않음
+    언어는 섹션 제목과 뉴스 제목에만 적용 (Gemini 분석 본문은 한국어 그대로)
+    """
+    sections = subscriber.get('sections') or VIEWS.get(subscriber.get('view', 'full'), VIEWS['full'])
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        print(f"⚠️  Ignoring unknown sections for {subscriber.get('chat_id')}: {', '.join(sorted(unknown))}")
+        sections = [s for s in sections if s in SECTIONS] or VIEWS['full']
+    return tuple(sections), subscriber.get('language', 'ko')
+
+
+def render_digests(report: Dict, subscribers: List[Dict]) -> Dict[str, str]:
+    """chat_id -> 메시지 (같은 설정의 구독자는 렌더링 결과, 같은 언어는 번역 결과 공유)"""
+    rendered: Dict[Tuple, str] = {}
+    localized: Dict[str, Dict] = {}
+    messages = {}
+    for subscriber in subscribers:
+        profile = subscriber_profile(subscriber)
+        if profile not in rendered:
+            sections, language = profile
+            # 제목을 표시하는 섹션이 있을 때만 번역
+            if 'headlines' not in sections:
+                source = report
+            else:
+                if language not in localized:
+                    localized[language] = localize_report(report, language)
+                source = localized[language]
+            rendered[profile] = format_gemini_report(source, sections=list(sections), language=language)
+        messages[str(subscriber['chat_id'])] = rendered[profile]
+    return messages
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+엔티티 태거
+제품/경영진/공급사/티커 사전을 토큰 트라이로 컴파일하여 텍스트당 한 번의 스캔으로 최장 일치 태깅
+모델 번호('iPhone 17 Pro'의 17)는 숫자 와일드카드로 처리하고, Reddit 등의 캐시태그($AAPL)도 추출
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+NUMBER = '#'  # 사전 항목의 숫자 와일드카드 토큰
+
+# 기본 사전 (분류 -> 표준 이름 -> 별칭 목록)
+# 표준 이름의 '#'은 매칭된 숫자로 치환됨 (예: 'iPhone # Pro' -> 'iPhone 17 Pro')
+DEFAULT_GAZETTEER: Dict[str, Dict[str, List[str]]] = {
+    'product': {
+        'iPhone #': ['iphone #'],
+        'iPhone # Pro': ['iphone # pro'],
+        'iPhone # Pro Max': ['iphone # pro max'],
+        'iPhone # Plus': ['iphone # plus'],
+        'iPhone Air': ['iphone air'],
+        'iPhone SE': ['iphone se'],
+        'iPhone': ['iphone'],
+        'iPad Pro': ['ipad pro'],
+        'iPad Air': ['ipad air'],
+        'iPad mini': ['ipad mini'],
+        'iPad': ['ipad'],
+        'MacBook Pro': ['macbook pro'],
+        'MacBook Air': ['macbook air'],
+        'iMac': ['imac'],
+        'Mac mini': ['mac mini'],
+        'Mac Studio': ['mac studio'],
+        'Mac Pro': ['mac pro'],
+        'Apple Watch Series #': ['apple watch series #', 'watch series #'],
+        'Apple Watch Ultra': ['apple watch ultra', 'watch ultra'],
+        'Apple Watch': ['apple watch'],
+        'AirPods Pro': ['airpods pro'],
+        'AirPods Max': ['airpods max'],
+        'AirPods': ['airpods'],
+        'Vision Pro': ['apple vision pro', 'vision pro'],
+        'Apple TV': ['apple tv'],
+        'HomePod': ['homepod'],
+        'Apple Intelligence': ['apple intelligence'],
+        'Siri': ['siri'],
+        'iOS #': ['ios #'],
+        'macOS': ['macos'],
+        'watchOS': ['watchos'],
+        'visionOS': ['visionos'],
+        'App Store': ['app store'],
+        'Apple Pay': ['apple pay'],
+        'Apple Music': ['apple music'],
+        'iCloud': ['icloud'],
+        'Apple Silicon': ['apple silicon'],
+        # M/A 시리즈 칩 (토큰 안에 숫자가 붙어 있으므로 세대별로 전개)
+        **{f"M{n}{tier}": [f"m{n}{tier.lower()}"] for n in range(1, 7) for tier in ('', ' Pro', ' Max', ' Ultra')},
+        **{f"A{n}{tier}": [f"a{n}{tier.lower()}"] for n in range(15, 21) for tier in ('', ' Pro', ' Bionic')},
+    },
+    'person': {
+        'Tim Cook': ['tim cook'],
+        'Jeff Williams': ['jeff williams'],
+        'Craig Federighi': ['craig federighi', 'federighi'],
+        'John Ternus': ['john ternus', 'ternus'],
+        'Kevan Parekh': ['kevan parekh'],
+        'Luca Maestri': ['luca maestri'],
+        'Sabih Khan': ['sabih khan'],
+        'Eddy Cue': ['eddy cue'],
+        'Greg Joswiak': ['greg joswiak', 'joswiak'],
+        "Deirdre O'Brien": ["deirdre o'brien"],
+        'Johny Srouji': ['johny srouji', 'srouji'],
+        'Phil Schiller': ['phil schiller'],
+        'Jony Ive': ['jony ive'],
+        'Mark Gurman': ['mark gurman', 'gurman'],
+        'Ming-Chi Kuo': ['ming chi kuo'],
+    },
+    'supplier': {
+        'TSMC': ['tsmc', 'taiwan semiconductor'],
+        'Foxconn': ['foxconn', 'hon hai'],
+        'Pegatron': ['pegatron'],
+        'Luxshare': ['luxshare'],
+        'Wistron': ['wistron'],
+        'Tata Electronics': ['tata electronics'],
+        'Samsung Display': ['samsung display'],
+        'LG Display': ['lg display'],
+        'BOE': ['boe'],
+        'Qualcomm': ['qualcomm'],
+        'Broadcom': ['broadcom'],
+        'Cirrus Logic': ['cirrus logic'],
+        'Skyworks': ['skyworks'],
+        'Qorvo': ['qorvo'],
+        'Corning': ['corning'],
+        'Murata': ['murata'],
+        'Goertek': ['goertek'],
+        'Sony': ['sony'],
+    },
+}
+
+# 티커: 대문자로 쓰인 경우에만 매칭 (일반 단어와 겹치는 짧은 기호 오탐 방지)
+DEFAULT_TICKERS = ['AAPL', 'TSM', 'QCOM', 'AVGO', 'SWKS', 'QRVO', 'CRUS', 'GLW', 'MSFT', 'GOOGL', 'GOOG',
+                   'AMZN', 'META', 'NVDA', 'SONY', 'INTC', 'AMD']
+
+# 분류 표시 이름 (프롬프트/리포트용)
+CATEGORY_LABELS = {'product': '제품', 'person': '인물', 'supplier': '공급사', 'ticker': '티커'}
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+(?:'[A-Za-z]+)?")
+CASHTAG_PATTERN = re.compile(r'(?<![A-Za-z0-9$])\$([A-Za-z]{1,5})(?![A-Za-z0-9])')
+NUMBER_PATTERN = re.compile(r'\d{1,2}')  # 모델 번호로 볼 숫자 (1-2자리)
+
+
+class _Node:
+    __slots__ = ('children', 'entities')
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        # [(분류, 표준 이름, 대문자만)] - 'sony'(공급사)와 'SONY'(티커)처럼 같은 토큰에 여러 엔티티가 걸릴 수 있음
+        self.entities: List[Tuple[str, str, bool]] = []
+
+    def match(self, token: str) -> Optional[Tuple[str, str, bool]]:
+        """토큰 표기에 맞는 엔티티 (대문자 표기면 대문자 전용 항목 우선)"""
+        upper = token.isupper()
+        for entity in sorted(self.entities, key=lambda e: not e[2]):
+            if not entity[2] or upper:
+                return entity
+        return None
+
+
+class EntityTagger:
+    """사전을 토큰 트라이로 컴파일한 태거"""
+
+    def __init__(self, gazetteer: Dict[str, Dict[str, List[str]]] = None, tickers: List[str] = None):
+        self.root = _Node()
+        for category, entries in (gazetteer or DEFAULT_GAZETTEER).items():
+            for canonical, aliases in entries.items():
+                for alias in aliases:
+                    self._insert(alias.split(), (category, canonical, False))
+        for ticker in tickers if tickers is not None else DEFAULT_TICKERS:
+            self._insert([ticker.lower()], ('ticker', f"${ticker}", True))
+
+    def _insert(self, tokens: List[str], entity: Tuple[str, str, bool]):
+        node = self.root
+        for token in tokens:
+            node = node.children.setdefault(token, _Node())
+        if entity not in node.entities:
+            node.entities.append(entity)
+
+    def tag(self, text: str) -> List[Tuple[str, str]]:
+        """(분류, 표준 이름) 목록 (등장 순서, 겹치면 가장 긴 일치 우선)"""
+        if not text:
+            return []
+
+        tokens = TOKEN_PATTERN.findall(text)
+        lowered = [t.lower() for t in tokens]
+        found = []
+        i = 0
+        while i < len(tokens):
+            node = self.root
+            match = None
+            numbers = []
+            j = i
+            while j < len(tokens):
+                token = lowered[j]
+                child = node.children.get(token)
+                if child is None and NUMBER_PATTERN.fullmatch(token):
+                    child = node.children.get(NUMBER)
+                    if child is not None:
+                        numbers = numbers + [token]
+                if child is None:
+                    break
+                node = child
+                j += 1
+                entity = node.match(tokens[j - 1])
+                if entity:
+                    match = (j, entity, numbers)
+
+            if match is None:
+                i += 1
+                continue
+
+            end, (category, canonical, _), numbers = match
+            for number in numbers:
+                canonical = canonical.replace(NUMBER, number, 1)
+            found.append((category, canonical))
+            i = end
+
+        # 캐시태그 ($AAPL)
+        found.extend(('ticker', f"${m.group(1).upper()}") for m in CASHTAG_PATTERN.finditer(text))
+        return found
+
+    def count(self, texts: Iterable[str]) -> Dict[str, Counter]:
+        """분류별 엔티티 등장 횟수 (한 텍스트 안의 반복은 한 번만)"""
+        counts: Dict[str, Counter] = {}
+        for text in texts:
+            for category, name in set(self.tag(text)):
+                counts.setdefault(category, Counter())[name] += 1
+        return counts
+
+
+_default_tagger: Optional[EntityTagger] = None
+
+
+def get_tagger() -> EntityTagger:
+    """기본 사전으로 컴파일된 공유 태거"""
+    global _default_tagger
+    if _default_tagger is None:
+        _default_tagger = EntityTagger()
+    return _default_tagger
+
+
+def entity_counts(texts: Iterable[str], top_n: int = 10) -> Dict[str, List[Tuple[str, int]]]:
+    """리포트용 분류별 상위 엔티티 [(이름, 항목 수)]"""
+    return {category: counter.most_common(top_n) for category, counter in get_tagger().count(texts).items()}
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+기사 본문 추출 스크립트 (선택 단계)
+상위 뉴스의 HTML을 내려받아 본문 텍스트를 추출하고 full_text 필드로 추가
+Directive: directives/extract_articles.md
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+from records import Article, load_records, save_records
+from sources import USER_AGENT
+
+CACHE_DIR = '.tmp/article_cache'
+CACHE_MAX_AGE = 24 * 3600  # 캐시된 본문 재사용 기간 (초)
+
+TOP_N = int(os.getenv('FULLTEXT_TOP_N', '10'))   # 추출 대상 상위 기사 수
+MAX_WORKERS = 6                                  # 전체 동시 다운로드 수
+PER_DOMAIN_CONCURRENCY = 2                       # 도메인별 동시 다운로드 수
+MAX_BYTES = 2 * 1024 * 1024                      # 기사당 최대 다운로드 크기
+REQUEST_TIMEOUT = (5, 10)                        # (연결, 읽기) 제한 시간
+TOTAL_TIMEOUT = 30                               # 단계 전체 제한 시간 (초)
+MAX_TEXT_CHARS = 5000                            # 저장할 본문 최대 길이
+MIN_PARAGRAPH_CHARS = 40                         # 본문으로 인정할 최소 문단 길이
+
+# 본문을 직접 내려받을 수 없는 도메인 (JS 리다이렉트 등)
+SKIP_DOMAINS = {'news.google.com'}
+
+NOISE_TAGS = ['script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'figure', 'iframe']
+
+
+def cache_path(url: str) -> str:
+    """URL 해시 기반 캐시 파일 경로
+
+    본문 내용이나 ETag가 아닌 URL로만 찾으므로, 같은 URL의 기사가 수정되어도
+    캐시가 만료(CACHE_MAX_AGE)되기 전까지는 처음 받은 본문을 사용
+    """
+    digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIR, digest[:2], f"{digest}.json")
+
+
+def load_cached(url: str) -> Optional[str]:
+    """캐시된 본문 반환 (없거나 CACHE_MAX_AGE가 지났으면 None)"""
+    path = cache_path(url)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        cached = json.load(f)
+    if time.time() - cached.get('fetched_at', 0) > CACHE_MAX_AGE:
+        return None
+    return cached.get('text')
+
+
+def save_cached(url: str, text: str):
+    """추출된 본문 캐시에 저장"""
+    path = cache_path(url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'url': url, 'text': text, 'fetched_at': time.time()}, f, ensure_ascii=False)
+
+
+def download_html(url: str) -> Tuple[bytes, Optional[str]]:
+    """크기 제한을 적용하여 HTML 다운로드 (원본 바이트, 헤더에 명시된 문자셋)
+
+    헤더에 charset이 없으면 requests는 ISO-8859-1로 간주하므로 디코딩하지 않고
+    BeautifulSoup이 <meta charset>/UTF-8 여부로 판단하도록 원본 바이트를 넘김
+    """
+    with requests.get(url, timeout=REQUEST_TIMEOUT, stream=True,
+                      headers={'User-Agent': USER_AGENT}) as response:
+        response.raise_for_status()
+
+        content_type = response.headers.get('Content-Type', '')
+        if 'html' not in content_type:
+            raise ValueError(f"Not HTML: {content_type}")
+
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= MAX_BYTES:
+                break  # 앞부분만으로도 본문 추출에 충분
+
+        encoding = response.encoding if 'charset=' in content_type.lower() else None
+        return b''.join(chunks), encoding
+
+
+def extract_main_text(html: bytes, encoding: Optional[str] = None) -> str:
+    """HTML에서 본문 텍스트 추출 (<article> 우선, 없으면 긴 문단 모음)"""
+    soup = BeautifulSoup(html, 'html.parser', from_encoding=encoding)
+    for tag in soup(NOISE_TAGS):
+        tag.decompose()
+
+    container = soup.find('article') or soup.body or soup
+    paragraphs = [p.get_text(' ', strip=True) for p in container.find_all('p')]
+    paragraphs = [p for p in paragraphs if len(p) >= MIN_PARAGRAPH_CHARS]
+
+    return '\n'.join(paragraphs)[:MAX_TEXT_CHARS]
+
+
+def extract_articles(articles: List[Article], top_n: int = TOP_N) -> int:
+    """상위 기사의 full_text 채우기 (제자리 수정), 추출 성공 수 반환"""
+    targets = [a for a in articles[:top_n] if urlparse(a.url).netloc not in SKIP_DOMAINS]
+
+    # 캐시 적중은 다운로드 없이 바로 채움
+    pending = []
+    for article in targets:
+        cached = load_cached(article.url)
+        if cached is not None:
+            article.full_text = cached
+        else:
+            pending.append(article)
+
+    domain_limits: Dict[str, threading.Semaphore] = {}
+    for article in pending:
+        domain_limits.setdefault(urlparse(article.url).netloc, threading.Semaphore(PER_DOMAIN_CONCURRENCY))
+
+    def run_one(article: Article) -> str:
+        with domain_limits[urlparse(article.url).netloc]:
+            text = extract_main_text(*download_html(article.url))
+        save_cached(article.url, text)
+        return text
+
+    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    futures = {executor.submit(run_one, article): article for article in pending}
+    done, not_done = wait(futures, timeout=TOTAL_TIMEOUT)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    for future in done:
+        article = futures[future]
+        try:
+            article.full_text = future.result()
+        except Exception as e:
+            print(f"✗ {article.source}: {e}")
+
+    if not_done:
+        print(f"⚠️  {len(not_done)} articles skipped (time budget {TOTAL_TIMEOUT}s exceeded)")
+
+    extracted = sum(1 for a in targets if a.full_text)
+    print(f"✓ Full text: {extracted}/{len(targets)} articles ({len(targets) - len(pending)} from cache)")
+    return extracted
+
+
+def main():
+    """메인 실행 함수"""
+    print("📄 Starting full-text extraction...")
+
+    news_file = '.tmp/news_articles.json'
+    if not os.path.exists(news_file):
+        print(f"❌ News file not found: {news_file}")
+        return False
+
+    articles = load_records(news_file, Article)
+    extract_articles(articles)
+    save_records(news_file, articles)
+
+    print(f"✅ Updated {news_file}")
+
+    # 본문 추출 실패는 요약만으로 분석을 계속할 수 있으므로 항상 성공
+    return True
+
+if __name__ == '__main__':
+    success = main()
+    exit(0 if success else 1)
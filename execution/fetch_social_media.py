@@ -6,197 +6,250 @@ Directive: directives/collect_social_media.md
 
 import json
 import os
-import requests
+import threading
 import time
-from datetime import datetime, timedelta
-from typing import List, Dict
-
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from ranking import rank_items
+from records import SocialPost, save_records
+from relevance import get_matcher
+from sources import USER_AGENT, collect, fetch_feed, register_parser
+from text_clean import clean_html
+
+DATA_DIR = os.getenv('DATA_DIR', 'data')
+REDDIT_CURSOR_FILE = os.path.join(DATA_DIR, 'reddit_cursors.json')
+REDDIT_PAGE_SIZE = 100        # 리스팅 한 페이지의 최대 포스트 수 (Reddit 상한)
+REDDIT_MAX_PAGES = 3          # 수집 한 번에 따라갈 최대 페이지 수
+REDDIT_MAX_AGE = 24 * 3600    # 일일 스냅샷/첫 증분 폴링에서 가져올 기간 (초)
+REDDIT_MIN_INTERVAL = 1.0     # Reddit 요청 간 최소 간격 (초, 모든 스레드 공유)
+REDDIT_MAX_WAIT = 60          # 속도 제한 응답 시 최대 대기 시간 (초)
+
+
+class RateLimiter:
+    """호스트 단위 요청 간격 제한 (응답의 X-Ratelimit-* 헤더로 남은 한도 반영)"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self.next_request = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        # 요청 시각을 순서대로 예약하고 잠금 밖에서 대기 (동시 요청이 간격을 두고 나감)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self.next_request)
+            self.next_request = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def update(self, headers):
+        """한도를 다 쓰면 초기화 시각까지 다음 요청을 미룸"""
+        try:
+            remaining = float(headers.get('X-Ratelimit-Remaining', 1))
+            reset = float(headers.get('X-Ratelimit-Reset', 0))
+        except ValueError:
+            return
+        if remaining < 1:
+            with self._lock:
+                self.next_request = max(self.next_request, time.monotonic() + min(reset, REDDIT_MAX_WAIT))
+
+
+reddit_limiter = RateLimiter(REDDIT_MIN_INTERVAL)
+_cursor_lock = threading.Lock()
+_pending_cursors: Dict[str, Dict] = {}  # 수집했지만 아직 처리되지 않은 결과의 커서 (commit_reddit_cursor에서 저장)
+
+
+def load_reddit_cursor(name: str) -> Optional[Dict]:
+    """소비자:소스별 마지막으로 본 포스트 {'name': fullname, 'created': created_utc, 'seen': [같은 초의 fullname]}"""
+    if not os.path.exists(REDDIT_CURSOR_FILE):
+        return None
+    with _cursor_lock, open(REDDIT_CURSOR_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f).get(name)
+
+
+def save_reddit_cursor(name: str, cursor: Dict):
+    """해당 키의 커서만 갱신 (다른 스레드/프로세스가 저장한 키는 유지)"""
+    with _cursor_lock:
+        cursors = {}
+        if os.path.exists(REDDIT_CURSOR_FILE):
+            with open(REDDIT_CURSOR_FILE, 'r', encoding='utf-8') as f:
+                cursors = json.load(f)
+        cursors[name] = cursor
+        os.makedirs(os.path.dirname(REDDIT_CURSOR_FILE) or '.', exist_ok=True)
+        tmp_path = f"{REDDIT_CURSOR_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cursors, f)
+        os.replace(tmp_path, REDDIT_CURSOR_FILE)
+
+
+def fetch_listing(url: str, params: Dict, timeout: float) -> Dict:
+    """속도 제한을 지키며 리스팅 한 페이지 요청 (429면 Retry-After만큼 기다린 뒤 한 번 재시도)"""
+    for attempt in range(2):
+        reddit_limiter.wait()
+        response = requests.get(url, params=params, timeout=timeout, headers={'User-Agent': USER_AGENT})
+        reddit_limiter.update(response.headers)
+        if response.status_code == 429 and attempt == 0:
+            time.sleep(min(float(response.headers.get('Retry-After', 5)), REDDIT_MAX_WAIT))
+            continue
+        response.raise_for_status()
+        return response.json()['data']
+    return {}
+
+
+def fetch_pages(url: str, params: Dict, timeout: float, max_pages: int, oldest: float,
+                seen: Iterable[str] = ()) -> List[Dict]:
+    """after 커서로 페이지를 따라가며 oldest 이후(같은 초 포함) 포스트 수집
+
+    seen(이미 본 fullname)은 제외, 더 오래되었거나 이미 본 포스트가 나오면 중단
+    """
+    seen = set(seen)
+    children = []
+    after = None
+    for _ in range(max_pages):
+        page_params = {**params, 'limit': REDDIT_PAGE_SIZE, 'raw_json': 1}
+        if after:
+            page_params['after'] = after
+        listing = fetch_listing(url, page_params, timeout)
+
+        page = [child['data'] for child in listing.get('children', [])]
+        fresh = [p for p in page if p['created_utc'] >= oldest and p['name'] not in seen]
+        children.extend(fresh)
+
+        after = listing.get('after')
+        if len(fresh) < len(page) or not after:
+            break
+    return children
+
+
+@register_parser('reddit_json')
+def parse_reddit_json(source: Dict, timeout: float) -> List[SocialPost]:
+    """Reddit JSON 리스팅 수집 (실제 score/num_comments 사용)
+
+    - 기본 (일일 리포트): 하루 인기글(top?t=day)을 after로 따라가며 스냅샷, 커서 없음 (재실행해도 같은 결과)
+    - source에 cursor(소비자 이름)가 있으면 (서비스 모드): 최신글(new)에서 그 소비자가
+      마지막으로 본 포스트 이후만 수집, 결과를 처리한 뒤 commit_reddit_cursor로
+      data/reddit_cursors.json에 소비자별로 기록
+    """
+    base = source['url'].rstrip('/')
+    max_pages = source.get('max_pages', REDDIT_MAX_PAGES)
+    consumer = source.get('cursor')
+
+    if consumer:
+        key = f"{consumer}:{source['name']}"
+        cursor = load_reddit_cursor(key)
+        if cursor:
+            # 같은 초에 올라온 포스트를 놓치지 않도록 같은 시각부터 받고 이미 본 fullname은 제외
+            oldest, seen = cursor['created'], cursor.get('seen', [cursor['name']])
+        else:
+            oldest, seen = time.time() - REDDIT_MAX_AGE, []
+        children = fetch_pages(f"{base}/new.json", {}, timeout, max_pages, oldest, seen)
+        if children:
+            newest = max(p['created_utc'] for p in children)
+            same_second = [p['name'] for p in children if p['created_utc'] == newest]
+            if newest == oldest:
+                same_second += seen
+            # 결과가 처리된 뒤에만 커서를 진행 (시간 초과 등으로 버려진 결과는 다음 폴링에서 다시 수집)
+            with _cursor_lock:
+                _pending_cursors[key] = {'name': same_second[0], 'created': newest, 'seen': same_second}
+    else:
+        # top은 점수순이라 날짜로 중단하지 않고 페이지 수만큼 받은 뒤 기간 필터
+        oldest = time.time() - REDDIT_MAX_AGE
+        children = fetch_pages(f"{base}/top.json", {'t': 'day'}, timeout, max_pages, 0)
+        children = [p for p in children if p['created_utc'] > oldest]
 
-def fetch_reddit_rss() -> List[Dict]:
-    """Reddit RSS 피드로 애플 관련 포스트 수집 (우회 방법)"""
+    matcher = get_matcher()
     posts = []
-
-    try:
-        import feedparser
-
-        # Reddit RSS 피드 사용 (JSON API보다 차단 가능성 낮음)
-        subreddits = ['apple', 'stocks', 'investing', 'wallstreetbets']
-        keywords = ['apple', 'aapl', 'iphone', 'ipad', 'mac', 'tim cook']
-
-        for subreddit_name in subreddits:
-            try:
-                # Reddit RSS 피드 URL (.rss 확장자 사용)
-                url = f"https://www.reddit.com/r/{subreddit_name}/hot.rss?limit=50"
-
-                # feedparser는 User-Agent를 자동으로 설정
-                feed = feedparser.parse(url)
-
-                if not feed.entries:
-                    print(f"✗ Reddit r/{subreddit_name} RSS returned no entries")
-                    continue
-
-                for entry in feed.entries:
-                    title_lower = entry.title.lower()
-
-                    # 키워드 필터링
-                    if any(keyword in title_lower for keyword in keywords):
-                        # RSS에서 점수 추출 (summary에 포함되어 있음)
-                        score = 0
-                        comments = 0
-
-                        # summary에서 점수와 댓글 수 파싱 시도
-                        if hasattr(entry, 'summary'):
-                            import re
-                            score_match = re.search(r'(\d+)\s+points?', entry.summary)
-                            comments_match = re.search(r'(\d+)\s+comments?', entry.summary)
-                            if score_match:
-                                score = int(score_match.group(1))
-                            if comments_match:
-                                comments = int(comments_match.group(1))
-
-                        posts.append({
-                            'platform': 'reddit',
-                            'title': entry.title,
-                            'url': entry.link,
-                            'score': score,
-                            'comments': comments,
-                            'created': entry.get('published', datetime.now().isoformat()),
-                            'text': entry.get('summary', '')[:500]
-                        })
-
-                print(f"✓ Reddit r/{subreddit_name} RSS: {len([p for p in posts if subreddit_name in p['url']])} posts")
-                time.sleep(2)  # RSS 피드도 속도 제한 준수
-
-            except Exception as e:
-                print(f"✗ Reddit r/{subreddit_name} RSS error: {e}")
-
-    except Exception as e:
-        print(f"✗ Reddit RSS error: {e}")
+    for post in children:
+        # 삭제/제거된 포스트와 관련 없는 포스트 제외
+        if post.get('removed_by_category') or not matcher.is_relevant(post['title']):
+            continue
+
+        posts.append(SocialPost(
+            platform=source.get('platform', 'reddit'),
+            title=post['title'],
+            url=f"https://www.reddit.com{post['permalink']}",
+            score=post.get('score', 0),
+            comments=post.get('num_comments', 0),
+            created=datetime.fromtimestamp(post['created_utc'], timezone.utc).isoformat(),
+            text=clean_html(post.get('selftext', ''))[:500]
+        ))
 
     return posts
 
 
-def fetch_google_news_discussions() -> List[Dict]:
-    """Google News에서 애플 관련 토론/의견 기사 수집"""
-    posts = []
+def commit_reddit_cursor(source: Dict, new_items: List, items: List):
+    """폴링 핸들러: 처리가 끝난 수집 결과까지 소비자별 커서 진행"""
+    if not source.get('cursor'):
+        return
+    key = f"{source['cursor']}:{source['name']}"
+    with _cursor_lock:
+        cursor = _pending_cursors.pop(key, None)
+    if cursor:
+        save_reddit_cursor(key, cursor)
 
-    try:
-        import feedparser
-
-        # Google News RSS - 의견/분석 기사
-        queries = [
-            'Apple stock analysis',
-            'AAPL stock opinion',
-            'Apple earnings discussion'
-        ]
-
-        for query in queries:
-            try:
-                url = f"https://news.google.com/rss/search?q={query.replace(' ', '+')}&hl=en-US&gl=US&ceid=US:en"
-                feed = feedparser.parse(url)
-
-                for entry in feed.entries[:10]:
-                    posts.append({
-                        'platform': 'google_news',
-                        'title': entry.title,
-                        'url': entry.link,
-                        'score': 0,  # Google News doesn't have scores
-                        'comments': 0,
-                        'created': entry.get('published', datetime.now().isoformat()),
-                        'text': entry.get('summary', '')[:500]
-                    })
-
-                print(f"✓ Google News ({query}): {len([p for p in posts if query.split()[0].lower() in p['title'].lower()])} articles")
-                time.sleep(1)
-
-            except Exception as e:
-                print(f"✗ Google News ({query}) error: {e}")
 
-    except Exception as e:
-        print(f"✗ Google News error: {e}")
-
-    return posts
+@register_parser('rss_social')
+def parse_rss_social(source: Dict, timeout: float) -> List[SocialPost]:
+    """점수 정보가 없는 RSS 피드 수집 (Google News 토론/의견 기사, Seeking Alpha)"""
+    feed = fetch_feed(source['url'], timeout)
 
-
-def fetch_seeking_alpha_rss() -> List[Dict]:
-    """Seeking Alpha RSS에서 애플 관련 분석 수집"""
     posts = []
-
-    try:
-        import feedparser
-
-        # Seeking Alpha Apple 피드
-        url = "https://seekingalpha.com/api/sa/combined/AAPL.xml"
-
-        try:
-            feed = feedparser.parse(url)
-
-            for entry in feed.entries[:15]:
-                posts.append({
-                    'platform': 'seeking_alpha',
-                    'title': entry.title,
-                    'url': entry.link,
-                    'score': 0,
-                    'comments': 0,
-                    'created': entry.get('published', datetime.now().isoformat()),
-                    'text': entry.get('summary', '')[:500]
-                })
-
-            print(f"✓ Seeking Alpha: {len(posts)} articles")
-
-        except Exception as e:
-            print(f"✗ Seeking Alpha error: {e}")
-
-    except Exception as e:
-        print(f"✗ Seeking Alpha RSS error: {e}")
+    for entry in feed.entries[:source.get('limit', 10)]:
+        posts.append(SocialPost(
+            platform=source['platform'],
+            title=entry.title,
+            url=entry.link,
+            score=0,  # RSS에는 점수 정보 없음
+            comments=0,
+            created=entry.get('published', datetime.now().isoformat()),
+            text=clean_html(entry.get('summary', ''))[:500]
+        ))
 
     return posts
 
 
-def fetch_hackernews() -> List[Dict]:
+@register_parser('hackernews')
+def parse_hackernews(source: Dict, timeout: float) -> List[SocialPost]:
     """Hacker News에서 애플 관련 포스트 수집"""
-    posts = []
+    # 최신 스토리 ID 가져오기
+    response = requests.get(source['url'], timeout=timeout)
+    story_ids = response.json()[:source.get('limit', 50)]
+    matcher = get_matcher()
 
-    try:
-        # 최신 스토리 ID 가져오기
-        top_stories_url = "https://hacker-news.firebaseio.com/v0/topstories.json"
-        response = requests.get(top_stories_url, timeout=10)
-        story_ids = response.json()[:100]  # 상위 100개
-
-        keywords = ['apple', 'aapl', 'iphone', 'ipad', 'mac', 'ios']
-
-        for story_id in story_ids[:50]:  # 최대 50개 확인
-            try:
-                story_url = f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
-                story_response = requests.get(story_url, timeout=5)
-                story = story_response.json()
-
-                if story and 'title' in story:
-                    title_lower = story['title'].lower()
-                    if any(keyword in title_lower for keyword in keywords):
-                        posts.append({
-                            'platform': 'hackernews',
-                            'title': story['title'],
-                            'url': story.get('url', f"https://news.ycombinator.com/item?id={story_id}"),
-                            'score': story.get('score', 0),
-                            'comments': story.get('descendants', 0),
-                            'created': datetime.fromtimestamp(story.get('time', 0)).isoformat(),
-                            'text': story.get('text', '')[:500]
-                        })
-            except Exception as e:
-                continue  # 개별 스토리 오류는 스킵
-
-        print(f"✓ Hacker News: {len(posts)} posts")
+    def fetch_story(story_id):
+        try:
+            story_url = f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json"
+            return requests.get(story_url, timeout=5).json()
+        except Exception:
+            return None  # 개별 스토리 오류는 스킵
 
-    except Exception as e:
-        print(f"✗ Hacker News error: {e}")
+    # 스토리 상세는 개별 요청이므로 작은 풀에서 병렬 조회
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        stories = list(executor.map(fetch_story, story_ids))
+
+    posts = []
+    for story_id, story in zip(story_ids, stories):
+        if story and 'title' in story and matcher.is_relevant(story['title']):
+            posts.append(SocialPost(
+                platform=source.get('platform', 'hackernews'),
+                title=story['title'],
+                url=story.get('url', f"https://news.ycombinator.com/item?id={story_id}"),
+                score=story.get('score', 0),
+                comments=story.get('descendants', 0),
+                created=datetime.fromtimestamp(story.get('time', 0)).isoformat(),
+                text=clean_html(story.get('text', ''))[:500]
+            ))
 
     return posts
 
-def filter_and_sort(posts: List[Dict]) -> List[Dict]:
-    """점수 기준으로 정렬 및 필터링"""
-    # 점수 기준 내림차순 정렬
-    sorted_posts = sorted(posts, key=lambda x: x['score'], reverse=True)
+def filter_and_sort(posts: List[SocialPost]) -> List[SocialPost]:
+    """중요도 기준으로 정렬 및 필터링"""
+    # 플랫폼별 정규화 참여도, 최신성, 관련도 등을 결합한 중요도 내림차순 정렬
+    # (점수가 항상 0인 RSS 소스도 다른 요소로 순위 결정)
+    sorted_posts = rank_items(posts)
 
     # 24시간 이내 포스트만 (간단한 필터링)
     # 실제로는 created 시간 파싱 필요하지만 여기서는 상위 항목 유지
@@ -206,45 +259,21 @@ def main():
     """메인 실행 함수"""
     print("💬 Starting social media collection...")
 
-    # 모든 플랫폼에서 포스트 수집
-    all_posts = []
-
-    # Reddit RSS 시도 (우회 방법)
+    # config/sources.json에 선언된 모든 소셜 소스에서 동시 수집
+    # (개별 소스 실패는 레지스트리에서 기록 후 스킵)
     try:
-        reddit_posts = fetch_reddit_rss()
-        all_posts.extend(reddit_posts)
+        all_posts = collect('social')
     except Exception as e:
-        print(f"⚠️  Reddit RSS collection failed: {e}")
-
-    try:
-        google_posts = fetch_google_news_discussions()
-        all_posts.extend(google_posts)
-    except Exception as e:
-        print(f"⚠️  Google News collection failed: {e}")
-
-    try:
-        sa_posts = fetch_seeking_alpha_rss()
-        all_posts.extend(sa_posts)
-    except Exception as e:
-        print(f"⚠️  Seeking Alpha collection failed: {e}")
-
-    try:
-        hn_posts = fetch_hackernews()
-        all_posts.extend(hn_posts)
-    except Exception as e:
-        print(f"⚠️  Hacker News collection failed: {e}")
+        print(f"⚠️  Social media collection failed: {e}")
+        all_posts = []
 
     # 정렬 및 필터링
     filtered_posts = filter_and_sort(all_posts)
     print(f"\n📊 Total filtered posts: {len(filtered_posts)}")
 
     # 결과 저장 (빈 리스트라도 저장)
-    output_dir = '.tmp'
-    os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, 'social_posts.json')
-
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(filtered_posts, f, ensure_ascii=False, indent=2)
+    output_file = os.path.join('.tmp', 'social_posts.json')
+    save_records(output_file, filtered_posts)
 
     if len(filtered_posts) == 0:
         print("⚠️  No social media posts collected, but continuing workflow...")
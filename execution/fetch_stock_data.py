@@ -8,8 +8,14 @@ import json
 import os
 import yfinance as yf
 from datetime import datetime, timedelta
+from typing import Dict
 
-def fetch_stock_data(symbol: str = 'AAPL') -> dict:
+from records import StockSnapshot, save_records
+
+DATA_DIR = os.getenv('DATA_DIR', 'data')
+PRICE_DIR = os.path.join(DATA_DIR, 'prices')
+
+def fetch_stock_data(symbol: str = 'AAPL') -> StockSnapshot:
     """Yahoo Finance에서 주가 데이터 수집"""
     print(f"📈 Fetching stock data for {symbol}...")
 
@@ -62,22 +68,22 @@ def fetch_stock_data(symbol: str = 'AAPL') -> dict:
             week_low = 0
 
         # 결과 구성
-        stock_data = {
-            'symbol': symbol,
-            'current_price': round(float(current_price), 2),
-            'change': round(float(change), 2),
-            'change_percent': round(float(change_percent), 2),
-            'volume': int(hist['Volume'].iloc[-1]) if 'Volume' in hist.columns and not hist['Volume'].empty else 0,
-            'market_cap': market_cap,
-            '52_week_high': week_high,
-            '52_week_low': week_low,
-            'trend_5day': trend,
-            'last_updated': datetime.now().isoformat()
-        }
-
-        print(f"✓ Current price: ${stock_data['current_price']} ({stock_data['change_percent']:+.2f}%)")
+        stock_data = StockSnapshot(
+            symbol=symbol,
+            current_price=round(float(current_price), 2),
+            change=round(float(change), 2),
+            change_percent=round(float(change_percent), 2),
+            volume=int(hist['Volume'].iloc[-1]) if 'Volume' in hist.columns and not hist['Volume'].empty else 0,
+            market_cap=market_cap,
+            week_52_high=week_high,
+            week_52_low=week_low,
+            trend_5day=trend,
+            last_updated=datetime.now().isoformat()
+        )
+
+        print(f"✓ Current price: ${stock_data.current_price} ({stock_data.change_percent:+.2f}%)")
         print(f"✓ 5-day trend: {trend}")
-        print(f"✓ Volume: {stock_data['volume']:,}")
+        print(f"✓ Volume: {stock_data.volume:,}")
 
         return stock_data
 
@@ -89,19 +95,46 @@ def fetch_stock_data(symbol: str = 'AAPL') -> dict:
         traceback.print_exc()
 
         # 오류 시 기본 데이터 반환 (워크플로우 계속 진행)
-        return {
-            'symbol': symbol,
-            'current_price': 0,
-            'change': 0,
-            'change_percent': 0,
-            'volume': 0,
-            'market_cap': 0,
-            '52_week_high': 0,
-            '52_week_low': 0,
-            'trend_5day': '데이터 없음',
-            'last_updated': datetime.now().isoformat(),
-            'error': str(e)
-        }
+        return StockSnapshot(
+            symbol=symbol,
+            last_updated=datetime.now().isoformat(),
+            error=str(e)
+        )
+
+
+def price_history_path(symbol: str) -> str:
+    """일별 종가 캐시 파일 경로"""
+    return os.path.join(PRICE_DIR, f"{symbol}.json")
+
+
+def load_price_history(symbol: str = 'AAPL') -> Dict[str, float]:
+    """캐시된 일별 종가 (날짜 -> 종가, 없으면 빈 dict)"""
+    path = price_history_path(symbol)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def update_price_history(symbol: str = 'AAPL') -> Dict[str, float]:
+    """일별 종가 캐시 갱신 (마지막 날짜 이후만 조회, 첫 실행은 2년치)"""
+    closes = load_price_history(symbol)
+    ticker = yf.Ticker(symbol)
+
+    if closes:
+        # 마지막 캐시 날짜도 다시 받아 장중에 저장된 값을 확정 종가로 교체
+        hist = ticker.history(start=max(closes), auto_adjust=True, actions=False)
+    else:
+        hist = ticker.history(period='2y', auto_adjust=True, actions=False)
+
+    for index, close in hist['Close'].items():
+        closes[index.strftime('%Y-%m-%d')] = round(float(close), 4)
+
+    os.makedirs(PRICE_DIR, exist_ok=True)
+    with open(price_history_path(symbol), 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(closes.items())), f)
+
+    return closes
 
 
 def main():
@@ -114,30 +147,21 @@ def main():
     if not stock_data:
         print("❌ Failed to fetch stock data")
         # 빈 데이터라도 파일 생성
-        stock_data = {
-            'symbol': 'AAPL',
-            'current_price': 0,
-            'change': 0,
-            'change_percent': 0,
-            'volume': 0,
-            'market_cap': 0,
-            '52_week_high': 0,
-            '52_week_low': 0,
-            'trend_5day': '데이터 없음',
-            'last_updated': datetime.now().isoformat()
-        }
-
+        stock_data = StockSnapshot(symbol='AAPL', last_updated=datetime.now().isoformat())
 
     # 결과 저장
-    output_dir = '.tmp'
-    os.makedirs(output_dir, exist_ok=True)
-    output_file = os.path.join(output_dir, 'stock_data.json')
-
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(stock_data, f, ensure_ascii=False, indent=2)
+    output_file = os.path.join('.tmp', 'stock_data.json')
+    save_records(output_file, stock_data)
 
     print(f"✅ Saved stock data to {output_file}")
 
+    # 상관관계 분석용 일별 종가 캐시 갱신 (실패해도 워크플로우 계속)
+    try:
+        closes = update_price_history('AAPL')
+        print(f"✓ Price history: {len(closes)} trading days cached")
+    except Exception as e:
+        print(f"⚠️  Price history update failed: {e}")
+
     return True
 
 if __name__ == '__main__':
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+LLM 백엔드
+Gemini / OpenAI 호환 HTTP / 로컬 스텁 백엔드를 공통 인터페이스로 제공하고,
+동일 프롬프트 요청 병합, 동시 실행 제한, 지연 시간 기반 페일오버를 담당하는 라우터
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+DEFAULT_TIMEOUT = 60          # 백엔드별 호출 제한 시간 (초)
+DEFAULT_MAX_CONCURRENCY = 4   # 동시에 실행할 백엔드 호출 수
+LATENCY_SMOOTHING = 0.3       # 지연 시간 EWMA 가중치
+
+
+class LLMBackend:
+    """백엔드 공통 인터페이스"""
+    name = 'base'
+    label = 'LLM'
+
+    def generate(self, prompt: str, timeout: float) -> str:
+        raise NotImplementedError
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini"""
+    name = 'gemini'
+
+    def __init__(self, model: str = None):
+        import google.generativeai as genai
+
+        api_key = os.getenv('GEMINI_API_KEY')
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY not found in environment variables")
+
+        genai.configure(api_key=api_key)
+        self.model_name = model or os.getenv('GEMINI_MODEL', 'gemini-2.5-flash')
+        self.model = genai.GenerativeModel(self.model_name)
+        self.label = self.model_name
+
+    def generate(self, prompt: str, timeout: float) -> str:
+        response = self.model.generate_content(prompt, request_options={'timeout': timeout})
+        return response.text
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """OpenAI 호환 Chat Completions API (vLLM, Ollama, OpenRouter 등)"""
+    name = 'openai'
+
+    def __init__(self):
+        self.base_url = os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1').rstrip('/')
+        self.api_key = os.getenv('OPENAI_API_KEY', '')
+        self.model_name = os.getenv('OPENAI_MODEL')
+        if not self.model_name:
+            raise ValueError("OPENAI_MODEL not found in environment variables")
+        self.label = self.model_name
+
+    def generate(self, prompt: str, timeout: float) -> str:
+        headers = {'Authorization': f"Bearer {self.api_key}"} if self.api_key else {}
+        response = requests.post(
+            f"{self.base_url}/chat/completions",
+            headers=headers,
+            json={
+                'model': self.model_name,
+                'messages': [{'role': 'user', 'content': prompt}],
+                'temperature': 0.2
+            },
+            timeout=timeout
+        )
+        response.raise_for_status()
+        return response.json()['choices'][0]['message']['content']
+
+
+class StubBackend(LLMBackend):
+    """테스트/벤치마크용 로컬 결정적 백엔드 (네트워크 호출 없음)
+
+    프롬프트 해시로 고정된 분석 JSON을 반환하므로 같은 입력에는 항상 같은 출력
+    """
+    name = 'stub'
+    label = 'Local stub'
+
+    def generate(self, prompt: str, timeout: float) -> str:
+        digest = hashlib.sha256(prompt.encode('utf-8')).digest()
+        score = round(digest[0] / 255, 2)
+        sentiment = "긍정적" if score > 0.6 else "부정적" if score < 0.4 else "중립"
+        return json.dumps({
+            "overall_sentiment": sentiment,
+            "sentiment_score": score,
+            "key_insights": [f"스텁 인사이트 {i} ({digest[i]:02x})" for i in range(1, 4)],
+            "executive_summary": "로컬 스텁 백엔드가 생성한 요약입니다.",
+            "detailed_analysis": "로컬 스텁 백엔드는 실제 분석을 수행하지 않습니다.",
+            "market_outlook": "스텁 전망",
+            "top_topics": ["Apple", "iPhone", "Stub"],
+            "risk_factors": ["스텁 리스크"],
+            "opportunities": ["스텁 기회"]
+        }, ensure_ascii=False)
+
+
+BACKEND_TYPES = {
+    'gemini': GeminiBackend,
+    'openai': OpenAICompatibleBackend,
+    'stub': StubBackend
+}
+
+
+class LLMRouter:
+    """여러 백엔드를 묶어 하나의 generate() 제공
+
+    - 요청 병합: 진행 중인 동일 프롬프트는 새 호출 없이 같은 결과를 공유
+    - 동시 실행 제한: 최대 max_concurrency개의 백엔드 호출 (호출 제한 시간은 각 백엔드의 SDK/HTTP 요청에 전달)
+    - 페일오버: 평균 지연 시간이 짧은 백엔드부터 시도, 실패/시간 초과 시 다음 백엔드
+      (아직 호출하지 않은 백엔드는 측정된 백엔드 뒤에 설정 순서대로)
+    """
+
+    def __init__(self, backends: List[LLMBackend], max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 timeout: float = DEFAULT_TIMEOUT):
+        if not backends:
+            raise ValueError("No LLM backends available")
+
+        self.backends = backends
+        self.timeout = timeout
+        # 측정 전에는 무한대 (측정된 백엔드를 계속 사용하고 스텁 등 뒤쪽 백엔드로 넘어가지 않음)
+        self.latency: Dict[str, float] = {b.name: float('inf') for b in backends}
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _ordered_backends(self) -> List[LLMBackend]:
+        # 정렬이 안정적이므로 지연 시간이 같으면 설정 순서 유지
+        return sorted(self.backends, key=lambda b: self.latency[b.name])
+
+    def _record_latency(self, backend: LLMBackend, seconds: float):
+        previous = self.latency[backend.name]
+        self.latency[backend.name] = seconds if previous == float('inf') else (
+            LATENCY_SMOOTHING * seconds + (1 - LATENCY_SMOOTHING) * previous
+        )
+
+    def _call_with_failover(self, prompt: str) -> Tuple[str, LLMBackend]:
+        errors = []
+        for backend in self._ordered_backends():
+            # 제한 시간은 백엔드의 SDK/HTTP 요청이 직접 적용하므로 호출이 끝나면 슬롯도 반환됨
+            # (호출 스레드에서 실행, 슬롯 대기 시간은 제한 시간에 포함하지 않음)
+            with self._slots:
+                start = time.time()
+                try:
+                    text = backend.generate(prompt, self.timeout)
+                    self._record_latency(backend, time.time() - start)
+                    return text, backend
+                except Exception as e:
+                    errors.append(f"{backend.name}: {e}")
+
+            # 실패한 백엔드는 제한 시간만큼 느린 것으로 간주하여 다음 요청에서 뒤로 밀림
+            self._record_latency(backend, self.timeout)
+            print(f"⚠️  LLM backend failed, trying next: {errors[-1]}")
+
+        raise RuntimeError("All LLM backends failed: " + '; '.join(errors))
+
+    def generate(self, prompt: str) -> str:
+        """프롬프트 실행 (동일 프롬프트가 진행 중이면 그 결과를 기다림)"""
+        return self.generate_with_backend(prompt)[0]
+
+    def generate_with_backend(self, prompt: str) -> Tuple[str, LLMBackend]:
+        """프롬프트 실행 결과와 응답한 백엔드 (병합된 요청도 실제 응답한 백엔드를 받음)"""
+        key = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+        with self._lock:
+            shared = self._inflight.get(key)
+            if shared is None:
+                own = Future()
+                self._inflight[key] = own
+
+        if shared is not None:
+            return shared.result()
+
+        try:
+            result = self._call_with_failover(prompt)
+            own.set_result(result)
+            return result
+        except Exception as e:
+            own.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+
+_router: Optional[LLMRouter] = None
+
+
+def get_router() -> LLMRouter:
+    """LLM_BACKENDS 환경 변수(쉼표 구분, 기본 gemini) 순서로 구성된 공유 라우터"""
+    global _router
+    if _router is None:
+        backends = []
+        for name in os.getenv('LLM_BACKENDS', 'gemini').split(','):
+            name = name.strip()
+            if not name:
+                continue
+            try:
+                backends.append(BACKEND_TYPES[name]())
+            except Exception as e:
+                print(f"⚠️  LLM backend '{name}' unavailable: {e}")
+        _router = LLMRouter(
+            backends,
+            max_concurrency=int(os.getenv('LLM_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY)),
+            timeout=float(os.getenv('LLM_TIMEOUT', DEFAULT_TIMEOUT))
+        )
+    return _router
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+제목 번역 계층
+영어 원문 제목의 번역을 내용 해시로 data/에 캐시하여 실행/구독자 간에 재사용
+캐시에 없는 새 제목만 언어별로 한 번에 모아 LLM(또는 로컬 번역 모델)으로 번역
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+
+DATA_DIR = os.getenv('DATA_DIR', 'data')
+TRANSLATION_CACHE_FILE = os.path.join(DATA_DIR, 'translations.json')
+TRANSLATION_MODEL = os.getenv('TRANSLATION_MODEL', '')  # 로컬 모델 (예: Helsinki-NLP/opus-mt-tc-big-en-{lang})
+
+SOURCE_LANGUAGE = 'en'      # 수집 소스 원문 언어
+BATCH_SIZE = 40             # LLM 요청 하나에 담을 제목 수
+MAX_CACHE_ENTRIES = 5000    # 언어별 보관할 번역 수 (오래된 것부터 삭제)
+
+# 프롬프트에 쓸 언어 이름
+LANGUAGE_NAMES = {
+    'ko': '한국어',
+    'en': 'English',
+    'ja': '日本語',
+    'zh': '简体中文',
+    'es': 'Español',
+    'de': 'Deutsch',
+    'fr': 'Français'
+}
+
+
+def text_key(text: str) -> str:
+    """번역 캐시 키 (공백 정리한 원문의 해시)"""
+    return hashlib.sha256(' '.join(text.split()).encode('utf-8')).hexdigest()[:16]
+
+
+class TranslationCache:
+    """언어 -> {원문 해시: 번역} (JSON 파일, 삽입 순서로 오래된 항목 판단)"""
+
+    def __init__(self, path: str = None):
+        self.path = path or TRANSLATION_CACHE_FILE
+        self.entries: Dict[str, Dict[str, str]] = {}
+        self.dirty = False
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def get(self, language: str, text: str) -> Optional[str]:
+        return self.entries.get(language, {}).get(text_key(text))
+
+    def put(self, language: str, text: str, translation: str):
+        table = self.entries.setdefault(language, {})
+        table.pop(text_key(text), None)
+        table[text_key(text)] = translation
+        while len(table) > MAX_CACHE_ENTRIES:
+            del table[next(iter(table))]
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def build_translation_prompt(titles: List[str], language: str) -> str:
+    """번호를 키로 번역을 돌려받는 일괄 번역 프롬프트"""
+    name = LANGUAGE_NAMES.get(language, language)
+    lines = '\n'.join(f"{i}. {title}" for i, title in enumerate(titles, 1))
+    return f"""Translate the following English news headlines into {name}.
+Keep product names, company names, tickers and numbers as they are. Do not add explanations.
+Respond only with a JSON object mapping each number to its translation, e.g. {{"1": "...", "2": "..."}}.
+
+{lines}
+"""
+
+
+def translate_with_llm(titles: List[str], language: str) -> Dict[str, str]:
+    """LLM 라우터로 일괄 번역 (응답에서 빠진 제목은 결과에 없음)"""
+    from analysis_schema import parse_json_response
+    from llm_backends import get_router
+
+    router = get_router()
+    translated = {}
+    for start in range(0, len(titles), BATCH_SIZE):
+        batch = titles[start:start + BATCH_SIZE]
+        data = parse_json_response(router.generate(build_translation_prompt(batch, language))) or {}
+        for i, title in enumerate(batch, 1):
+            value = data.get(str(i))
+            if isinstance(value, str) and value.strip():
+                translated[title] = value.strip()
+    return translated
+
+
+_pipelines: Dict[str, object] = {}
+
+
+def use_local_model() -> bool:
+    """TRANSLATION_MODEL이 지정되고 transformers가 설치된 경우"""
+    return bool(TRANSLATION_MODEL) and importlib.util.find_spec('transformers') is not None
+
+
+def translate_with_model(titles: List[str], language: str) -> Dict[str, str]:
+    """로컬 번역 모델 (CPU, 언어별 파이프라인 재사용)"""
+    if language not in _pipelines:
+        from transformers import pipeline
+        _pipelines[language] = pipeline('translation', model=TRANSLATION_MODEL.format(lang=language))
+    outputs = _pipelines[language](titles, batch_size=16)
+    return {title: out['translation_text'] for title, out in zip(titles, outputs) if out.get('translation_text')}
+
+
+_cache: Optional[TranslationCache] = None
+_lock = threading.Lock()
+
+
+def translate_titles(titles: Iterable[str], language: str) -> Dict[str, str]:
+    """원문 제목 -> 번역 (캐시에 없는 제목만 번역, 실패하면 원문 그대로)"""
+    global _cache
+    titles = list(dict.fromkeys(t for t in titles if t))
+    if language == SOURCE_LANGUAGE or not titles:
+        return {title: title for title in titles}
+
+    # 잠금은 캐시 읽기/쓰기에만 사용 (번역 호출 중에도 다른 스레드가 캐시된 제목을 조회할 수 있음)
+    with _lock:
+        if _cache is None:
+            _cache = TranslationCache()
+        missing = [title for title in titles if _cache.get(language, title) is None]
+
+    if missing:
+        try:
+            translate = translate_with_model if use_local_model() else translate_with_llm
+            translated = translate(missing, language)
+            with _lock:
+                for title, translation in translated.items():
+                    _cache.put(language, title, translation)
+                _cache.save()
+            print(f"✓ Translated {len(missing)} new titles to {language}"
+                  f" ({len(titles) - len(missing)} cached)")
+        except Exception as e:
+            print(f"⚠️  Title translation to {language} failed: {e}")
+
+    with _lock:
+        return {title: _cache.get(language, title) or title for title in titles}
+
+
+def localize_report(report: Dict, language: str) -> Dict:
+    """리포트 상위 뉴스 제목을 번역한 사본 (원문은 original_title에 보존)"""
+    news = report.get('top_news', [])
+    if language == SOURCE_LANGUAGE or not news:
+        return report
+
+    translations = translate_titles([item.get('title', '') for item in news], language)
+    localized_report = dict(report)
+    localized_report['top_news'] = [
+        {**item, 'title': translations.get(item.get('title', ''), item.get('title', '')), 'original_title': item.get('title', '')}
+        for item in news
+    ]
+    return localized_report
@@ -4,13 +4,23 @@
 모든 단계를 순서대로 실행하는 Layer 2 역할
 """
 
+import argparse
 import sys
 import os
 from datetime import datetime
+from dotenv import load_dotenv
 
 # 실행 스크립트 임포트
 sys.path.insert(0, os.path.dirname(__file__))
 
+from checkpoints import CheckpointManifest, Stage
+
+# 환경 변수 로드 (단계 선택과 체크포인트 env 키가 .env 값을 반영하도록 단계 정의 전에 로드)
+try:
+    load_dotenv()
+except:
+    pass  # GitHub Actions 등에서는 .env 파일이 없을 수 있음
+
 def run_step(step_name: str, script_path: str) -> bool:
     """개별 스크립트 실행"""
     print(f"\n{'='*60}")
@@ -37,33 +47,67 @@ def run_step(step_name: str, script_path: str) -> bool:
         print(f"❌ {step_name} failed with error: {e}")
         return False
 
-def main():
-    """메인 워크플로우"""
+def main(resume: bool = False, force: bool = False):
+    """메인 워크플로우
+
+    resume: 같은 날 수집 결과가 남아 있으면 수집 단계도 건너뜀
+    force: 체크포인트를 무시하고 모든 단계 실행
+    """
     print("🚀 Starting AppleScout Agent Daily Workflow")
     print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
     # 스크립트 디렉토리
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
-    # 실행 단계 정의
+    def script(name: str) -> str:
+        return os.path.join(script_dir, name)
+
+    # 실행 단계 정의 (입력/출력/설정은 체크포인트 키 계산에 사용)
+    news_file = '.tmp/news_articles.json'
+    social_file = '.tmp/social_posts.json'
+    stock_file = '.tmp/stock_data.json'
+    report_file = '.tmp/gemini_report.json'
+
     steps = [
-        ("뉴스 수집", os.path.join(script_dir, "scrape_news.py")),
-        ("소셜 미디어 수집", os.path.join(script_dir, "fetch_social_media.py")),
-        ("주가 데이터 수집", os.path.join(script_dir, "fetch_stock_data.py")),
-        ("Gemini AI 분석", os.path.join(script_dir, "analyze_with_gemini.py")),
-        ("텔레그램 전송", os.path.join(script_dir, "send_telegram_message.py"))
+        Stage("뉴스 수집", script("scrape_news.py"), outputs=[news_file],
+              config=['config/sources.json'], collector=True),
+        Stage("소셜 미디어 수집", script("fetch_social_media.py"), outputs=[social_file],
+              config=['config/sources.json'], collector=True),
+        Stage("주가 데이터 수집", script("fetch_stock_data.py"), outputs=[stock_file], collector=True),
+        Stage("Gemini AI 분석", script("analyze_with_gemini.py"),
+              inputs=[news_file, social_file, stock_file], outputs=[report_file],
+              env=['LLM_BACKENDS', 'GEMINI_MODEL', 'OPENAI_MODEL']),
+        Stage("텔레그램 전송", script("send_telegram_message.py"), inputs=[report_file],
+              config=[os.getenv('SUBSCRIBERS_CONFIG', 'config/subscribers.json')],
+              env=['TELEGRAM_CHAT_ID'])
     ]
 
+    # 선택 단계: 상위 기사 본문 추출 (ENABLE_FULLTEXT=true)
+    if os.getenv('ENABLE_FULLTEXT', 'false').lower() == 'true':
+        steps.insert(1, Stage("기사 본문 추출", script("extract_articles.py"), inputs=[news_file],
+                              outputs=[news_file], env=['FULLTEXT_TOP_N']))
+
+    manifest = CheckpointManifest()
 
     # 각 단계 실행
     results = []
-    for step_name, script_path in steps:
-        success = run_step(step_name, script_path)
-        results.append((step_name, success))
+    for stage in steps:
+        # 수집 단계는 --resume일 때만, 나머지는 입력이 그대로면 항상 이전 결과 재사용
+        reusable = not force and (resume or not stage.collector)
+        if reusable and manifest.is_fresh(stage):
+            print(f"\n⏭️  {stage.name}: inputs unchanged, reusing checkpoint")
+            results.append((stage.name, True))
+            continue
+
+        input_hashes = manifest.begin(stage)
+        success = run_step(stage.name, stage.script)
+        if success:
+            manifest.complete(stage, input_hashes)
+        results.append((stage.name, success))
 
         # 중요 단계 실패 시 중단 (텔레그램 전송은 제외)
-        if not success and step_name != "텔레그램 전송":
-            print(f"\n⚠️  Critical step '{step_name}' failed. Continuing anyway...")
+        if not success and stage.name != "텔레그램 전송":
+            print(f"\n⚠️  Critical step '{stage.name}' failed. Continuing anyway...")
 
     # 결과 요약
     print(f"\n{'='*60}")
@@ -87,5 +131,11 @@ def main():
         return 1
 
 if __name__ == '__main__':
-    exit_code = main()
+    parser = argparse.ArgumentParser(description='AppleScout Agent daily workflow')
+    parser.add_argument('--resume', action='store_true',
+                        help='reuse checkpointed outputs of unchanged stages, including collection')
+    parser.add_argument('--force', action='store_true', help='ignore checkpoints and run every stage')
+    args = parser.parse_args()
+
+    exit_code = main(resume=args.resume, force=args.force)
     sys.exit(exit_code)
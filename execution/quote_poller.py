@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+장중 시세 폴러
+관심 종목의 최신가만 짧은 간격으로 조회하여 메모리 링 버퍼에 보관하고 시가/전일 종가 대비 변동률을 증분 계산
+"""
+
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+
+import pandas as pd
+import yfinance as yf
+
+WATCHLIST = [s.strip() for s in os.getenv('WATCHLIST', 'AAPL').split(',') if s.strip()]
+QUOTE_INTERVAL = int(os.getenv('QUOTE_POLL_SECONDS', '30'))  # 폴링 간격 (초)
+BUFFER_SIZE = 1024                                            # 종목별 보관 틱 수
+FETCH_OVERLAP = 120                                           # 직전 폴링보다 앞서 받을 구간 (초, 지연 봉 대비)
+MAX_WINDOW = 3600                                             # 이보다 오래 쉬었으면 당일 봉 전체 조회 (초)
+
+
+@dataclass(slots=True)
+class QuoteState:
+    """종목별 세션 상태 (세션 값은 거래 세션마다 한 번만 조회)"""
+    symbol: str
+    session_day: str = ''
+    open_price: float = 0.0
+    previous_close: float = 0.0
+    ticks: Deque[Tuple[float, float]] = field(default_factory=lambda: deque(maxlen=BUFFER_SIZE))
+
+    @property
+    def last_price(self) -> Optional[float]:
+        return self.ticks[-1][1] if self.ticks else None
+
+    @property
+    def change_since_open(self) -> Optional[float]:
+        if not self.ticks or not self.open_price:
+            return None
+        return (self.ticks[-1][1] - self.open_price) / self.open_price * 100
+
+    @property
+    def change_since_close(self) -> Optional[float]:
+        if not self.ticks or not self.previous_close:
+            return None
+        return (self.ticks[-1][1] - self.previous_close) / self.previous_close * 100
+
+
+class QuotePoller:
+    """관심 종목 최신가 폴링"""
+
+    def __init__(self, symbols: List[str] = None, interval: int = QUOTE_INTERVAL):
+        self.symbols = symbols or WATCHLIST
+        self.interval = interval
+        self.states = {s: QuoteState(s) for s in self.symbols}
+        self.last_poll = 0.0
+
+    def due(self) -> bool:
+        return time.time() - self.last_poll >= self.interval
+
+    def _refresh_session(self, state: QuoteState, session: str):
+        """새 거래 세션이 시작되면 그 세션의 시가와 전일 종가를 일봉에서 한 번만 조회"""
+        daily = yf.Ticker(state.symbol).history(period='5d', interval='1d', auto_adjust=True, actions=False)
+        days = daily.index.strftime('%Y-%m-%d')
+        today = daily[days == session]
+        before = daily[days < session]
+        state.open_price = float(today['Open'].iloc[0]) if not today.empty else 0.0
+        state.previous_close = float(before['Close'].iloc[-1]) if not before.empty else 0.0
+        # 일봉에 아직 오늘 세션이 없으면 다음 폴링에서 다시 조회
+        state.session_day = session if not today.empty else ''
+
+    def _fetch_last_bars(self, since: Optional[float]) -> Dict[str, Tuple[str, float]]:
+        """종목별 (세션 날짜, 최신 1분봉 종가)를 한 번의 배치 요청으로 조회
+
+        직전 폴링 이후 몇 분치 봉만 받음 (첫 폴링이나 오래 쉰 뒤에는 당일 봉 전체)
+        """
+        window = {'start': datetime.fromtimestamp(since - FETCH_OVERLAP, timezone.utc)} if since else {'period': '1d'}
+        bars = yf.download(self.symbols, interval='1m', progress=False, group_by='ticker',
+                           auto_adjust=True, threads=False, **window)
+        latest = {}
+        if bars is None or bars.empty:
+            return latest
+        for symbol in self.symbols:
+            # yfinance 버전에 따라 단일 종목은 컬럼이 평탄화되어 반환됨
+            frame = bars[symbol] if isinstance(bars.columns, pd.MultiIndex) else bars
+            closes = frame['Close'].dropna()
+            if not closes.empty:
+                # 인덱스는 거래소 시간대이므로 봉 날짜가 곧 세션 날짜
+                latest[symbol] = (closes.index[-1].strftime('%Y-%m-%d'), float(closes.iloc[-1]))
+        return latest
+
+    def poll(self) -> Dict[str, QuoteState]:
+        """최신가를 조회하여 링 버퍼에 추가 (가격이 바뀐 종목만 반환)"""
+        now = time.time()
+        recent = self.last_poll and now - self.last_poll < MAX_WINDOW
+        since = self.last_poll if recent and all(s.session_day for s in self.states.values()) else None
+        self.last_poll = now
+
+        updated = {}
+        for symbol, (session, price) in self._fetch_last_bars(since).items():
+            state = self.states[symbol]
+            # 로컬 날짜가 아니라 최신 봉의 세션 날짜가 바뀔 때 시가/전일 종가 갱신 (장 시작 후 값)
+            if state.session_day != session:
+                self._refresh_session(state, session)
+            if state.last_price != price:
+                state.ticks.append((now, price))
+                updated[symbol] = state
+        return updated
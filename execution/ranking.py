@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+중요도 점수
+소스 신뢰도, 최신성, 플랫폼별 정규화 참여도, 여러 매체 보도 여부, 키워드 관련도를
+한 번의 벡터 연산으로 결합하여 뉴스/소셜 항목 정렬
+"""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from relevance import get_matcher
+from sources import load_config
+from trend_index import tokenize
+
+# 항목별 가중치 (합계 1.0)
+WEIGHTS = {
+    'authority': 0.20,
+    'recency': 0.25,
+    'engagement': 0.20,
+    'coverage': 0.20,
+    'relevance': 0.15
+}
+
+RECENCY_HALF_LIFE = 12.0    # 최신성 반감기 (시간)
+COVERAGE_SIMILARITY = 0.5   # 같은 기사로 볼 제목 토큰 Jaccard 유사도
+NEUTRAL = 0.5               # 값을 알 수 없을 때 (날짜 없음, 참여도 없는 플랫폼)
+
+
+def parse_timestamp(value: str) -> Optional[datetime]:
+    """RSS(RFC 822) 또는 ISO 형식 날짜 파싱 (실패 시 None)"""
+    if not value:
+        return None
+    for parse in (parsedate_to_datetime, datetime.fromisoformat):
+        try:
+            parsed = parse(value)
+        except (TypeError, ValueError, IndexError):
+            continue
+        return parsed if parsed.tzinfo else parsed.astimezone()
+    return None
+
+
+def load_authority(config: Optional[Dict] = None) -> Dict[str, float]:
+    """소스 이름/플랫폼 -> 신뢰도 (설정의 authority, 없으면 priority로 추정)"""
+    try:
+        sources = (config or load_config())['sources']
+    except (OSError, ValueError):
+        return {}
+
+    authority: Dict[str, float] = {}
+    for source in sources:
+        value = source.get('authority', 1.0 / (1.0 + 0.25 * (source.get('priority', 5) - 1)))
+        authority[source['name']] = value
+        # 소셜 항목은 플랫폼만 가지므로 플랫폼 단위로도 (가장 높은 값) 기록
+        platform = source.get('platform')
+        if platform:
+            authority[platform] = max(authority.get(platform, 0.0), value)
+    return authority
+
+
+def _recency(items: List, now: datetime) -> np.ndarray:
+    ages = np.array([
+        (now - ts).total_seconds() / 3600 if ts else np.nan
+        for ts in (parse_timestamp(getattr(item, 'published', '') or getattr(item, 'created', '')) for item in items)
+    ])
+    scores = np.power(0.5, np.clip(ages, 0, None) / RECENCY_HALF_LIFE)
+    return np.where(np.isnan(scores), NEUTRAL, scores)
+
+
+def _engagement(items: List) -> np.ndarray:
+    """플랫폼 안에서 log(점수+댓글)를 최대값으로 정규화 (참여도 정보가 없는 플랫폼은 중립값)"""
+    raw = np.log1p(np.array([getattr(i, 'score', 0) + getattr(i, 'comments', 0) for i in items], dtype=float))
+    platforms = np.array([getattr(i, 'platform', None) or getattr(i, 'source', '') for i in items])
+
+    scores = np.full(len(items), NEUTRAL)
+    for platform in np.unique(platforms):
+        mask = platforms == platform
+        peak = raw[mask].max()
+        if peak > 0:
+            scores[mask] = raw[mask] / peak
+    return scores
+
+
+def _coverage(items: List) -> np.ndarray:
+    """제목이 비슷한 항목을 보도한 서로 다른 소스 수 (로그 정규화)"""
+    token_sets = [set(tokenize(item.title)) for item in items]
+    vocabulary = {t: i for i, t in enumerate(sorted(set().union(*token_sets)))}
+    if not vocabulary:
+        return np.zeros(len(items))
+
+    matrix = np.zeros((len(items), len(vocabulary)), dtype=np.float32)
+    for row, tokens in enumerate(token_sets):
+        matrix[row, [vocabulary[t] for t in tokens]] = 1.0
+
+    # 모든 제목 쌍의 Jaccard 유사도를 행렬 곱 한 번으로 계산
+    intersection = matrix @ matrix.T
+    sizes = matrix.sum(axis=1)
+    union = sizes[:, None] + sizes[None, :] - intersection
+    similar = np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0) >= COVERAGE_SIMILARITY
+
+    outlets = np.array([getattr(i, 'source', None) or getattr(i, 'platform', '') for i in items])
+    counts = np.array([len(set(outlets[row])) for row in similar])
+    peak = counts.max()
+    return np.log(counts) / np.log(peak) if peak > 1 else np.zeros(len(items))
+
+
+def _relevance(items: List) -> np.ndarray:
+    matcher = get_matcher()
+    raw = np.array([matcher.score(f"{item.title} {getattr(item, 'summary', '') or getattr(item, 'text', '')}")
+                    for item in items])
+    return raw / (raw + 1.0)
+
+
+def importance_scores(items: List, now: Optional[datetime] = None,
+                      authority: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """항목별 중요도 점수 (0.0-1.0)"""
+    if not items:
+        return np.zeros(0)
+    now = now or datetime.now(timezone.utc)
+    authority = load_authority() if authority is None else authority
+
+    components = {
+        'authority': np.array([
+            authority.get(getattr(i, 'source', None) or getattr(i, 'platform', ''), NEUTRAL) for i in items
+        ]),
+        'recency': _recency(items, now),
+        'engagement': _engagement(items),
+        'coverage': _coverage(items),
+        'relevance': _relevance(items)
+    }
+    return sum(WEIGHTS[name] * values for name, values in components.items())
+
+
+def rank_items(items: List, now: Optional[datetime] = None) -> List:
+    """중요도 내림차순 정렬 (점수가 같으면 원래 순서 유지)"""
+    scores = importance_scores(items, now)
+    order = np.argsort(-scores, kind='stable')
+    return [items[i] for i in order]
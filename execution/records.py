@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+수집 데이터 레코드 타입
+기사/소셜 포스트/주가 스냅샷을 슬롯 데이터클래스로 표현하고 JSON 파일과 변환
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Type, TypeVar
+
+# orjson이 있으면 빠른 직렬화 사용, 없으면 표준 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+T = TypeVar('T')
+
+
+class RecordMixin:
+    """dict 변환 공통 기능 (알 수 없는 키는 무시)"""
+
+    __slots__ = ()
+
+    # 파일 키 -> 필드 이름 (파이썬 식별자로 쓸 수 없는 키 대응)
+    KEY_ALIASES: Dict[str, str] = {}
+
+    @classmethod
+    def from_dict(cls: Type[T], data: Dict) -> T:
+        aliases = cls.KEY_ALIASES
+        names = set(cls.__slots__)
+        kwargs = {}
+        for key, value in data.items():
+            name = aliases.get(key, key)
+            if name in names:
+                kwargs[name] = value
+        return cls(**kwargs)
+
+    def to_dict(self) -> Dict:
+        reverse = {v: k for k, v in self.KEY_ALIASES.items()}
+        return {reverse.get(name, name): getattr(self, name) for name in self.__slots__}
+
+
+@dataclass(slots=True)
+class Article(RecordMixin):
+    """뉴스 기사"""
+    title: str
+    source: str
+    url: str
+    published: str = ''
+    summary: str = ''
+    full_text: str = ''
+
+
+@dataclass(slots=True)
+class SocialPost(RecordMixin):
+    """소셜 미디어 포스트"""
+    platform: str
+    title: str
+    url: str
+    score: int = 0
+    comments: int = 0
+    created: str = ''
+    text: str = ''
+
+
+@dataclass(slots=True)
+class StockSnapshot(RecordMixin):
+    """주가 스냅샷"""
+    KEY_ALIASES = {'52_week_high': 'week_52_high', '52_week_low': 'week_52_low'}
+
+    symbol: str
+    current_price: float = 0
+    change: float = 0
+    change_percent: float = 0
+    volume: int = 0
+    market_cap: int = 0
+    week_52_high: float = 0
+    week_52_low: float = 0
+    trend_5day: str = '데이터 없음'
+    last_updated: str = ''
+    error: Optional[str] = None
+
+
+def dumps(data) -> bytes:
+    """JSON 직렬화 (레코드는 dict로 변환, 들여쓰기 2칸, UTF-8)"""
+    if orjson is not None:
+        # 데이터클래스 기본 직렬화 대신 to_dict 사용 (키 별칭 적용)
+        return orjson.dumps(data, default=_default,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATACLASS)
+    return json.dumps(data, default=_default, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def loads(raw: bytes):
+    """JSON 역직렬화"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _default(obj):
+    if isinstance(obj, RecordMixin):
+        return obj.to_dict()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def save_records(path: str, records):
+    """레코드(또는 레코드 리스트)를 JSON 파일로 저장"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(dumps(records))
+
+
+def load_records(path: str, record_type: Type[T]) -> List[T]:
+    """JSON 배열 파일을 레코드 리스트로 로드 (파일이 없으면 빈 리스트)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'rb') as f:
+        return [record_type.from_dict(item) for item in loads(f.read())]
+
+
+def load_record(path: str, record_type: Type[T]) -> Optional[T]:
+    """JSON 객체 파일을 단일 레코드로 로드 (파일이 없으면 None)"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return record_type.from_dict(loads(f.read()))
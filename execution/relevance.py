@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+관련도 필터링 엔진
+키워드/엔티티 사전을 하나의 정규식으로 컴파일하여 항목당 한 번의 스캔으로 가중 점수 계산
+"""
+
+import re
+from typing import Dict, List, Optional
+
+# 기본 키워드 사전 (키워드 -> 가중치)
+# 제품명, 경영진, 공급사 등을 한 사전에 모아 수집기 전체에서 공유
+DEFAULT_KEYWORDS: Dict[str, float] = {
+    # 회사/티커
+    'apple': 1.0,
+    'aapl': 1.5,
+    # 제품
+    'iphone': 1.0,
+    'ipad': 1.0,
+    'mac': 0.8,
+    'macbook': 1.0,
+    'imac': 1.0,
+    'mac mini': 1.0,
+    'mac studio': 1.0,
+    'ios': 0.8,
+    'ipados': 0.8,
+    'macos': 0.8,
+    'watchos': 0.8,
+    'visionos': 0.8,
+    'apple watch': 1.0,
+    'airpods': 1.0,
+    'vision pro': 1.0,
+    'app store': 0.8,
+    'apple intelligence': 1.2,
+    'siri': 0.6,
+    'apple silicon': 1.0,
+    # 경영진
+    'tim cook': 1.2,
+    'jeff williams': 1.0,
+    'craig federighi': 1.0,
+    'kevan parekh': 1.0,
+    'john ternus': 1.0,
+    # 공급사
+    'foxconn': 0.6,
+    'tsmc': 0.6,
+    'pegatron': 0.6,
+    'qualcomm': 0.4,
+    'broadcom': 0.4,
+}
+
+# 수집기에서 사용하는 최소 관련도 점수
+MIN_RELEVANCE = 0.5
+
+
+class KeywordMatcher:
+    """가중치 키워드 사전을 단일 정규식으로 컴파일한 매처"""
+
+    def __init__(self, keywords: Dict[str, float]):
+        self.weights = {k.lower(): float(w) for k, w in keywords.items()}
+
+        # 긴 키워드를 먼저 배치해 'mac mini'가 'mac'보다 우선 매칭되도록 함
+        terms = sorted(self.weights, key=len, reverse=True)
+        alternation = '|'.join(re.escape(t).replace(r'\ ', r'\s+') for t in terms)
+
+        # 단어 경계: 영숫자 사이에 끼인 부분 문자열(예: 'machine'의 'mac')은 제외
+        # 끝의 's?'로 복수형('iPhones', 'MacBooks')까지 허용
+        self.pattern = re.compile(
+            rf'(?<![a-z0-9])({alternation})s?(?![a-z0-9])',
+            re.IGNORECASE
+        )
+
+    def find(self, text: str) -> List[str]:
+        """텍스트에서 매칭된 키워드 목록 (정규화된 형태, 등장 순서)"""
+        if not text:
+            return []
+        return [' '.join(m.group(1).lower().split()) for m in self.pattern.finditer(text)]
+
+    def score(self, text: str) -> float:
+        """매칭된 고유 키워드의 가중치 합"""
+        return sum(self.weights[k] for k in set(self.find(text)))
+
+    def is_relevant(self, text: str, threshold: float = MIN_RELEVANCE) -> bool:
+        """관련도 점수가 임계값 이상인지 여부"""
+        return self.score(text) >= threshold
+
+
+_default_matcher: Optional[KeywordMatcher] = None
+
+
+def get_matcher() -> KeywordMatcher:
+    """기본 사전으로 컴파일된 공유 매처 (최초 호출 시 한 번만 컴파일)"""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = KeywordMatcher(DEFAULT_KEYWORDS)
+    return _default_matcher
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+리포트 아카이브
+매일의 리포트를 SQLite(FTS5)에 누적 저장하고 날짜/티커/감성/토픽/전문 검색 조회 제공
+Directive: directives/report_archive.md
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from contextlib import closing
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from records import Article, SocialPost
+
+DATA_DIR = os.getenv('DATA_DIR', 'data')
+ARCHIVE_DB = os.path.join(DATA_DIR, 'reports.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    overall_sentiment TEXT,
+    sentiment_score REAL,
+    textblob_score REAL,
+    summary TEXT,
+    report_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reports_date ON reports(date);
+CREATE INDEX IF NOT EXISTS idx_reports_sentiment ON reports(overall_sentiment, date);
+
+CREATE TABLE IF NOT EXISTS tickers (
+    report_id INTEGER NOT NULL REFERENCES reports(id),
+    date TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    price REAL,
+    change_percent REAL
+);
+CREATE INDEX IF NOT EXISTS idx_tickers_symbol_date ON tickers(symbol, date);
+
+CREATE TABLE IF NOT EXISTS topics (
+    report_id INTEGER NOT NULL REFERENCES reports(id),
+    date TEXT NOT NULL,
+    topic TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS idx_topics_topic_date ON topics(topic, date);
+
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    report_id INTEGER NOT NULL REFERENCES reports(id),
+    date TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    source TEXT,
+    title TEXT NOT NULL,
+    url TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_items_date ON items(date);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS report_fts USING fts5(
+    report_id UNINDEXED,
+    date UNINDEXED,
+    kind UNINDEXED,
+    body
+);
+"""
+
+
+def connect(db_path: Optional[str] = None) -> sqlite3.Connection:
+    """아카이브 DB 연결 (없으면 스키마 생성)"""
+    db_path = db_path or ARCHIVE_DB
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def archive_report(report: Dict, news: List[Article], social: List[SocialPost], db_path: Optional[str] = None) -> int:
+    """리포트와 원본 항목을 아카이브에 추가 (같은 날짜 재실행도 별도 행으로 보존)"""
+    gemini = report.get('gemini_analysis', {})
+    stock = report.get('stock') or {}
+    date = report['date']
+
+    with closing(connect(db_path)) as conn, conn:
+        cursor = conn.execute(
+            "INSERT INTO reports (date, created_at, overall_sentiment, sentiment_score, textblob_score, summary, report_json) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                date,
+                datetime.now().isoformat(),
+                gemini.get('overall_sentiment'),
+                gemini.get('sentiment_score'),
+                report.get('textblob_sentiment_score'),
+                gemini.get('executive_summary', ''),
+                json.dumps(report, ensure_ascii=False)
+            )
+        )
+        report_id = cursor.lastrowid
+
+        if stock.get('symbol'):
+            conn.execute(
+                "INSERT INTO tickers (report_id, date, symbol, price, change_percent) VALUES (?, ?, ?, ?, ?)",
+                (report_id, date, stock['symbol'], stock.get('current_price'), stock.get('change_percent'))
+            )
+
+        conn.executemany(
+            "INSERT INTO topics (report_id, date, topic) VALUES (?, ?, ?)",
+            [(report_id, date, topic) for topic in gemini.get('top_topics', [])]
+        )
+
+        rows = [(report_id, date, 'news', a.source, a.title, a.url, a.summary) for a in news]
+        rows += [(report_id, date, 'social', p.platform, p.title, p.url, p.text) for p in social]
+        conn.executemany(
+            "INSERT INTO items (report_id, date, kind, source, title, url) VALUES (?, ?, ?, ?, ?, ?)",
+            [row[:6] for row in rows]
+        )
+
+        fts_rows = [(report_id, date, kind, f"{title} {body}") for _, _, kind, _, title, _, body in rows]
+        analysis_text = ' '.join(
+            [gemini.get('executive_summary', ''), gemini.get('detailed_analysis', '')]
+            + gemini.get('key_insights', []) + gemini.get('top_topics', [])
+        )
+        fts_rows.append((report_id, date, 'analysis', analysis_text))
+        conn.executemany("INSERT INTO report_fts (report_id, date, kind, body) VALUES (?, ?, ?, ?)", fts_rows)
+
+    return report_id
+
+
+def _since(days: int) -> str:
+    return (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+
+
+# 날짜별 최신 리포트만 사용 (같은 날 여러 번 실행된 경우)
+LATEST_PER_DATE = "SELECT MAX(id) FROM reports GROUP BY date"
+
+
+def sentiment_trend(days: int = 90, db_path: Optional[str] = None) -> List[Dict]:
+    """최근 N일 감성 점수 추이 (날짜 오름차순)"""
+    with closing(connect(db_path)) as conn, conn:
+        rows = conn.execute(
+            f"SELECT date, overall_sentiment, sentiment_score, textblob_score FROM reports "
+            f"WHERE date >= ? AND id IN ({LATEST_PER_DATE}) ORDER BY date",
+            (_since(days),)
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def days_mentioning(term: str, kind: Optional[str] = None, db_path: Optional[str] = None) -> List[str]:
+    """검색어(구문)가 등장한 날짜 목록 (FTS5)"""
+    phrase = '"' + term.replace('"', '""') + '"'
+    query = "SELECT DISTINCT date FROM report_fts WHERE report_fts MATCH ?"
+    params = [phrase]
+    if kind:
+        query += " AND kind = ?"
+        params.append(kind)
+
+    with closing(connect(db_path)) as conn, conn:
+        rows = conn.execute(query + " ORDER BY date", params).fetchall()
+    return [row['date'] for row in rows]
+
+
+def price_history(symbol: str = 'AAPL', days: int = 365, db_path: Optional[str] = None) -> List[Dict]:
+    """아카이브된 일별 주가 (날짜 오름차순)"""
+    with closing(connect(db_path)) as conn, conn:
+        rows = conn.execute(
+            f"SELECT date, price, change_percent FROM tickers "
+            f"WHERE symbol = ? AND date >= ? AND report_id IN ({LATEST_PER_DATE}) ORDER BY date",
+            (symbol, _since(days))
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def days_with_topic(topic: str, db_path: Optional[str] = None) -> List[str]:
+    """Gemini 주요 토픽으로 등장한 날짜 목록 (대소문자 무시)"""
+    with closing(connect(db_path)) as conn, conn:
+        rows = conn.execute(
+            "SELECT DISTINCT date FROM topics WHERE topic = ? ORDER BY date", (topic,)
+        ).fetchall()
+    return [row['date'] for row in rows]
+
+
+def days_with_sentiment(sentiment: str, days: int = 90, db_path: Optional[str] = None) -> List[str]:
+    """특정 감성(긍정적|중립|부정적)이었던 날짜 목록"""
+    with closing(connect(db_path)) as conn, conn:
+        rows = conn.execute(
+            f"SELECT date FROM reports WHERE overall_sentiment = ? AND date >= ? "
+            f"AND id IN ({LATEST_PER_DATE}) ORDER BY date",
+            (sentiment, _since(days))
+        ).fetchall()
+    return [row['date'] for row in rows]
+
+
+def get_report(date: str, db_path: Optional[str] = None) -> Optional[Dict]:
+    """해당 날짜의 최신 리포트 (없으면 None)"""
+    with closing(connect(db_path)) as conn, conn:
+        row = conn.execute(
+            "SELECT report_json FROM reports WHERE date = ? ORDER BY id DESC LIMIT 1", (date,)
+        ).fetchone()
+    return json.loads(row['report_json']) if row else None
+
+
+def main():
+    """조회 CLI: trend [days] | search <term> | topic <topic> | price [symbol] | report <date>"""
+    if len(sys.argv) < 2:
+        print(main.__doc__)
+        return False
+
+    command, args = sys.argv[1], sys.argv[2:]
+
+    if command == 'trend':
+        result = sentiment_trend(int(args[0]) if args else 90)
+    elif command == 'search' and args:
+        result = days_mentioning(' '.join(args))
+    elif command == 'topic' and args:
+        result = days_with_topic(' '.join(args))
+    elif command == 'price':
+        result = price_history(args[0] if args else 'AAPL')
+    elif command == 'report' and args:
+        result = get_report(args[0])
+    else:
+        print(main.__doc__)
+        return False
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return True
+
+if __name__ == '__main__':
+    success = main()
+    exit(0 if success else 1)
@@ -4,6 +4,7 @@
 Directive: directives/send_telegram_report.md
 """
 
+import html
 import json
 import os
 from datetime import datetime
@@ -19,101 +20,212 @@ try:
 except:
     pass  # GitHub Actions 등에서는 .env 파일이 없을 수 있음
 
-def format_gemini_report(report: dict) -> str:
-    """Gemini 분석 리포트를 텔레그램 HTML 형식으로 변환"""
-    lines = []
-
-    # 헤더
-    lines.append("🍎 <b>AppleScout Agent AI 리포트</b>")
-    lines.append(f"📅 {report['date']}")
-    lines.append("🤖 <i>Powered by Gemini 2.5 Flash</i>")
-    lines.append("")
-
-    # 주가 정보
+# 섹션 제목/문구 (구독자 언어별)
+LABELS = {
+    'ko': {
+        'title': "AppleScout Agent AI 리포트",
+        'stock': "주가 정보",
+        'trend_5day': "5일 트렌드",
+        'sentiment': "AI 감성 분석",
+        'summary': "핵심 요약",
+        'insights': "주요 인사이트",
+        'headlines': "주요 뉴스",
+        'topics': "주요 토픽",
+        'trending': "급상승 키워드",
+        'threads': "이어지는 토픽",
+        'new_topic': "신규",
+        'days_active': "{days}일째",
+        'outlook': "시장 전망",
+        'opportunities': "기회 요인",
+        'risks': "리스크 요인",
+        'detailed': "상세 분석",
+        'correlation': "감성-주가 상관관계",
+        'correlation_line': "AI 감성 vs 수익률: 당일 {lag_0} | 익일 {lag_1} (n={n})",
+        'event_line': "{label} 급변 {count}회 후 3일 평균 수익률: {value}%",
+        'positive': "긍정",
+        'negative': "부정",
+        'sources': "데이터 출처",
+        'counts': "뉴스: {news}개 | 소셜: {social}개",
+        'sentiments': {}
+    },
+    'en': {
+        'title': "AppleScout Agent AI Report",
+        'stock': "Stock",
+        'trend_5day': "5-day trend",
+        'sentiment': "AI Sentiment",
+        'summary': "Summary",
+        'insights': "Key Insights",
+        'headlines': "Top Headlines",
+        'topics': "Top Topics",
+        'trending': "Trending Keywords",
+        'threads': "Topic Threads",
+        'new_topic': "new",
+        'days_active': "day {days}",
+        'outlook': "Market Outlook",
+        'opportunities': "Opportunities",
+        'risks': "Risk Factors",
+        'detailed': "Detailed Analysis",
+        'correlation': "Sentiment vs Price",
+        'correlation_line': "AI sentiment vs returns: same day {lag_0} | next day {lag_1} (n={n})",
+        'event_line': "{count} {label} spikes, avg 3-day return: {value}%",
+        'positive': "positive",
+        'negative': "negative",
+        'sources': "Sources",
+        'counts': "News: {news} | Social: {social}",
+        'sentiments': {"긍정적": "Positive", "중립": "Neutral", "부정적": "Negative"}
+    }
+}
+
+
+def _section_header(report: dict, gemini: dict, labels: dict) -> list:
+    model = gemini.get('model', 'gemini-2.5-flash')
+    return [f"🍎 <b>{labels['title']}</b>", f"📅 {report['date']}", f"🤖 <i>Powered by {model}</i>"]
+
+
+def _section_stock(report: dict, gemini: dict, labels: dict) -> list:
     stock = report.get('stock', {})
-    if stock and stock.get('current_price'):
-        price = stock['current_price']
-        change_pct = stock['change_percent']
-        trend_emoji = "📈" if change_pct > 0 else "📉" if change_pct < 0 else "➡️"
-        sign = "+" if change_pct > 0 else ""
-
-        lines.append("💰 <b>주가 정보</b>")
-        lines.append(f"AAPL: ${price} ({sign}{change_pct}% {trend_emoji})")
-        lines.append(f"5일 트렌드: {stock.get('trend_5day', 'N/A')}")
-        lines.append("")
-
-    # Gemini AI 분석
-    gemini = report.get('gemini_analysis', {})
-
-    # 전체 감성
+    if not stock or not stock.get('current_price'):
+        return []
+    price = stock['current_price']
+    change_pct = stock['change_percent']
+    trend_emoji = "📈" if change_pct > 0 else "📉" if change_pct < 0 else "➡️"
+    sign = "+" if change_pct > 0 else ""
+    return [
+        f"💰 <b>{labels['stock']}</b>",
+        f"AAPL: ${price} ({sign}{change_pct}% {trend_emoji})",
+        f"{labels['trend_5day']}: {stock.get('trend_5day', 'N/A')}"
+    ]
+
+
+def _section_sentiment(report: dict, gemini: dict, labels: dict) -> list:
     sentiment = gemini.get('overall_sentiment', '중립')
     sentiment_score = gemini.get('sentiment_score', 0.5)
     sentiment_emoji = "😊" if sentiment == "긍정적" else "😐" if sentiment == "중립" else "😟"
+    sentiment = labels['sentiments'].get(sentiment, sentiment)
+    return [f"{sentiment_emoji} <b>{labels['sentiment']}</b>", f"{sentiment} ({sentiment_score}/1.0)"]
+
 
-    lines.append(f"{sentiment_emoji} <b>AI 감성 분석</b>")
-    lines.append(f"{sentiment} ({sentiment_score}/1.0)")
-    lines.append("")
+def _text_section(emoji: str, key: str, field: str):
+    def render(report: dict, gemini: dict, labels: dict) -> list:
+        text = gemini.get(field, '')
+        return [f"{emoji} <b>{labels[key]}</b>", text] if text else []
+    return render
 
-    # 핵심 요약
-    exec_summary = gemini.get('executive_summary', '')
-    if exec_summary:
-        lines.append("📊 <b>핵심 요약</b>")
-        lines.append(exec_summary)
-        lines.append("")
 
-    # 주요 인사이트
+def _bullet_section(emoji: str, key: str, field: str, limit: int = 3):
+    def render(report: dict, gemini: dict, labels: dict) -> list:
+        items = gemini.get(field, [])
+        return [f"{emoji} <b>{labels[key]}</b>"] + [f"• {item}" for item in items[:limit]] if items else []
+    return render
+
+
+def _section_insights(report: dict, gemini: dict, labels: dict) -> list:
     insights = gemini.get('key_insights', [])
-    if insights:
-        lines.append("💡 <b>주요 인사이트</b>")
-        for i, insight in enumerate(insights[:5], 1):
-            lines.append(f"{i}. {insight}")
-        lines.append("")
+    if not insights:
+        return []
+    return [f"💡 <b>{labels['insights']}</b>"] + [f"{i}. {insight}" for i, insight in enumerate(insights[:5], 1)]
+
+
+def _section_headlines(report: dict, gemini: dict, labels: dict) -> list:
+    # 구독자 언어로 번역된 제목 (digests에서 localize_report 적용)
+    news = report.get('top_news', [])
+    if not news:
+        return []
+    lines = [f"📰 <b>{labels['headlines']}</b>"]
+    for item in news[:5]:
+        title = html.escape(item.get('title', ''))
+        url = item.get('url')
+        lines.append(f"• <a href=\"{html.escape(url, quote=True)}\">{title}</a>" if url else f"• {title}")
+    return lines
 
-    # 주요 토픽
+
+def _section_topics(report: dict, gemini: dict, labels: dict) -> list:
     topics = gemini.get('top_topics', [])
-    if topics:
-        topics_str = ' '.join([f"#{t.replace(' ', '_')}" for t in topics[:8]])
-        lines.append("🔑 <b>주요 토픽</b>")
-        lines.append(topics_str)
-        lines.append("")
-
-    # 시장 전망
-    outlook = gemini.get('market_outlook', '')
-    if outlook:
-        lines.append("🔮 <b>시장 전망</b>")
-        lines.append(outlook)
-        lines.append("")
-
-    # 기회 요인
-    opportunities = gemini.get('opportunities', [])
-    if opportunities:
-        lines.append("✅ <b>기회 요인</b>")
-        for opp in opportunities[:3]:
-            lines.append(f"• {opp}")
-        lines.append("")
-
-    # 리스크 요인
-    risks = gemini.get('risk_factors', [])
-    if risks:
-        lines.append("⚠️ <b>리스크 요인</b>")
-        for risk in risks[:3]:
-            lines.append(f"• {risk}")
-        lines.append("")
-
-    # 상세 분석
-    detailed = gemini.get('detailed_analysis', '')
-    if detailed:
-        lines.append("📝 <b>상세 분석</b>")
-        lines.append(detailed)
-        lines.append("")
-
-    # 데이터 출처
-    news_count = report.get('news_count', 0)
-    social_count = report.get('social_count', 0)
-    lines.append("📈 <b>데이터 출처</b>")
-    lines.append(f"뉴스: {news_count}개 | 소셜: {social_count}개")
-
-    return '\n'.join(lines)
+    if not topics:
+        return []
+    return [f"🔑 <b>{labels['topics']}</b>", ' '.join([f"#{t.replace(' ', '_')}" for t in topics[:8]])]
+
+
+def _section_trending(report: dict, gemini: dict, labels: dict) -> list:
+    trending = report.get('trending_keywords', [])
+    return [f"🔥 <b>{labels['trending']}</b>", ', '.join(trending[:8])] if trending else []
+
+
+def _section_threads(report: dict, gemini: dict, labels: dict) -> list:
+    # 이전 날짜와 연결된 토픽 그룹 (기사 수 순)
+    threads = report.get('topic_threads', [])
+    if not threads:
+        return []
+    lines = [f"🧵 <b>{labels['threads']}</b>"]
+    for topic in threads[:5]:
+        status = labels['new_topic'] if topic['new'] else labels['days_active'].format(days=topic['days_active'])
+        lines.append(f"• {html.escape(topic['label'])} ({topic['size']}, {status})")
+    return lines
+
+
+def _section_correlation(report: dict, gemini: dict, labels: dict) -> list:
+    # 아카이브 이력이 충분할 때만
+    correlation = report.get('sentiment_correlation')
+    if not correlation:
+        return []
+    lags = correlation['lag_correlation'].get('sentiment_score', {})
+    events = correlation['event_study'].get('sentiment_score', {})
+    lines = [
+        f"📐 <b>{labels['correlation']}</b>",
+        labels['correlation_line'].format(lag_0=lags.get('lag_0'), lag_1=lags.get('lag_1'), n=correlation['observations'])
+    ]
+    for name in ('positive', 'negative'):
+        stats = events.get(name, {})
+        if stats.get('count'):
+            lines.append(labels['event_line'].format(label=labels[name], count=stats['count'],
+                                                     value=stats.get('avg_return_3d')))
+    return lines
+
+
+def _section_sources(report: dict, gemini: dict, labels: dict) -> list:
+    return [
+        f"📈 <b>{labels['sources']}</b>",
+        labels['counts'].format(news=report.get('news_count', 0), social=report.get('social_count', 0))
+    ]
+
+
+# 섹션 이름 -> 렌더러 (이 순서대로 출력)
+SECTIONS = {
+    'header': _section_header,
+    'stock': _section_stock,
+    'sentiment': _section_sentiment,
+    'summary': _text_section("📊", 'summary', 'executive_summary'),
+    'insights': _section_insights,
+    'headlines': _section_headlines,
+    'topics': _section_topics,
+    'trending': _section_trending,
+    'threads': _section_threads,
+    'outlook': _text_section("🔮", 'outlook', 'market_outlook'),
+    'opportunities': _bullet_section("✅", 'opportunities', 'opportunities'),
+    'risks': _bullet_section("⚠️", 'risks', 'risk_factors'),
+    'detailed': _text_section("📝", 'detailed', 'detailed_analysis'),
+    'correlation': _section_correlation,
+    'sources': _section_sources
+}
+
+
+def format_gemini_report(report: dict, sections: list = None, language: str = 'ko') -> str:
+    """Gemini 분석 리포트를 텔레그램 HTML 형식으로 변환
+
+    sections를 지정하면 해당 섹션만 (순서는 SECTIONS 기준), language는 섹션 제목 언어
+    """
+    gemini = report.get('gemini_analysis', {})
+    labels = LABELS.get(language, LABELS['ko'])
+    selected = set(sections) if sections else set(SECTIONS)
+
+    blocks = []
+    for name, render in SECTIONS.items():
+        if name in selected:
+            lines = render(report, gemini, labels)
+            if lines:
+                blocks.append('\n'.join(lines))
+
+    return '\n\n'.join(blocks)
 
 async def send_telegram_message(bot_token: str, chat_id: str, message: str, max_retries: int = 3):
     """텔레그램 메시지 전송 (비동기)"""
@@ -162,19 +274,50 @@ async def send_telegram_message(bot_token: str, chat_id: str, message: str, max_
                 else:
                     raise
 
+async def send_charts(bot_token: str, chat_id: str, charts: list, file_ids, max_retries: int = 3):
+    """차트 전송 (업로드한 적 있는 차트는 file_id로 보내 이미지 재업로드 생략)"""
+    bot = Bot(token=bot_token)
+
+    for key, path in charts:
+        for attempt in range(max_retries):
+            file_id = file_ids.get(key)
+            try:
+                if file_id:
+                    await bot.send_photo(chat_id=chat_id, photo=file_id)
+                else:
+                    with open(path, 'rb') as photo:
+                        message = await bot.send_photo(chat_id=chat_id, photo=photo)
+                    file_ids.put(key, message.photo[-1].file_id)
+                print(f"✓ Chart {os.path.basename(path)} sent ({'file_id' if file_id else 'uploaded'})")
+                break
+            except TelegramError as e:
+                print(f"✗ Attempt {attempt+1}/{max_retries} failed: {e}")
+                # 만료/무효 file_id는 버리고 다음 시도에서 다시 업로드
+                if file_id:
+                    file_ids.forget(key)
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(2 ** attempt)
+                else:
+                    raise
+
 def main():
     """메인 실행 함수"""
     print("📱 Starting Telegram message send (Gemini version)...")
 
     # 환경 변수 확인
     bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
-    chat_id = os.getenv('TELEGRAM_CHAT_ID')
-
-    if not bot_token or not chat_id:
-        print("❌ Missing TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID environment variables")
+    if not bot_token:
+        print("❌ Missing TELEGRAM_BOT_TOKEN environment variable")
         print("   Please check GitHub Secrets or .env file")
         return False
 
+    from digests import load_subscribers, render_digests
+
+    subscribers = load_subscribers()
+    if not subscribers:
+        print("❌ No subscribers (set TELEGRAM_CHAT_ID or config/subscribers.json)")
+        return False
+
     # Gemini 리포트 로드
     report_file = '.tmp/gemini_report.json'
     if not os.path.exists(report_file):
@@ -190,18 +333,47 @@ def main():
     with open(report_file, 'r', encoding='utf-8') as f:
         report = json.load(f)
 
-    # 메시지 포맷팅
-    message = format_gemini_report(report)
-
-    # 메시지 전송
-    try:
-        asyncio.run(send_telegram_message(bot_token, chat_id, message))
-        print("✅ Telegram message sent successfully")
-        return True
-    except Exception as e:
-        print(f"❌ Failed to send Telegram message: {e}")
+    # 구독자별 메시지 포맷팅 (분석은 공유, 렌더링만 구독자별)
+    messages = render_digests(report, subscribers)
+
+    # 차트를 원하는 구독자가 있으면 리포트당 한 번만 렌더링 (데이터 해시로 캐시)
+    chart_chats = {str(s['chat_id']) for s in subscribers if s.get('charts')}
+    charts, file_ids = [], None
+    if chart_chats:
+        from charts import FileIdCache, build_charts, charts_available
+        if charts_available():
+            charts = build_charts(report)
+            file_ids = FileIdCache()
+        else:
+            print("⚠️  matplotlib not installed, sending digests without charts")
+
+    # 메시지 전송 (한 구독자 실패가 다른 구독자 전송을 막지 않음)
+    async def send_all():
+        failed = 0
+        for chat_id, message in messages.items():
+            try:
+                await send_telegram_message(bot_token, chat_id, message)
+            except Exception as e:
+                failed += 1
+                print(f"❌ Failed to send Telegram message to {chat_id}: {e}")
+                continue
+
+            # 차트 전송 실패는 메시지 전송 실패로 세지 않음
+            if charts and chat_id in chart_chats:
+                try:
+                    await send_charts(bot_token, chat_id, charts, file_ids)
+                except Exception as e:
+                    print(f"⚠️  Failed to send charts to {chat_id}: {e}")
+        return failed
+
+    failed = asyncio.run(send_all())
+    if failed == len(messages):
         return False
 
+    print(f"✅ Telegram message sent to {len(messages) - failed}/{len(messages)} subscribers")
+    # 일부 구독자 실패는 실패로 종료하여 체크포인트를 남기지 않음 (다음 실행에서 재전송)
+    return failed == 0
+
 if __name__ == '__main__':
     success = main()
     exit(0 if success else 1)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+감성-주가 상관관계 분석
+아카이브된 일별 감성 점수와 캐시된 일별 종가를 결합하여 시차 상관관계와 이벤트 스터디 계산
+"""
+
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from fetch_stock_data import load_price_history
+from report_archive import sentiment_trend
+
+LOOKBACK_DAYS = 3 * 365     # 분석 기간 (일)
+MIN_OBSERVATIONS = 10       # 결과를 내기 위한 최소 공통 관측일 수
+MAX_LAG = 3                 # 감성 이후 n거래일 수익률까지 확인
+ROLLING_WINDOW = 30         # 롤링 상관관계 창 (관측일)
+SPIKE_Z = 2.0               # 감성 급변 이벤트 기준 (z-score)
+EVENT_HORIZONS = [1, 3, 5]  # 이벤트 이후 누적 수익률 기간 (거래일)
+
+SENTIMENT_COLUMNS = ['sentiment_score', 'textblob_score']
+
+
+def build_frame(sentiment: List[Dict], closes: Dict[str, float]) -> pd.DataFrame:
+    """거래일 기준으로 감성 점수와 수익률을 정렬한 DataFrame
+
+    휴장일 리포트는 다음 거래일에 반영되도록 직전 값으로 채움
+    """
+    prices = pd.Series(closes, dtype='float64')
+    prices.index = pd.to_datetime(prices.index)
+    prices = prices.sort_index()
+
+    scores = pd.DataFrame(sentiment)
+    scores['date'] = pd.to_datetime(scores['date'])
+    scores = scores.set_index('date')[SENTIMENT_COLUMNS].astype('float64').sort_index()
+
+    frame = scores.reindex(scores.index.union(prices.index)).ffill(limit=3).reindex(prices.index)
+    frame['close'] = prices
+    frame['return'] = prices.pct_change()
+
+    # t일 감성 이후 h거래일 누적 수익률 (t일 종가 기준)
+    for h in EVENT_HORIZONS:
+        frame[f'forward_{h}d'] = prices.shift(-h) / prices - 1
+
+    return frame
+
+
+def lag_correlations(frame: pd.DataFrame, column: str) -> Dict[str, Optional[float]]:
+    """감성(t)과 수익률(t+lag)의 상관계수 (lag 0 = 당일)"""
+    result = {}
+    for lag in range(MAX_LAG + 1):
+        value = frame[column].corr(frame['return'].shift(-lag))
+        result[f'lag_{lag}'] = None if pd.isna(value) else round(float(value), 3)
+    return result
+
+
+def rolling_correlation(frame: pd.DataFrame, column: str) -> Optional[float]:
+    """최근 ROLLING_WINDOW 관측일의 당일 상관계수"""
+    paired = frame[[column, 'return']].dropna()
+    if len(paired) < ROLLING_WINDOW:
+        return None
+    value = paired[column].rolling(ROLLING_WINDOW).corr(paired['return']).iloc[-1]
+    return None if pd.isna(value) else round(float(value), 3)
+
+
+def event_study(frame: pd.DataFrame, column: str) -> Dict[str, Dict]:
+    """감성 급변일(롤링 z-score 기준) 이후 평균 누적 수익률"""
+    series = frame[column]
+    mean = series.rolling(ROLLING_WINDOW, min_periods=MIN_OBSERVATIONS).mean().shift(1)
+    std = series.rolling(ROLLING_WINDOW, min_periods=MIN_OBSERVATIONS).std().shift(1)
+    z = (series - mean) / std
+
+    result = {}
+    for name, mask in (('positive', z >= SPIKE_Z), ('negative', z <= -SPIKE_Z)):
+        events = frame[mask]
+        stats = {'count': int(len(events))}
+        for h in EVENT_HORIZONS:
+            value = events[f'forward_{h}d'].mean()
+            stats[f'avg_return_{h}d'] = None if pd.isna(value) else round(float(value) * 100, 2)
+        result[name] = stats
+    return result
+
+
+def analyze_correlation(symbol: str = 'AAPL', days: int = LOOKBACK_DAYS,
+                        sentiment: Optional[List[Dict]] = None) -> Optional[Dict]:
+    """심볼 하나에 대한 감성-주가 분석 결과 (데이터 부족 시 None)"""
+    if sentiment is None:
+        sentiment = sentiment_trend(days)
+    closes = load_price_history(symbol)
+    if len(sentiment) < MIN_OBSERVATIONS or not closes:
+        return None
+
+    frame = build_frame(sentiment, closes)
+    observations = int(frame[SENTIMENT_COLUMNS[0]].notna().sum())
+    if observations < MIN_OBSERVATIONS:
+        return None
+
+    return {
+        'symbol': symbol,
+        'observations': observations,
+        'lag_correlation': {c: lag_correlations(frame, c) for c in SENTIMENT_COLUMNS},
+        'rolling_correlation': {c: rolling_correlation(frame, c) for c in SENTIMENT_COLUMNS},
+        'event_study': {c: event_study(frame, c) for c in SENTIMENT_COLUMNS}
+    }
+
+
+def analyze_symbols(symbols: List[str], days: int = LOOKBACK_DAYS) -> Dict[str, Dict]:
+    """여러 심볼 분석 (감성 시계열은 공유)"""
+    sentiment = sentiment_trend(days)
+    results = {}
+    for symbol in symbols:
+        result = analyze_correlation(symbol, days, sentiment)
+        if result:
+            results[symbol] = result
+    return results
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+서비스 모드 스크립트
+일일 리포트와 별도로 상주하며 소스를 적응형 간격으로 폴링
+Directive: directives/run_service.md
+"""
+
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from dotenv import load_dotenv
+
+# 파서 등록을 위해 수집 스크립트 임포트
+import scrape_news  # noqa: F401
+import fetch_social_media  # noqa: F401
+from adaptive_poller import AdaptivePoller
+from breaking_alerts import check_price_move, handle_polled_items
+from fetch_social_media import commit_reddit_cursor
+from quote_poller import QuotePoller
+from sources import iter_sources, load_config, load_sources
+
+# 환경 변수 로드 (.env 파일이 있으면 로드, 없으면 시스템 환경 변수 사용)
+try:
+    load_dotenv()
+except:
+    pass
+
+MAX_SLEEP = 5  # 루프 최대 대기 시간 (초)
+
+# 폴링 핸들러 (source 설정, 신규 항목 리스트, 이번 폴링의 전체 항목 리스트)
+POLL_HANDLERS: List[Callable[[Dict, List, List], None]] = []
+
+
+def log_new_items(source: Dict, new_items: List, items: List):
+    """신규 항목 로그 출력"""
+    for item in new_items[:5]:
+        print(f"  🆕 [{source['name']}] {item.title[:80]}")
+
+
+POLL_HANDLERS.append(log_new_items)
+POLL_HANDLERS.append(handle_polled_items)
+POLL_HANDLERS.append(commit_reddit_cursor)  # 처리 후에 커서 진행 (마지막에 실행)
+
+
+def poll_once(poller: AdaptivePoller, budget: Dict) -> int:
+    """폴링 시점이 된 소스만 수집하고 신규 항목 수 반환"""
+    due = poller.due()
+    if not due:
+        return 0
+
+    total_new = 0
+
+    # 끝난 소스부터 바로 처리 (느린 소스가 속보 알림을 늦추지 않도록)
+    for source, items in iter_sources(due, budget):
+        if items is None:
+            poller.record_failure(source['name'])
+            continue
+
+        new_items = poller.record(source['name'], items)
+        total_new += len(new_items)
+
+        if new_items:
+            interval = poller.state[source['name']]['interval']
+            print(f"📬 {source['name']}: {len(new_items)} new (next poll in {interval:.0f}s)")
+
+        for handler in POLL_HANDLERS:
+            try:
+                handler(source, new_items, items)
+            except Exception as e:
+                print(f"✗ Handler {handler.__name__} error: {e}")
+
+    poller.save()
+    return total_new
+
+
+def check_quotes(quotes: QuotePoller):
+    """관심 종목 최신가 조회 후 전일 종가 대비 급변 알림
+
+    알림 키는 거래 세션 날짜 기준 (한국 시간 자정을 넘는 미국 장중에 같은 변동을 다시 알리지 않음)
+    """
+    for symbol, state in quotes.poll().items():
+        if state.change_since_close is not None and state.session_day:
+            check_price_move(symbol, state.change_since_close, state.session_day)
+
+
+def main():
+    """메인 서비스 루프"""
+    config = load_config()
+    # 커서를 쓰는 파서(reddit_json)는 일일 수집과 섞이지 않도록 서비스 전용 커서 사용
+    sources = [{**source, 'cursor': 'service'} for source in load_sources(config=config)]
+    poller = AdaptivePoller(sources)
+
+    print("🛰️  AppleScout Agent service mode started")
+    print(f"⏰ Current time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"📡 Polling {len(sources)} sources adaptively")
+    print("\nPress Ctrl+C to stop the service\n")
+
+    quotes = QuotePoller()
+
+    try:
+        while True:
+            poll_once(poller, config['budget'])
+
+            if quotes.due():
+                try:
+                    check_quotes(quotes)
+                except Exception as e:
+                    print(f"✗ Quote poll error: {e}")
+
+            time.sleep(min(MAX_SLEEP, max(1.0, poller.seconds_until_next())))
+    except KeyboardInterrupt:
+        poller.save()
+        print("\n\n👋 Service stopped by user")
+        sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
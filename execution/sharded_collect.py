@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+샤딩 수집
+feedparser 파싱이 CPU를 쓰므로 소스를 여러 프로세스(COLLECT_PROCESSES) 또는
+SQLite 작업 큐를 공유하는 여러 워커(COLLECT_QUEUE)에 나눠 수집하고 중앙에서 병합/중복 제거
+
+워커 실행: python execution/sharded_collect.py --worker --queue .tmp/collect_queue.db
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from records import Article, SocialPost
+from sources import DEFAULT_BUDGET, fetch_sources
+
+RECORD_TYPES = {'Article': Article, 'SocialPost': SocialPost}
+
+LEASE_SECONDS = 120     # 작업을 가져간 워커가 응답 없을 때 다시 배정하기까지의 시간
+IDLE_POLL_SECONDS = 1   # 큐가 비었을 때 워커 대기 간격
+WORKER_IDLE_EXIT = 60   # 이 시간 동안 작업이 없으면 워커 종료 (0이면 계속 대기)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    source_json TEXT NOT NULL,
+    budget_json TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    claimed_at REAL,
+    result_json TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, run_id);
+"""
+
+
+def register_parsers():
+    """프로세스 풀/워커에서 파서 등록 (spawn 방식이면 부모의 등록이 상속되지 않음)"""
+    import scrape_news          # noqa: F401
+    import fetch_social_media   # noqa: F401
+
+
+def merge_results(sources: List[Dict], results: Dict[str, List]) -> List:
+    """설정 순서대로 합치고 URL(없으면 제목) 기준 중복 제거"""
+    seen = set()
+    merged = []
+    for source in sources:
+        for item in results.get(source['name'], []):
+            key = item.url or item.title
+            if key not in seen:
+                seen.add(key)
+                merged.append(item)
+    return merged
+
+
+def shard_sources(sources: List[Dict], shards: int) -> List[List[Dict]]:
+    """같은 호스트는 같은 샤드에 두고 (호스트별 동시 요청 제한 유지) 항목 수 기준으로 균형 배분"""
+    by_host: Dict[str, List[Dict]] = {}
+    for source in sources:
+        by_host.setdefault(urlparse(source['url']).netloc, []).append(source)
+
+    groups = sorted(by_host.values(), key=lambda g: sum(s.get('limit', 10) for s in g), reverse=True)
+    buckets: List[List[Dict]] = [[] for _ in range(max(1, min(shards, len(groups))))]
+    loads = [0] * len(buckets)
+    for group in groups:
+        i = loads.index(min(loads))
+        buckets[i].extend(group)
+        loads[i] += sum(s.get('limit', 10) for s in group)
+    return [b for b in buckets if b]
+
+
+def _fetch_shard(shard: List[Dict], budget: Dict) -> Dict[str, List]:
+    return fetch_sources(shard, budget)
+
+
+def collect_with_processes(sources: List[Dict], budget: Optional[Dict] = None,
+                           processes: Optional[int] = None) -> List:
+    """소스를 프로세스 풀에 샤딩하여 수집 (각 프로세스는 내부에서 스레드로 I/O 처리)"""
+    budget = {**DEFAULT_BUDGET, **(budget or {})}
+    shards = shard_sources(sources, processes or os.cpu_count() or 1)
+
+    results: Dict[str, List] = {}
+    with ProcessPoolExecutor(max_workers=len(shards), initializer=register_parsers) as executor:
+        for shard_results in executor.map(_fetch_shard, shards, [budget] * len(shards)):
+            results.update(shard_results)
+    return merge_results(sources, results)
+
+
+# ---------------------------------------------------------------------------
+# SQLite 작업 큐 (여러 워커/노드가 같은 파일을 공유)
+# ---------------------------------------------------------------------------
+
+def connect(queue_path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(queue_path) or '.', exist_ok=True)
+    conn = sqlite3.connect(queue_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def enqueue(queue_path: str, sources: List[Dict], budget: Dict) -> str:
+    """소스마다 작업 하나씩 등록하고 실행 ID 반환"""
+    run_id = uuid.uuid4().hex
+    with closing(connect(queue_path)) as conn:
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT INTO jobs (run_id, source_json, budget_json) VALUES (?, ?, ?)",
+            [(run_id, json.dumps(s), json.dumps(budget)) for s in sources]
+        )
+        conn.execute("COMMIT")
+    return run_id
+
+
+def claim_jobs(conn: sqlite3.Connection, worker: str, limit: int,
+               run_id: Optional[str] = None) -> List[sqlite3.Row]:
+    """대기 중이거나 임대가 만료된 작업을 최대 limit개 원자적으로 가져옴"""
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        rows = conn.execute(
+            """SELECT * FROM jobs
+               WHERE (status = 'pending' OR (status = 'claimed' AND claimed_at < ?))
+                 AND (? IS NULL OR run_id = ?)
+               ORDER BY id LIMIT ?""",
+            (now - LEASE_SECONDS, run_id, run_id, limit)
+        ).fetchall()
+        conn.executemany("UPDATE jobs SET status = 'claimed', worker = ?, claimed_at = ? WHERE id = ?",
+                         [(worker, now, row['id']) for row in rows])
+        conn.execute("COMMIT")
+        return rows
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def run_jobs(conn: sqlite3.Connection, jobs: List[sqlite3.Row]):
+    """가져온 작업을 실행(run)별로 한 번에 동시 수집하고 작업별 결과(레코드 dict)를 큐에 기록
+
+    run_id 없이 가져온 작업은 여러 실행이 섞일 수 있으므로 실행마다 그 실행의 예산으로 수집
+    (같은 소스 이름이 여러 실행에 있어도 결과가 섞이지 않음)
+    """
+    runs: Dict[str, List[sqlite3.Row]] = {}
+    for job in jobs:
+        runs.setdefault(job['run_id'], []).append(job)
+
+    for group in runs.values():
+        sources = [json.loads(job['source_json']) for job in group]
+        results = fetch_sources(sources, json.loads(group[0]['budget_json']))
+
+        for job, source in zip(group, sources):
+            if source['name'] not in results:
+                conn.execute("UPDATE jobs SET status = 'failed', error = ? WHERE id = ?",
+                             ("fetch failed or timed out", job['id']))
+                continue
+
+            items = results[source['name']]
+            payload = {
+                'type': type(items[0]).__name__ if items else 'Article',
+                'items': [item.to_dict() for item in items]
+            }
+            conn.execute("UPDATE jobs SET status = 'done', result_json = ? WHERE id = ?",
+                         (json.dumps(payload, ensure_ascii=False), job['id']))
+
+
+def work(queue_path: str, idle_exit: float = WORKER_IDLE_EXIT) -> int:
+    """큐 작업 처리 (idle_exit초 동안 작업이 없으면 종료), 처리한 작업 수 반환"""
+    register_parsers()
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    processed = 0
+    idle_since = time.time()
+
+    with closing(connect(queue_path)) as conn:
+        while True:
+            jobs = claim_jobs(conn, worker, DEFAULT_BUDGET['max_workers'])
+            if not jobs:
+                if idle_exit and time.time() - idle_since >= idle_exit:
+                    return processed
+                time.sleep(IDLE_POLL_SECONDS)
+                continue
+
+            run_jobs(conn, jobs)
+            processed += len(jobs)
+            idle_since = time.time()
+
+
+def gather(queue_path: str, run_id: str, sources: List[Dict], budget: Dict) -> List:
+    """코디네이터도 워커로 참여하며 모든 작업이 끝나거나 제한 시간이 지나면 결과를 병합
+
+    외부 워커가 없거나 도중에 죽어도 (임대 만료 후) 코디네이터가 남은 작업을 처리
+    """
+    register_parsers()
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    deadline = time.time() + budget['total_timeout']
+    with closing(connect(queue_path)) as conn:
+        while time.time() < deadline:
+            jobs = claim_jobs(conn, worker, budget['max_workers'], run_id)
+            if jobs:
+                run_jobs(conn, jobs)
+                continue
+
+            pending = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE run_id = ? AND status IN ('pending', 'claimed')", (run_id,)
+            ).fetchone()[0]
+            if not pending:
+                break
+            time.sleep(IDLE_POLL_SECONDS)
+
+        results = {}
+        for row in conn.execute("SELECT source_json, result_json FROM jobs WHERE run_id = ? AND status = 'done'",
+                                (run_id,)):
+            payload = json.loads(row['result_json'])
+            record_type = RECORD_TYPES[payload['type']]
+            results[json.loads(row['source_json'])['name']] = [record_type.from_dict(d) for d in payload['items']]
+
+        # 결과를 모은 실행은 큐에서 제거
+        conn.execute("DELETE FROM jobs WHERE run_id = ?", (run_id,))
+
+    return merge_results(sources, results)
+
+
+def collect_with_queue(sources: List[Dict], budget: Optional[Dict] = None,
+                       queue_path: str = '.tmp/collect_queue.db') -> List:
+    """작업 큐에 등록하고 결과 병합 (외부 워커가 없어도 완료됨)"""
+    budget = {**DEFAULT_BUDGET, **(budget or {})}
+    run_id = enqueue(queue_path, sources, budget)
+    return gather(queue_path, run_id, sources, budget)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sharded source collection worker')
+    parser.add_argument('--worker', action='store_true', help='process jobs from the shared queue')
+    parser.add_argument('--queue', default=os.getenv('COLLECT_QUEUE', '.tmp/collect_queue.db'))
+    parser.add_argument('--idle-exit', type=float, default=WORKER_IDLE_EXIT,
+                        help='exit after this many idle seconds (0 = run forever)')
+    args = parser.parse_args()
+
+    if not args.worker:
+        parser.print_help()
+        return False
+
+    print(f"👷 Collection worker started on {args.queue}")
+    processed = work(args.queue, idle_exit=args.idle_exit)
+    print(f"✅ Worker processed {processed} jobs")
+    return True
+
+if __name__ == '__main__':
+    success = main()
+    exit(0 if success else 1)
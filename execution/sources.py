@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+소스 플러그인 레지스트리
+config/sources.json에 선언된 피드를 등록된 파서로 동시에 수집
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import feedparser
+import requests
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'config', 'sources.json')
+
+DEFAULT_BUDGET = {
+    'max_workers': 8,           # 동시에 실행할 소스 수
+    'per_host_concurrency': 2,  # 같은 호스트에 대한 동시 요청 수
+    'total_timeout': 90,        # 전체 수집 제한 시간 (초)
+    'request_timeout': 15       # 개별 HTTP 요청 제한 시간 (초)
+}
+
+USER_AGENT = 'Mozilla/5.0 (compatible; AppleScoutAgent/1.0)'
+
+# 파서 이름 -> 파서 함수 (source 설정, request_timeout) -> Article/SocialPost 리스트
+PARSERS: Dict[str, Callable[[Dict, float], List]] = {}
+
+
+def register_parser(name: str):
+    """파서 등록 데코레이터"""
+    def decorator(func):
+        PARSERS[name] = func
+        return func
+    return decorator
+
+
+def load_config(path: Optional[str] = None) -> Dict:
+    """소스 설정 파일 로드 (SOURCES_CONFIG 환경 변수로 경로 변경 가능)"""
+    path = path or os.getenv('SOURCES_CONFIG', DEFAULT_CONFIG)
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    config['budget'] = {**DEFAULT_BUDGET, **config.get('budget', {})}
+    return config
+
+
+def load_sources(kind: Optional[str] = None, config: Optional[Dict] = None) -> List[Dict]:
+    """활성화된 소스 목록 (우선순위 오름차순)"""
+    config = config or load_config()
+    sources = [
+        s for s in config['sources']
+        if s.get('enabled', True) and (kind is None or s['kind'] == kind)
+    ]
+    return sorted(sources, key=lambda s: s.get('priority', 99))
+
+
+# URL -> (ETag, Last-Modified, 파싱된 피드): 서비스 모드에서 변경 없는 피드의 재다운로드/재파싱 방지
+_feed_cache: Dict[str, tuple] = {}
+_feed_cache_lock = threading.Lock()
+
+
+def fetch_feed(url: str, timeout: float):
+    """타임아웃이 적용된 RSS/Atom 피드 다운로드 및 파싱 (조건부 GET)"""
+    headers = {'User-Agent': USER_AGENT}
+    with _feed_cache_lock:
+        cached = _feed_cache.get(url)
+    if cached:
+        etag, modified, _ = cached
+        if etag:
+            headers['If-None-Match'] = etag
+        if modified:
+            headers['If-Modified-Since'] = modified
+
+    response = requests.get(url, timeout=timeout, headers=headers)
+    if response.status_code == 304 and cached:
+        return cached[2]
+    response.raise_for_status()
+
+    feed = feedparser.parse(response.content)
+    etag = response.headers.get('ETag')
+    modified = response.headers.get('Last-Modified')
+    if etag or modified:
+        with _feed_cache_lock:
+            _feed_cache[url] = (etag, modified, feed)
+    return feed
+
+
+def iter_sources(sources: List[Dict], budget: Optional[Dict] = None) -> Iterator[Tuple[Dict, Optional[List]]]:
+    """소스를 동시에 수집하여 끝나는 순서대로 (source, 항목 리스트) 반환
+
+    실패하거나 전체 제한 시간을 넘긴 소스는 항목 대신 None (진행 중인 요청은 백그라운드에서 종료)
+    """
+    budget = {**DEFAULT_BUDGET, **(budget or {})}
+    host_limits: Dict[str, threading.Semaphore] = {}
+    host_lock = threading.Lock()
+
+    def host_semaphore(url: str) -> threading.Semaphore:
+        host = urlparse(url).netloc
+        with host_lock:
+            if host not in host_limits:
+                host_limits[host] = threading.Semaphore(budget['per_host_concurrency'])
+            return host_limits[host]
+
+    def run_one(source: Dict) -> List:
+        parser = PARSERS.get(source['parser'])
+        if parser is None:
+            raise ValueError(f"Unknown parser: {source['parser']}")
+
+        timeout = source.get('timeout', budget['request_timeout'])
+        with host_semaphore(source['url']):
+            items = parser(source, timeout)
+        return items[:source['limit']] if source.get('limit') else items
+
+    executor = ThreadPoolExecutor(max_workers=budget['max_workers'])
+    futures = {executor.submit(run_one, source): source for source in sources}
+    finished = set()
+    try:
+        for future in as_completed(futures, timeout=budget['total_timeout']):
+            finished.add(future)
+            source = futures[future]
+            try:
+                items = future.result()
+                print(f"✓ {source['name']}: {len(items)} items")
+                yield source, items
+            except Exception as e:
+                print(f"✗ {source['name']} error: {e}")
+                yield source, None
+    except TimeoutError:
+        for future, source in futures.items():
+            if future not in finished:
+                print(f"✗ {source['name']}: timed out after {budget['total_timeout']}s")
+                yield source, None
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_sources(sources: List[Dict], budget: Optional[Dict] = None) -> Dict[str, List]:
+    """소스를 동시에 수집하여 소스 이름별 결과 반환 (설정 순서 유지)
+
+    실패하거나 전체 제한 시간을 넘긴 소스는 결과에서 제외
+    """
+    completed = {source['name']: items for source, items in iter_sources(sources, budget) if items is not None}
+    return {source['name']: completed[source['name']] for source in sources if source['name'] in completed}
+
+
+def run_sources(sources: List[Dict], budget: Optional[Dict] = None) -> List:
+    """소스를 동시에 수집하고 설정 순서대로 결과를 합침"""
+    results = []
+    for items in fetch_sources(sources, budget).values():
+        results.extend(items)
+    return results
+
+
+def collect(kind: str, path: Optional[str] = None) -> List:
+    """설정 파일에서 해당 종류(news|social)의 소스를 읽어 수집
+
+    COLLECT_QUEUE가 있으면 SQLite 작업 큐로 여러 워커에 분산,
+    COLLECT_PROCESSES가 2 이상이면 프로세스 풀에 샤딩 (둘 다 중앙에서 병합/중복 제거)
+    """
+    config = load_config(path)
+    sources = load_sources(kind, config)
+
+    queue_path = os.getenv('COLLECT_QUEUE')
+    processes = int(os.getenv('COLLECT_PROCESSES', '1'))
+    if queue_path or processes > 1:
+        from sharded_collect import collect_with_processes, collect_with_queue
+        if queue_path:
+            return collect_with_queue(sources, config['budget'], queue_path)
+        return collect_with_processes(sources, config['budget'], processes)
+
+    return run_sources(sources, config['budget'])
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+텔레그램 봇 명령 모드
+/price, /news, /sentiment, /report <date> 명령을 메모리/디스크 캐시와 리포트 아카이브에서 응답
+캐시가 만료된 경우에만 수집기나 Gemini 분석 실행
+Directive: directives/telegram_bot.md
+"""
+
+import asyncio
+import html
+import json
+import os
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from dotenv import load_dotenv
+from telegram import Update
+from telegram.constants import ParseMode
+from telegram.ext import Application, CommandHandler, ContextTypes, filters
+
+from digests import load_subscribers, render_digests
+from localization import translate_titles
+from quote_poller import QUOTE_INTERVAL, QuotePoller
+from records import Article, load_records, save_records
+
+# 환경 변수 로드 (.env 파일이 있으면 로드, 없으면 시스템 환경 변수 사용)
+try:
+    load_dotenv()
+except:
+    pass  # GitHub Actions 등에서는 .env 파일이 없을 수 있음
+
+NEWS_FILE = '.tmp/news_articles.json'
+SOCIAL_FILE = '.tmp/social_posts.json'
+REPORT_FILE = '.tmp/gemini_report.json'
+
+NEWS_TTL = 15 * 60          # 뉴스 수집 결과 재사용 시간 (초)
+REPORT_TTL = 6 * 3600       # 분석 리포트 재사용 시간 (초)
+ARCHIVE_TTL = 10 * 60       # 아카이브 조회 결과 재사용 시간 (초)
+MAX_MESSAGE_LENGTH = 4096
+
+
+class TTLCache:
+    """키별 만료 시간 캐시
+
+    만료된 키에 동시 요청이 몰려도 로더는 한 번만 (스레드에서) 실행되고 나머지는 결과를 기다림
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, tuple] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _fresh(self, key: str, ttl: float):
+        entry = self._entries.get(key)
+        if entry and time.time() - entry[0] < ttl:
+            return entry
+        return None
+
+    async def get(self, key: str, ttl: float, loader: Callable):
+        entry = self._fresh(key, ttl)
+        if entry:
+            return entry[1]
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._fresh(key, ttl)
+            if entry:
+                return entry[1]
+            value = await asyncio.to_thread(loader)
+            self._entries[key] = (time.time(), value)
+            return value
+
+
+cache = TTLCache()
+quotes = QuotePoller()
+
+
+def file_age(path: str) -> float:
+    """파일 마지막 수정 후 경과 시간 (없으면 무한대)"""
+    return time.time() - os.path.getmtime(path) if os.path.exists(path) else float('inf')
+
+
+def load_or_collect_news() -> List[Article]:
+    """디스크의 수집 결과가 만료된 경우에만 뉴스 재수집"""
+    if file_age(NEWS_FILE) < NEWS_TTL:
+        return load_records(NEWS_FILE, Article)
+
+    from scrape_news import collect, filter_recent, remove_duplicates
+    articles = filter_recent(remove_duplicates(collect('news')))
+    save_records(NEWS_FILE, articles)
+    return articles
+
+
+def load_or_analyze_report() -> Dict:
+    """디스크의 리포트가 만료된 경우에만 재수집 후 분석 (입력이 같으면 분석 캐시 재사용)"""
+    if file_age(REPORT_FILE) >= REPORT_TTL:
+        load_or_collect_news()
+        if file_age(SOCIAL_FILE) >= NEWS_TTL:
+            from fetch_social_media import main as collect_social
+            collect_social()
+
+        from analyze_with_gemini import main as analyze
+        analyze()
+
+    with open(REPORT_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_archived_report(date: str):
+    from report_archive import get_report
+    return get_report(date)
+
+
+def load_sentiment_trend() -> List[Dict]:
+    from report_archive import sentiment_trend
+    return sentiment_trend(7)
+
+
+def poll_quotes():
+    """시세 폴링 간격이 지났을 때만 조회 (아니면 링 버퍼의 최신가 사용)"""
+    if quotes.due():
+        quotes.poll()
+    return quotes.states
+
+
+def split_message(message: str) -> List[str]:
+    """텔레그램 길이 제한에 맞게 섹션 단위로 분할"""
+    parts = []
+    current = ''
+    for block in message.split('\n\n'):
+        if current and len(current) + len(block) + 2 > MAX_MESSAGE_LENGTH:
+            parts.append(current)
+            current = ''
+        current = f"{current}\n\n{block}" if current else block
+    if current:
+        parts.append(current)
+    return parts
+
+
+async def reply(update: Update, message: str):
+    for part in split_message(message):
+        await update.message.reply_text(part, parse_mode=ParseMode.HTML, disable_web_page_preview=True)
+
+
+async def price_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/price [SYMBOL]: 관심 종목 최신가와 전일 종가 대비 변동률"""
+    states = await cache.get('quotes', QUOTE_INTERVAL, poll_quotes)
+    wanted = [s.upper() for s in context.args] or list(states)
+
+    lines = ["💰 <b>시세</b>"]
+    for symbol in wanted:
+        state = states.get(symbol)
+        if not state or state.last_price is None:
+            lines.append(f"{html.escape(symbol)}: 데이터 없음 (WATCHLIST에 없거나 아직 조회 전)")
+            continue
+        change = state.change_since_close
+        trend_emoji = "📈" if change and change > 0 else "📉" if change and change < 0 else "➡️"
+        change_text = f"{change:+.2f}%" if change is not None else 'N/A'
+        updated = datetime.fromtimestamp(state.ticks[-1][0]).strftime('%H:%M:%S')
+        lines.append(f"{symbol}: ${state.last_price:.2f} ({change_text} {trend_emoji}) · {updated}")
+
+    await reply(update, '\n'.join(lines))
+
+
+def chat_language(chat_id: str) -> str:
+    """구독 설정의 언어 (구독자가 아니면 한국어)"""
+    subscriber = next((s for s in load_subscribers() if str(s['chat_id']) == chat_id), {})
+    return subscriber.get('language', 'ko')
+
+
+async def news_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/news: 최신 뉴스 상위 10개"""
+    articles = await cache.get('news', NEWS_TTL, load_or_collect_news)
+    if not articles:
+        await reply(update, "📰 수집된 뉴스가 없습니다.")
+        return
+
+    # 채팅의 구독 언어로 제목 번역 (캐시에 없는 제목만 번역)
+    language = chat_language(str(update.effective_chat.id))
+    translations = await asyncio.to_thread(translate_titles, [a.title for a in articles[:10]], language)
+
+    lines = ["📰 <b>최신 뉴스</b>"]
+    for i, article in enumerate(articles[:10], 1):
+        title = translations.get(article.title, article.title)
+        lines.append(
+            f"{i}. <a href=\"{html.escape(article.url, quote=True)}\">{html.escape(title)}</a>"
+            f" - {html.escape(article.source)}"
+        )
+    await reply(update, '\n'.join(lines))
+
+
+async def sentiment_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/sentiment: 최신 AI 감성과 최근 7일 추이"""
+    report = await cache.get('report', ARCHIVE_TTL, load_or_analyze_report)
+    trend = await cache.get('sentiment_trend', ARCHIVE_TTL, load_sentiment_trend)
+
+    gemini = report.get('gemini_analysis', {})
+    lines = [
+        f"😊 <b>AI 감성 분석</b> ({report.get('date')})",
+        f"{gemini.get('overall_sentiment', '중립')} ({gemini.get('sentiment_score', 0.5)}/1.0)"
+        f" · TextBlob {report.get('textblob_sentiment_score', 0)}"
+    ]
+    if trend:
+        lines.append("")
+        lines.append("📅 <b>최근 7일</b>")
+        for row in trend:
+            lines.append(f"{row['date']}: {row['overall_sentiment']} ({row['sentiment_score']})")
+    await reply(update, '\n'.join(lines))
+
+
+async def report_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/report <YYYY-MM-DD>: 아카이브된 리포트 (채팅의 구독 설정으로 렌더링)"""
+    date = context.args[0] if context.args else datetime.now().strftime('%Y-%m-%d')
+    try:
+        datetime.strptime(date, '%Y-%m-%d')
+    except ValueError:
+        await reply(update, "사용법: /report YYYY-MM-DD")
+        return
+
+    report = await cache.get(f"report:{date}", ARCHIVE_TTL, lambda: load_archived_report(date))
+    if not report:
+        await reply(update, f"{date} 리포트가 아카이브에 없습니다.")
+        return
+
+    chat_id = str(update.effective_chat.id)
+    subscriber = next((s for s in load_subscribers() if str(s['chat_id']) == chat_id), {'chat_id': chat_id})
+    await reply(update, render_digests(report, [subscriber])[chat_id])
+
+
+def build_application(bot_token: str, chat_ids: List[int]) -> Application:
+    """명령 핸들러 등록 (구독자 채팅에서만 응답하여 Gemini 호출 남용 방지)"""
+    allowed = filters.Chat(chat_id=chat_ids)
+
+    application = Application.builder().token(bot_token).build()
+    for name, handler in (('price', price_command), ('news', news_command),
+                          ('sentiment', sentiment_command), ('report', report_command)):
+        application.add_handler(CommandHandler(name, handler, filters=allowed))
+    return application
+
+
+def main():
+    """메인 실행 함수 (중단할 때까지 업데이트 수신)"""
+    print("🤖 Starting Telegram bot command mode...")
+
+    bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
+    if not bot_token:
+        print("❌ Missing TELEGRAM_BOT_TOKEN environment variable")
+        return False
+
+    # 구독자 목록도 TELEGRAM_CHAT_ID도 없으면 모든 채팅에 응답하게 되므로 시작하지 않음
+    chat_ids = [int(s['chat_id']) for s in load_subscribers()]
+    if not chat_ids:
+        print("❌ No subscribers configured (config/subscribers.json or TELEGRAM_CHAT_ID)")
+        return False
+
+    build_application(bot_token, chat_ids).run_polling(allowed_updates=Update.ALL_TYPES)
+    return True
+
+if __name__ == '__main__':
+    success = main()
+    exit(0 if success else 1)
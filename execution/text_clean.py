@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+HTML 텍스트 정리 유틸리티
+피드 summary의 태그/엔티티/공백/보일러플레이트를 정규식 몇 번으로 정리 (DOM 파싱 없음)
+"""
+
+import html
+import re
+
+# 태그와 주석, 그리고 내용까지 버려야 하는 script/style 블록을 한 번에 매칭
+# 태그는 '<' 바로 뒤에 이름('/', '!' 포함)이 오는 경우만 (본문의 'margin < 40% > expected' 같은 비교 기호는 유지)
+MARKUP_PATTERN = re.compile(
+    r'<(script|style)\b[^>]*>.*?</\1\s*>'
+    r'|<!--.*?-->'
+    r'|</?[A-Za-z!][^>]*>',
+    re.IGNORECASE | re.DOTALL
+)
+
+# 디코딩 후에도 남은 엔티티 (이중 인코딩된 &amp;nbsp; 등)
+ENTITY_PATTERN = re.compile(r'&(?:[A-Za-z]+|#\d+|#x[0-9A-Fa-f]+);')
+
+# 피드별 반복 문구
+BOILERPLATE_PATTERN = re.compile(
+    r'submitted\s+by\s+/?u/[\w-]+'         # Reddit 작성자 표시
+    r'|\[link\]|\[comments\]'              # Reddit 링크 목록
+    r'|The post .{1,200}? appeared first on .{1,100}?\.'  # WordPress 테크 블로그
+    r'|Continue reading\W*'
+    r'|Read more\W*$',
+    re.IGNORECASE
+)
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def clean_html(text: str) -> str:
+    """태그 제거 → 엔티티 디코딩 → (인코딩된 태그 제거) → 보일러플레이트 제거 → 공백 정리"""
+    if not text:
+        return ''
+
+    # 태그 안에 엔티티가 있을 수 있으므로 태그를 먼저 제거
+    if '<' in text:
+        text = MARKUP_PATTERN.sub(' ', text)
+    if '&' in text:
+        text = html.unescape(text)
+        # 이중 인코딩된 엔티티는 한 번 더 디코딩
+        if ENTITY_PATTERN.search(text):
+            text = html.unescape(text)
+        # 엔티티로 인코딩되어 있던 태그 (&lt;a href=...&gt;) 제거
+        if '<' in text:
+            text = MARKUP_PATTERN.sub(' ', text)
+
+    text = BOILERPLATE_PATTERN.sub(' ', text)
+    return WHITESPACE_PATTERN.sub(' ', text).strip()
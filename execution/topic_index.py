@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+토픽 인덱스
+기사 제목/요약을 임베딩하여 근사 최근접 이웃(LSH) 인덱스로 오늘 항목을 토픽으로 묶고
+이전 날짜의 토픽과 연결 (의미상 중복 기사 제거에도 사용)
+
+임베딩은 기본적으로 해싱 기반 (의존성 없음), EMBEDDING_MODEL을 지정하고
+sentence-transformers가 설치되어 있으면 로컬 모델 사용. 새 텍스트만 임베딩하고 결과는 data/에 캐시
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import zlib
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from trend_index import tokenize
+
+DATA_DIR = os.getenv('DATA_DIR', 'data')
+TOPIC_DIR = os.path.join(DATA_DIR, 'topics')
+EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', '')  # 비어 있으면 해싱 임베딩
+
+HASH_DIM = 512              # 해싱 임베딩 차원
+LSH_TABLES = 20             # LSH 테이블 수 (많을수록 재현율 증가)
+LSH_BITS = 6                # 테이블당 초평면 수 (많을수록 버킷이 작아짐)
+DUPLICATE_SIMILARITY = 0.85 # 같은 기사로 볼 코사인 유사도
+CLUSTER_SIMILARITY = 0.35   # 같은 토픽으로 묶을 코사인 유사도
+MATCH_SIMILARITY = 0.45     # 이전 토픽과 연결할 코사인 유사도 (중심 벡터 기준)
+CENTROID_DECAY = 0.7        # 이전 토픽 중심 벡터 유지 비율
+TOPIC_RETENTION_DAYS = 30   # 이 기간 동안 나타나지 않은 토픽은 삭제
+EMBEDDING_CACHE_SIZE = 20000
+
+
+def item_text(item) -> str:
+    """임베딩할 텍스트 (제목 + 요약/본문 앞부분)"""
+    body = getattr(item, 'summary', None) or getattr(item, 'text', '')
+    return f"{item.title} {body[:300]}"
+
+
+def hash_embed(texts: List[str]) -> np.ndarray:
+    """단어/바이그램 특징 해싱 임베딩 (부호 해싱, L2 정규화)"""
+    vectors = np.zeros((len(texts), HASH_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        tokens = tokenize(text)
+        features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        if not features:
+            continue
+        hashes = np.array([zlib.crc32(f.encode('utf-8')) for f in features], dtype=np.uint32)
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        # 제목 토큰이 두 번 나오면 두 번 더해져 자연스럽게 가중치가 커짐
+        np.add.at(vectors[row], hashes % HASH_DIM, signs)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+_model = None
+
+
+def use_model() -> bool:
+    """로컬 임베딩 모델 사용 여부 (설정되어 있고 sentence-transformers가 설치된 경우)"""
+    return bool(EMBEDDING_MODEL) and importlib.util.find_spec('sentence_transformers') is not None
+
+
+def embedding_name() -> str:
+    """캐시/토픽 호환성 확인용 임베딩 이름 (바뀌면 캐시 초기화)"""
+    return EMBEDDING_MODEL if use_model() else f"hash-{HASH_DIM}"
+
+
+def embed(texts: List[str]) -> np.ndarray:
+    """정규화된 임베딩 행렬"""
+    global _model
+    if not use_model():
+        return hash_embed(texts)
+    if _model is None:
+        from sentence_transformers import SentenceTransformer
+        _model = SentenceTransformer(EMBEDDING_MODEL, device='cpu')
+    return _model.encode(texts, batch_size=64, normalize_embeddings=True).astype(np.float32)
+
+
+class EmbeddingCache:
+    """텍스트 해시 -> 벡터 (모델이 바뀌면 초기화, 새 텍스트만 일괄 임베딩)"""
+
+    def __init__(self, directory: str = TOPIC_DIR):
+        self.path = os.path.join(directory, 'embeddings.npz')
+        self.model = embedding_name()
+        self.keys: List[str] = []
+        self.vectors = np.zeros((0, 0), dtype=np.float16)
+        if os.path.exists(self.path):
+            data = np.load(self.path, allow_pickle=False)
+            if str(data['model']) == self.model:
+                self.keys = list(data['keys'])
+                self.vectors = data['vectors']
+        self.index = {k: i for i, k in enumerate(self.keys)}
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        keys = [hashlib.sha1(t.encode('utf-8')).hexdigest() for t in texts]
+        missing = sorted({k: t for k, t in zip(keys, texts) if k not in self.index}.items())
+        if missing:
+            new_vectors = embed([t for _, t in missing])
+            start = len(self.keys)
+            self.keys.extend(k for k, _ in missing)
+            self.vectors = (np.vstack([self.vectors, new_vectors.astype(np.float16)])
+                            if len(self.vectors) else new_vectors.astype(np.float16))
+            self.index.update({k: start + i for i, (k, _) in enumerate(missing)})
+        return self.vectors[[self.index[k] for k in keys]].astype(np.float32)
+
+    def save(self):
+        # 오래된 항목부터 제거
+        keys = self.keys[-EMBEDDING_CACHE_SIZE:]
+        vectors = self.vectors[-EMBEDDING_CACHE_SIZE:]
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        np.savez(self.path, model=np.array(self.model), keys=np.array(keys), vectors=vectors)
+
+
+class LSHIndex:
+    """랜덤 초평면 LSH 근사 최근접 이웃 인덱스 (후보만 정확한 코사인으로 재확인)"""
+
+    def __init__(self, dim: int, tables: int = LSH_TABLES, bits: int = LSH_BITS, seed: int = 42):
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((tables, bits, dim)).astype(np.float32)
+        self.powers = 1 << np.arange(bits)
+        self.buckets: List[Dict[int, List[int]]] = [{} for _ in range(tables)]
+        self.vectors = np.zeros((64, dim), dtype=np.float32)  # 용량을 두 배씩 늘리는 저장소
+        self.size = 0
+
+    def _signatures(self, vectors: np.ndarray) -> np.ndarray:
+        # (tables, n) 버킷 번호
+        bits = np.einsum('tbd,nd->tnb', self.planes, vectors) > 0
+        return bits @ self.powers
+
+    def add(self, vectors: np.ndarray) -> List[int]:
+        start = self.size
+        while start + len(vectors) > len(self.vectors):
+            self.vectors = np.vstack([self.vectors, np.zeros_like(self.vectors)])
+        self.vectors[start:start + len(vectors)] = vectors
+        self.size += len(vectors)
+
+        signatures = self._signatures(vectors)
+        for offset in range(len(vectors)):
+            for table, buckets in enumerate(self.buckets):
+                buckets.setdefault(int(signatures[table, offset]), []).append(start + offset)
+        return list(range(start, start + len(vectors)))
+
+    def query(self, vector: np.ndarray, min_similarity: float) -> List[Tuple[int, float]]:
+        """유사도 기준 이상인 이웃 (유사도 내림차순)"""
+        signatures = self._signatures(vector[None, :])[:, 0]
+        candidates = set()
+        for table, buckets in enumerate(self.buckets):
+            candidates.update(buckets.get(int(signatures[table]), []))
+        if not candidates:
+            return []
+        ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        similarities = self.vectors[ids] @ vector
+        keep = similarities >= min_similarity
+        order = np.argsort(-similarities[keep])
+        return [(int(ids[keep][i]), float(similarities[keep][i])) for i in order]
+
+
+def semantic_dedupe(items: List, cache: Optional[EmbeddingCache] = None) -> List:
+    """의미상 같은 기사 중 먼저 나온 항목만 유지 (URL이 달라도 같은 기사 제거)"""
+    if not items:
+        return items
+    cache = cache or EmbeddingCache()
+    vectors = cache.embed([item_text(i) for i in items])
+    index = LSHIndex(vectors.shape[1])
+
+    kept = []
+    for item, vector in zip(items, vectors):
+        if index.query(vector, DUPLICATE_SIMILARITY):
+            continue
+        index.add(vector[None, :])
+        kept.append(item)
+    return kept
+
+
+def cluster(vectors: np.ndarray) -> List[List[int]]:
+    """리더 기반 클러스터링: 가장 가까운 기존 클러스터 리더에 붙이거나 새 클러스터 생성"""
+    index = LSHIndex(vectors.shape[1])
+    leaders: List[int] = []     # 인덱스 항목 번호 -> 클러스터 번호
+    clusters: List[List[int]] = []
+    for row, vector in enumerate(vectors):
+        neighbors = index.query(vector, CLUSTER_SIMILARITY)
+        if neighbors:
+            clusters[leaders[neighbors[0][0]]].append(row)
+        else:
+            index.add(vector[None, :])
+            leaders.append(len(clusters))
+            clusters.append([row])
+    return clusters
+
+
+def topic_label(titles: List[str], size: int = 3) -> str:
+    counts = Counter(t for title in titles for t in set(tokenize(title)))
+    return ' '.join(word.capitalize() for word, _ in counts.most_common(size))
+
+
+class TopicIndex:
+    """날짜를 넘어 유지되는 토픽 (중심 벡터, 라벨, 등장 날짜)"""
+
+    def __init__(self, directory: str = TOPIC_DIR):
+        self.meta_path = os.path.join(directory, 'topics.json')
+        self.vector_path = os.path.join(directory, 'centroids.npy')
+        self.base_path = os.path.join(directory, 'base_centroids.npy')
+        self.model = embedding_name()
+        self.topics: List[Dict] = []
+        self.centroids = np.zeros((0, 0), dtype=np.float32)
+        # last_seen 날짜의 첫 갱신 직전 중심 벡터 (같은 날 재실행은 여기서 다시 갱신하여 중심이 누적 이동하지 않음)
+        self.bases = np.zeros((0, 0), dtype=np.float32)
+        if os.path.exists(self.meta_path) and os.path.exists(self.vector_path):
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('model') == self.model:
+                self.topics = meta['topics']
+                self.centroids = np.load(self.vector_path)
+                self.bases = np.load(self.base_path) if os.path.exists(self.base_path) else self.centroids.copy()
+                if self.bases.shape != self.centroids.shape:
+                    self.bases = self.centroids.copy()
+
+    def _start_centroid(self, topic_id: int, day: str) -> Optional[np.ndarray]:
+        """오늘 갱신의 기준 중심 벡터 (오늘 처음 생긴 토픽의 재실행이면 None)"""
+        topic = self.topics[topic_id]
+        if topic['last_seen'] != day:
+            self.bases[topic_id] = self.centroids[topic_id]
+            return self.centroids[topic_id]
+        if topic['first_seen'] == day:
+            return None
+        return self.bases[topic_id]
+
+    def assign(self, day: str, items: List, vectors: np.ndarray) -> List[Dict]:
+        """오늘 항목을 토픽으로 묶고 이전 토픽과 연결, 오늘 토픽 목록 반환 (크기 내림차순)"""
+        index = LSHIndex(vectors.shape[1])
+        if len(self.centroids):
+            # 오늘 이전부터 있던 토픽은 오늘 갱신 전 중심으로 매칭 (같은 날 재실행해도 같은 연결)
+            rerun = np.array([t['last_seen'] == day and t['first_seen'] != day for t in self.topics])
+            index.add(np.where(rerun[:, None], self.bases, self.centroids))
+
+        results = []
+        touched = set()  # 이번 실행에서 항목을 더한 토픽
+        for members in cluster(vectors):
+            centroid = vectors[members].mean(axis=0)
+            centroid /= np.linalg.norm(centroid) or 1.0
+            titles = [items[i].title for i in members]
+
+            match = index.query(centroid, MATCH_SIMILARITY)
+            if match:
+                topic_id = match[0][0]
+                topic = self.topics[topic_id]
+                # 이번 실행의 첫 갱신은 전날 기준 중심에서, 같은 실행의 이후 갱신은 현재 중심에서
+                start = self.centroids[topic_id] if topic_id in touched else self._start_centroid(topic_id, day)
+                if start is None:
+                    self.centroids[topic_id] = centroid
+                else:
+                    updated = CENTROID_DECAY * start + (1 - CENTROID_DECAY) * centroid
+                    self.centroids[topic_id] = updated / (np.linalg.norm(updated) or 1.0)
+                if day not in topic['days']:
+                    topic['days'].append(day)
+                # 같은 날 재실행이면 그날 이전 실행에서 더한 수를 빼고 다시 셈 (day_count: last_seen 날짜의 항목 수)
+                if topic_id not in touched:
+                    touched.add(topic_id)
+                    if topic['last_seen'] == day:
+                        topic['count'] -= topic.get('day_count', 0)
+                    topic['day_count'] = 0
+                topic['last_seen'] = day
+                topic['count'] += len(members)
+                topic['day_count'] += len(members)
+            else:
+                topic_id = len(self.topics)
+                topic = {'label': topic_label(titles), 'first_seen': day, 'last_seen': day,
+                         'days': [day], 'count': len(members), 'day_count': len(members)}
+                touched.add(len(self.topics))
+                self.topics.append(topic)
+                self.centroids = np.vstack([self.centroids, centroid[None, :]]) if len(self.centroids) \
+                    else centroid[None, :].copy()
+                self.bases = np.vstack([self.bases, centroid[None, :]]) if len(self.bases) \
+                    else centroid[None, :].copy()
+                index.add(centroid[None, :])
+
+            results.append({
+                'label': topic['label'],
+                'size': len(members),
+                'first_seen': topic['first_seen'],
+                'days_active': len(topic['days']),
+                'new': topic['first_seen'] == day,
+                'titles': titles[:3]
+            })
+
+        return sorted(results, key=lambda t: t['size'], reverse=True)
+
+    def save(self, today: str):
+        """보관 기간이 지난 토픽 제거 후 저장"""
+        cutoff = datetime.strptime(today, '%Y-%m-%d').toordinal() - TOPIC_RETENTION_DAYS
+        keep = [i for i, t in enumerate(self.topics)
+                if datetime.strptime(t['last_seen'], '%Y-%m-%d').toordinal() >= cutoff]
+        self.topics = [self.topics[i] for i in keep]
+        self.centroids = self.centroids[keep] if len(self.centroids) else self.centroids
+        self.bases = self.bases[keep] if len(self.bases) else self.bases
+
+        os.makedirs(os.path.dirname(self.meta_path), exist_ok=True)
+        with open(self.meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'model': self.model, 'topics': self.topics}, f, ensure_ascii=False)
+        np.save(self.vector_path, self.centroids)
+        np.save(self.base_path, self.bases)
+
+
+def update_topics(items: List, day: Optional[str] = None, top_n: int = 8,
+                  cache: Optional[EmbeddingCache] = None) -> List[Dict]:
+    """오늘 항목으로 토픽 인덱스 갱신 후 상위 토픽 반환
+
+    cache를 넘기면 호출자가 저장 (semantic_dedupe와 같은 캐시를 공유할 때)
+    """
+    if not items:
+        return []
+    day = day or datetime.now().strftime('%Y-%m-%d')
+
+    owns_cache = cache is None
+    cache = cache or EmbeddingCache()
+    vectors = cache.embed([item_text(i) for i in items])
+    index = TopicIndex()
+    topics = index.assign(day, items, vectors)
+
+    if owns_cache:
+        cache.save()
+    index.save(day)
+    return topics[:top_n]
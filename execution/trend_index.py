@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+트렌딩 키워드 인덱스
+일자별 문서 빈도(DF)를 누적 저장하고 최근 기간 대비 오늘 급증한 용어를 추출
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DATA_DIR = os.getenv('DATA_DIR', 'data')
+INDEX_FILE = os.path.join(DATA_DIR, 'trend_index.json')
+
+WINDOW_DAYS = 30      # 기준선 기간 (일)
+SMOOTHING = 1.0       # 기준선에 없던 용어의 점수 폭주 방지용 가산 평활
+MIN_TODAY_DF = 2      # 오늘 최소 등장 문서 수
+
+WORD_PATTERN = re.compile(r"[a-z][a-z0-9]{2,}")
+
+STOPWORDS = frozenset("""
+about above after again against also among another any around because been before being below between both
+but can could did does doing down during each few for from further had has have having her here hers him his
+how into its itself just last like make many more most much must near new next not now off once only other
+our out over own same says said she should since some such than that the their them then there these they
+this those through too under until very via was way were what when where which while who whom why will with
+would year years you your week weeks today report reports according amid ahead
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """소문자 단어 토큰 (3자 이상, 불용어 제외)"""
+    return [w for w in WORD_PATTERN.findall(text.lower()) if w not in STOPWORDS]
+
+
+class TrendIndex:
+    """일자별 DF와 기간 합계를 함께 유지하여 실행당 O(신규 문서) 갱신"""
+
+    def __init__(self, path: str = INDEX_FILE, window_days: int = WINDOW_DAYS):
+        self.path = path
+        self.window_days = window_days
+        self.days: Dict[str, Dict] = {}              # 날짜 -> {'docs': n, 'df': {term: n}}
+        self.window_df: Counter = Counter()          # 기간 내 모든 날짜의 DF 합계
+        self.window_docs = 0
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            self.days = stored.get('days', {})
+            self.window_df = Counter(stored.get('window_df', {}))
+            self.window_docs = stored.get('window_docs', 0)
+
+    def _remove_day(self, day: str):
+        entry = self.days.pop(day)
+        self.window_df.subtract(entry['df'])
+        self.window_docs -= entry['docs']
+
+    def add_documents(self, day: str, documents: Iterable[str]):
+        """해당 날짜의 문서를 인덱싱 (같은 날짜 재실행 시 기존 값 교체)"""
+        if day in self.days:
+            self._remove_day(day)
+
+        df: Counter = Counter()
+        docs = 0
+        for doc in documents:
+            df.update(set(tokenize(doc)))
+            docs += 1
+
+        self.days[day] = {'docs': docs, 'df': dict(df)}
+        self.window_df.update(df)
+        self.window_docs += docs
+
+        # 기간이 지난 날짜만 차감 (이력 전체 재계산 없음)
+        cutoff = (datetime.strptime(day, '%Y-%m-%d') - timedelta(days=self.window_days)).strftime('%Y-%m-%d')
+        for old_day in [d for d in self.days if d <= cutoff]:
+            self._remove_day(old_day)
+
+        self.window_df = +self.window_df  # 0 이하 항목 정리
+
+    def trending(self, day: str, top_n: int = 15) -> List[Tuple[str, float]]:
+        """오늘 DF 비율 / 기준선 DF 비율이 높은 용어 (기준선은 오늘 제외)"""
+        today = self.days.get(day)
+        if not today or not today['docs']:
+            return []
+
+        base_docs = self.window_docs - today['docs']
+        scores = []
+        for term, count in today['df'].items():
+            if count < MIN_TODAY_DF:
+                continue
+            base_count = self.window_df.get(term, 0) - count
+            today_rate = count / today['docs']
+            base_rate = (base_count + SMOOTHING) / (base_docs + SMOOTHING)
+            # 비율의 로그 × 오늘 빈도의 로그: 드문 단발성 용어보다 충분히 언급된 급상승 용어 우선
+            score = math.log(today_rate / base_rate) * math.log1p(count)
+            if score > 0:
+                scores.append((term, round(score, 3)))
+
+        return sorted(scores, key=lambda x: x[1], reverse=True)[:top_n]
+
+    def save(self):
+        """인덱스 파일 저장"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'days': self.days,
+                'window_df': dict(self.window_df),
+                'window_docs': self.window_docs
+            }, f, ensure_ascii=False)
+
+
+def update_and_get_trending(documents: List[str], day: Optional[str] = None, top_n: int = 15) -> List[str]:
+    """오늘 문서로 인덱스를 갱신하고 트렌딩 키워드 반환"""
+    day = day or datetime.now().strftime('%Y-%m-%d')
+    index = TrendIndex()
+    index.add_documents(day, documents)
+    index.save()
+    return [term.capitalize() for term, score in index.trending(day, top_n)]